@@ -0,0 +1,101 @@
+"""
+Offline re-scoring of archived posts.
+
+Reads posts as JSON lines (one object per line with the Post fields), scores
+them in bulk (across a process pool for large archives) and writes every
+post at or above the threshold back out as JSON lines. Nothing is
+deduplicated or notified.
+
+CLI usage:
+    python -m src.backfill archive.jsonl [--min-score 0.5] > matches.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Iterable, TextIO
+
+from src.collectors.base import Post
+from src.config import settings
+from src.scoring import ScoredPost, score_batch_parallel, shutdown_scoring_pool
+from src.utils.logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+
+def parse_post(line: str) -> Post:
+    """Build a Post from one JSON line of the archive."""
+    data = json.loads(line)
+    optional = {}
+    if data.get("created_at"):
+        optional["created_at"] = datetime.fromisoformat(data["created_at"])
+    return Post(
+        source=data["source"],
+        external_id=str(data["external_id"]),
+        url=data.get("url", ""),
+        title=data.get("title", ""),
+        body=data.get("body") or "",
+        tags=tuple(data.get("tags") or ()),
+        **optional,
+    )
+
+
+def load_posts(lines: Iterable[str]) -> list[Post]:
+    """Parse every non-blank line into a Post."""
+    return [parse_post(line) for line in lines if line.strip()]
+
+
+def dump_scored(scored: ScoredPost) -> str:
+    """Serialise a ScoredPost as a single JSON line."""
+    post = scored.post
+    return json.dumps({
+        "source": post.source,
+        "external_id": post.external_id,
+        "url": post.url,
+        "title": post.title,
+        "score": scored.score,
+        "matched_pain_points": list(scored.matched_pain_points),
+    })
+
+
+def run_backfill(lines: Iterable[str], out: TextIO, min_score: float) -> dict:
+    """Score all archived posts and write the matches to `out`. Returns a summary."""
+    started = time.perf_counter()
+    posts = load_posts(lines)
+    scored_posts = score_batch_parallel(posts)
+
+    matched = 0
+    for scored in scored_posts:
+        if scored.score >= min_score:
+            out.write(dump_scored(scored) + "\n")
+            matched += 1
+
+    return {
+        "scored": len(scored_posts),
+        "above_threshold": matched,
+        "duration_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-score archived posts.")
+    parser.add_argument("path", help="JSON lines file of posts, or - for stdin")
+    parser.add_argument("--min-score", type=float, default=settings.min_relevance_score)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    try:
+        if args.path == "-":
+            summary = run_backfill(sys.stdin, sys.stdout, args.min_score)
+        else:
+            with open(args.path, encoding="utf-8") as fh:
+                summary = run_backfill(fh, sys.stdout, args.min_score)
+    finally:
+        shutdown_scoring_pool()
+    logger.info("backfill_complete", **summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+Benchmarks for the scoring / dedup / notify hot path.
+
+Everything runs offline on a synthetic corpus. The corpus is generated as raw
+API payloads for each source, with body lengths and markup typical of that
+source (HTML for Stack Overflow, markdown for GitHub, and so on), and about
+5% of posts are relevant. The benchmarks are:
+
+- score / score_batch:   scoring freshly parsed posts, including building
+                         each post's normalised text
+- parse.<source>:        each collector's JSON page → Post parsing
+- pipeline:              run_collector() end to end. The collector replays
+                         the corpus, dedup uses a throwaway SQLite database
+                         in place of Supabase, and the Discord webhook is an
+                         in-process httpx transport
+- memory:                peak traced allocation for parsing and scoring
+- backfill_memory:       the same for src.backfill loading and scoring a
+                         JSON-lines archive of the corpus, through
+                         score_batch_parallel() as a real backfill does
+                         (across the process pool from
+                         scoring_process_min_posts up; only the parent
+                         process is traced)
+
+Results are printed as JSON, so runs can be compared between commits.
+
+CLI usage:
+    python -m src.bench [--posts 5000] [--repeat 5] [--only score,pipeline] > bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+import httpx
+
+from src import backfill, dedup, http_clients
+from src.collectors.base import BaseCollector, Post
+from src.collectors.github_issues import GitHubIssuesCollector
+from src.collectors.hackernews import HackerNewsCollector
+from src.collectors.reddit import RedditCollector
+from src.collectors.stackoverflow import StackOverflowCollector
+from src.config import settings
+from src.pipeline import run_collector
+from src.scoring import score, score_batch, score_batch_parallel, shutdown_scoring_pool
+from src.utils.logging import setup_logging
+
+BENCHMARKS = ("score", "score_batch", "parse", "pipeline", "memory", "backfill_memory")
+
+# --------------------------------------------------------------------------- #
+# Synthetic corpus
+# --------------------------------------------------------------------------- #
+
+_PAGE_SIZE = 30
+# Unix time the synthetic posts are spread back from
+_EPOCH = 1_710_000_000
+
+_FILLER = (
+    "the a to of and in is it for on with that this how can i we our when from "
+    "but not using after before some every into about would should could there "
+    "build deploy service server client value list array object string config "
+    "error issue problem question answer update version install run test file "
+    "user data page table field model view form login session cache queue job "
+    "interest forest restore address director's account count export import"
+).split()
+
+# Phrases that make a post relevant: CH context, a pain point, dev context
+_RELEVANT_PHRASES = [
+    "Companies House API returns 429 too many requests",
+    "parsing iXBRL annual accounts in python",
+    "fetching persons with significant control via the endpoint",
+    "director network from officer appointments json",
+    "rate limit on the companies-house REST api",
+    "beneficial ownership chain for KYB checks, curl example",
+]
+
+# source → (min, max) body length in characters
+_BODY_LENGTHS = {
+    "stackoverflow": (600, 4000),
+    "hackernews": (0, 800),
+    "reddit": (100, 2000),
+    "github": (200, 3000),
+}
+
+_SOURCES = tuple(_BODY_LENGTHS)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_FILLER) for _ in range(words)).capitalize() + "."
+
+
+def _prose(rng: random.Random, length: int, relevant: bool) -> list[str]:
+    """Sentences totalling about `length` characters; one relevant phrase if asked."""
+    sentences, total = [], 0
+    while total < length:
+        sentence = _sentence(rng, rng.randint(6, 18))
+        sentences.append(sentence)
+        total += len(sentence) + 1
+    if relevant:
+        sentences.insert(rng.randrange(len(sentences) + 1), rng.choice(_RELEVANT_PHRASES) + ".")
+    return sentences
+
+
+def _body(source: str, rng: random.Random, relevant: bool) -> str:
+    low, high = _BODY_LENGTHS[source]
+    sentences = _prose(rng, rng.randint(low, high), relevant)
+    code = "\n".join(f"response = client.get(url_{i})" for i in range(rng.randint(1, 6)))
+    if source == "stackoverflow":
+        paragraphs = [f"<p>{s}</p>" for s in sentences]
+        paragraphs.insert(len(paragraphs) // 2, f"<pre><code>{code}</code></pre>")
+        return "\n".join(paragraphs)
+    if source == "github":
+        return " ".join(sentences) + f"\n\n```python\n{code}\n```\n\n- [ ] {_sentence(rng, 5)}"
+    return " ".join(sentences)
+
+
+def _title(rng: random.Random, relevant: bool) -> str:
+    title = _sentence(rng, rng.randint(4, 10)).rstrip(".")
+    return f"{title} — Companies House API" if relevant else title
+
+
+def _item(source: str, i: int, rng: random.Random, relevant: bool) -> dict:
+    """One raw API item in the shape the source's collector parses."""
+    created = _EPOCH - i * 60
+    title, body = _title(rng, relevant), _body(source, rng, relevant)
+    if source == "stackoverflow":
+        return {"question_id": 70_000_000 + i, "title": title, "body": body,
+                "link": f"https://stackoverflow.com/questions/{70_000_000 + i}",
+                "tags": ["python", "api"], "creation_date": created, "score": 1, "answer_count": 0}
+    if source == "hackernews":
+        return {"objectID": str(39_000_000 + i), "title": title, "url": None,
+                "story_text": body or None, "comment_text": None, "created_at_i": created,
+                "_tags": ["story", f"author_user{i}", f"story_{39_000_000 + i}"]}
+    if source == "reddit":
+        post_id = f"b{i:06x}"
+        return {"kind": "t3", "data": {
+            "id": post_id, "title": title, "selftext": body, "subreddit": "learnpython",
+            "permalink": f"/r/learnpython/comments/{post_id}/", "created_utc": float(created)}}
+    return {"id": 2_000_000 + i, "number": i, "title": title, "body": body,
+            "html_url": f"https://github.com/example-org/repo/issues/{i}", "state": "open",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created)),
+            "labels": [{"id": 1, "name": "bug"}]}
+
+
+def _page(source: str, items: list[dict], last: bool) -> dict:
+    """Wrap items in the source's page envelope."""
+    if source == "stackoverflow":
+        return {"items": items, "has_more": not last, "quota_remaining": 9000}
+    if source == "hackernews":
+        return {"hits": items, "nbPages": 1 if last else 1000, "processingTimeMS": 3}
+    if source == "reddit":
+        return {"kind": "Listing", "data": {"children": items, "after": None if last else "t3_next"}}
+    return {"total_count": 1000, "incomplete_results": False, "items": items}
+
+
+def synthetic_pages(source: str, n: int, seed: int = 0, relevant_ratio: float = 0.05) -> list[dict]:
+    """`n` posts for `source` as raw API pages of 30."""
+    rng = random.Random(f"{seed}:{source}")
+    items = [_item(source, i, rng, rng.random() < relevant_ratio) for i in range(n)]
+    return [
+        _page(source, items[start:start + _PAGE_SIZE], last=start + _PAGE_SIZE >= n)
+        for start in range(0, n, _PAGE_SIZE)
+    ]
+
+
+def _collectors() -> dict[str, BaseCollector]:
+    return {
+        "stackoverflow": StackOverflowCollector(),
+        "hackernews": HackerNewsCollector(),
+        "reddit": RedditCollector(),
+        "github": GitHubIssuesCollector(),
+    }
+
+
+def _parse_all(collector: BaseCollector, pages: list[dict]) -> list[Post]:
+    posts = []
+    for page in pages:
+        state = collector._first_page_state(collector._queries()[0], 0)
+        posts.extend(collector._parse_page(page, 0, state)[0])
+    return posts
+
+
+def synthetic_posts(n: int, seed: int = 0) -> list[Post]:
+    """`n` parsed Posts, split evenly across the sources."""
+    collectors = _collectors()
+    share, extra = divmod(n, len(_SOURCES))
+    posts = []
+    for index, source in enumerate(_SOURCES):
+        count = share + (1 if index < extra else 0)
+        posts.extend(_parse_all(collectors[source], synthetic_pages(source, count, seed)))
+    return posts
+
+
+# --------------------------------------------------------------------------- #
+# Timing
+# --------------------------------------------------------------------------- #
+
+
+def _summarise(times: list[float], items: int) -> dict:
+    best = min(times)
+    return {
+        "items": items,
+        "repeat": len(times),
+        "min_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "mean_ms": round(statistics.fmean(times) * 1000, 3),
+        "per_item_us": round(best / items * 1e6, 3) if items else 0.0,
+    }
+
+
+def _measure(fn: Callable[..., Any], items: int, repeat: int, setup: Callable[[], Any] | None = None) -> dict:
+    """Time fn() `repeat` times; with `setup`, time fn(setup()) and leave setup untimed."""
+    times = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        started = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - started)
+    return _summarise(times, items)
+
+
+# --------------------------------------------------------------------------- #
+# Pipeline stand-ins
+# --------------------------------------------------------------------------- #
+
+
+class _ReplayCollector:
+    """
+    Collector stand-in for run_collector(): yields a prepared corpus in
+    pages instead of calling an API. Parsing is timed on its own by the
+    parse benchmarks.
+    """
+
+    def __init__(self, posts: list[Post]):
+        self.posts = posts
+
+    async def stream_pages(self) -> AsyncIterator[list[Post]]:
+        for start in range(0, len(self.posts), _PAGE_SIZE):
+            yield self.posts[start:start + _PAGE_SIZE]
+
+    def commit_cursors(self) -> None:
+        pass
+
+
+@contextmanager
+def _local_stand_ins(workdir: Path):
+    """
+    Point dedup at a fresh SQLite database and notifications at Discord
+    only, restoring both after.
+    """
+    saved_settings = {
+        name: getattr(settings, name)
+        for name in ("scout_webhook_url", "telegram_bot_token", "telegram_chat_id")
+    }
+    backend = dedup.SQLiteBackend(str(workdir / "seen.db"))
+    settings.scout_webhook_url = "https://discord.invalid/api/webhooks/bench"
+    settings.telegram_bot_token = settings.telegram_chat_id = ""
+    try:
+        with dedup.use_backend(backend):
+            yield
+    finally:
+        backend.reset()
+        for name, value in saved_settings.items():
+            setattr(settings, name, value)
+
+
+async def _pipeline_once(posts: list[Post]) -> dict:
+    # The webhook is an in-process transport that accepts every call
+    webhook = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+    async with http_clients.override("discord", webhook):
+        summary = await run_collector(_ReplayCollector(posts))
+        await dedup.flush_seen()
+    return summary
+
+
+def bench_pipeline(n: int, seed: int, repeat: int) -> dict:
+    """run_collector() over the corpus, starting from an empty dedup store each time."""
+    times, summary = [], {}
+    for _ in range(repeat):
+        # Freshly parsed, as scoring normalises (and so changes) the posts
+        posts = synthetic_posts(n, seed)
+        with tempfile.TemporaryDirectory() as workdir, _local_stand_ins(Path(workdir)):
+            started = time.perf_counter()
+            summary = asyncio.run(_pipeline_once(posts))
+            times.append(time.perf_counter() - started)
+    return {
+        **_summarise(times, len(posts)),
+        "above_threshold": summary.get("above_threshold", 0),
+        "notified": summary.get("notified", 0),
+        "stages": summary.get("stages", {}),
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Runner
+# --------------------------------------------------------------------------- #
+
+
+def bench_memory(n: int, seed: int) -> dict:
+    """Peak traced allocation while parsing and scoring `n` posts."""
+    tracemalloc.start()
+    try:
+        posts = synthetic_posts(n, seed)
+        parsed = tracemalloc.get_traced_memory()[0]
+        scored = score_batch(posts)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "items": len(scored),
+        "posts_kb": round(parsed / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "bytes_per_post": round(parsed / len(posts)) if posts else 0,
+    }
+
+
+def bench_backfill_memory(n: int, seed: int) -> dict:
+    """
+    Peak traced allocation in the parent process while a backfill loads and
+    scores an `n`-post archive. Scoring goes through score_batch_parallel(),
+    as in run_backfill(), so large archives take the process-pool path.
+    """
+    archive = [
+        json.dumps({
+            "source": post.source, "external_id": post.external_id, "url": post.url,
+            "title": post.title, "body": post.body, "tags": list(post.tags),
+            "created_at": post.created_at.isoformat(),
+        })
+        for post in synthetic_posts(n, seed)
+    ]
+    tracemalloc.start()
+    try:
+        posts = backfill.load_posts(archive)
+        loaded = tracemalloc.get_traced_memory()[0]
+        scored = score_batch_parallel(posts)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        shutdown_scoring_pool()
+    return {
+        "items": len(scored),
+        "process_pool": len(posts) >= settings.scoring_process_min_posts,
+        "posts_kb": round(loaded / 1024, 1),
+        "scored_kb": round(retained / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "bytes_per_post": round(retained / len(posts)) if posts else 0,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(n: int = 5000, repeat: int = 5, only: tuple[str, ...] = BENCHMARKS, seed: int = 0) -> dict:
+    """Run the selected benchmarks on an `n`-post corpus and return the JSON-ready report."""
+    results: dict[str, dict] = {}
+    # Scoring normalises the posts it's given, so each run gets a fresh corpus
+    corpus = partial(synthetic_posts, n, seed)
+
+    if "score" in only:
+        results["score"] = _measure(lambda posts: [score(post) for post in posts], n, repeat, corpus)
+    if "score_batch" in only:
+        results["score_batch"] = _measure(score_batch, n, repeat, corpus)
+    if "parse" in only:
+        count = max(1, n // len(_SOURCES))
+        for source, collector in _collectors().items():
+            pages = synthetic_pages(source, count, seed)
+            results[f"parse.{source}"] = _measure(lambda: _parse_all(collector, pages), count, repeat)
+    if "pipeline" in only:
+        results["pipeline"] = bench_pipeline(n, seed, repeat)
+    if "memory" in only:
+        results["memory"] = bench_memory(n, seed)
+    if "backfill_memory" in only:
+        results["backfill_memory"] = bench_backfill_memory(n, seed)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "posts": n,
+            "repeat": repeat,
+            "seed": seed,
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the scoring/dedup/notify hot path.")
+    parser.add_argument("--posts", type=int, default=5000, help="synthetic corpus size")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (best is reported)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS),
+                        help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    only = tuple(name.strip() for name in args.only.split(",") if name.strip())
+    unknown = set(only) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    # Log lines go to stderr; keep them to warnings so they don't dominate the timings
+    setup_logging()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    report = run_benchmarks(args.posts, max(1, args.repeat), only, args.seed)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,328 @@
+import asyncio
+import re
+import sys
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 
+import httpx
 
-@dataclass
+from src import http_clients
+from src.collectors import rate_limit
+from src.collectors.cursors import CursorStore
+from src.collectors.http_cache import ResponseCache
+from src.config import settings
+from src.utils import metrics, text
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_FETCH_SECONDS = metrics.histogram(
+    "scout_collector_fetch_seconds", "Page request latency.", ("source", "query")
+)
+_FETCH_BYTES = metrics.counter(
+    "scout_collector_fetch_bytes_total", "Response body bytes received.", ("source", "query")
+)
+_FETCH_RESPONSES = metrics.counter(
+    "scout_collector_responses_total", "Page responses by HTTP status.", ("source", "status")
+)
+
+T = TypeVar("T")
+
+
+# Longest body kept once search_text has been built from the full body;
+# notifications show at most the first 400 characters.
+BODY_MAX_CHARS = 1_000
+
+
+@dataclass(slots=True)
 class Post:
-    """A forum/issue post collected from an external source."""
+    """
+    A forum/issue post collected from an external source.
+
+    Slotted, as backfills hold many thousands at once. Not frozen:
+    normalise(), which scoring calls, caches search_text and then truncates
+    the body. Treat posts as read-only otherwise.
+    """
     source: str          # "stackoverflow" | "hackernews" | "reddit" | "github"
     external_id: str     # platform-specific unique ID
     url: str
     title: str
     body: str
-    tags: list[str] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    tags: tuple[str, ...] = ()
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # Set by normalise(); dataclasses.replace() starts a copy without it
+    search_text: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # The same few sources and tags repeat across thousands of posts
+        self.source = sys.intern(self.source)
+        self.tags = tuple(sys.intern(tag) for tag in self.tags)
+
+    def normalise(self) -> str:
+        """
+        Title, body and tags with the source's markup and URLs stripped,
+        casefolded and whitespace-collapsed. Built from the full body on the
+        first call and cached in search_text; only the first BODY_MAX_CHARS
+        characters of the body are kept after that.
+        """
+        if self.search_text is None:
+            self.search_text = text.search_text(self.source, self.title, self.body, self.tags)
+            self.truncate_body()
+        return self.search_text
+
+    def truncate_body(self) -> None:
+        """
+        Keep only the first BODY_MAX_CHARS characters of the body. Called
+        once the post is scored; pool-scored posts are normalised in a
+        worker, so the parent's copy is trimmed here without search_text.
+        """
+        self.body = self.body[:BODY_MAX_CHARS]
+
+
+# One fetched page: the posts on it and the state needed to request the next
+# page (None when this was the last page worth fetching).
+Page = tuple[list[Post], Any]
 
 
 class BaseCollector(ABC):
-    """Abstract base for all source collectors."""
+    """
+    Abstract base for all source collectors.
+
+    Subclasses describe one page request (_queries, _request, _parse_page);
+    the base class sends it conditionally, pages through every query
+    concurrently, filters to the lookback window/cursor, and exposes the
+    result as a stream of pages.
+    """
+
+    # Post.source value; also names the shared HTTP client and prefixes this
+    # collector's log events
+    source: str = ""
 
-    def __init__(self, lookback_seconds: int = 86400):
+    # Upper bound on queries in flight at once, per collector run. Subclasses
+    # lower it to stay inside their API's rate limits.
+    max_concurrent_queries: int = 3
+
+    # Response body fields that change on every request (timings, quota);
+    # stripped before hashing so unchanged results are still recognised.
+    volatile_body: re.Pattern[bytes] | None = None
+
+    def __init__(
+        self,
+        lookback_seconds: int = 86400,
+        max_pages: int | None = None,
+        time_budget_seconds: float | None = None,
+    ):
         self.lookback_seconds = lookback_seconds
+        self.max_pages = max_pages or settings.collector_max_pages
+        self.time_budget_seconds = time_budget_seconds or settings.collector_time_budget_seconds
+        self.cursors = CursorStore(self.source, settings.collector_state_dir)
+        # query → newest post of a query paged to the end, until commit_cursors()
+        self._pending_cursors: dict[str, Post] = {}
+        self.http_cache = ResponseCache(settings.collector_http_cache_size, self.volatile_body)
 
     @abstractmethod
-    async def collect(self) -> list[Post]:
-        """Fetch recent posts. Returns empty list on any error."""
+    def _queries(self) -> list[str]:
+        """Queries to run each poll; also the keys of the per-query cursors."""
+        ...
+
+    @abstractmethod
+    def _request(self, query: str, since: float, state: Any) -> tuple[str, dict, dict]:
+        """
+        (url, params, headers) for one page of `query`; the first page when
+        state comes from _first_page_state.
+        """
+        ...
+
+    @abstractmethod
+    def _parse_page(self, data: Any, since: float, state: Any) -> Page:
+        """Turn a decoded JSON response into its posts and the next page's state."""
         ...
+
+    def _first_page_state(self, query: str, since: float) -> Any:
+        """Paging state for the first request of `query`."""
+        return None
+
+    async def collect(self) -> list[Post]:
+        """
+        Fetch recent posts. Returns empty list on any error. Cursors are
+        committed once every page is in, since the caller gets them all.
+        """
+        posts: list[Post] = []
+        try:
+            async for page in self.stream_pages():
+                posts.extend(page)
+        except Exception as exc:
+            logger.warning(f"{self.source}_collect_failed", error=str(exc))
+            return []
+        self.commit_cursors()
+        return posts
+
+    async def stream(self) -> AsyncIterator[Post]:
+        """Yield recent posts one at a time as their pages arrive."""
+        async for page in self.stream_pages():
+            for post in page:
+                yield post
+
+    async def stream_pages(self) -> AsyncIterator[list[Post]]:
+        """
+        Yield new posts one page round at a time.
+
+        Each round fetches the next page of every unfinished query
+        concurrently. The next round is only requested once the consumer asks
+        for it, so a slow consumer holds back fetching. Paging stops per
+        query at the lookback window/cursor or the last page, and overall
+        after max_pages rounds or time_budget_seconds.
+
+        A query's cursor advances only once it has been paged to the end;
+        one cut short by the budget is re-read from the old cursor next run.
+        Even then the advance stays pending until commit_cursors(), which the
+        caller makes once the posts are safely processed. A run that dies
+        first re-reads them from the old cursor, and as the pages it cached
+        are dropped too, they are parsed again instead of skipped as
+        unchanged.
+        """
+        cutoff = datetime.now(timezone.utc).timestamp() - self.lookback_seconds
+        queries = self._queries()
+        since = {query: self._since(query, cutoff) for query in queries}
+        states = {query: self._first_page_state(query, since[query]) for query in queries}
+        newest: dict[str, Post] = {}
+        # Advances and cache entries left over from a run that was never
+        # committed are dropped
+        self._pending_cursors = {}
+        self.http_cache.discard()
+        seen_ids: set[str] = set()
+        deadline = time.monotonic() + self.time_budget_seconds
+        count = 0
+
+        async with http_clients.client(self.source) as client:
+            for _ in range(self.max_pages):
+                active = list(states)
+                results = await self._gather_queries(
+                    active,
+                    lambda query: self._fetch_page(client, query, since[query], states[query], deadline),
+                )
+
+                states = {}
+                page: list[Post] = []
+                for query, result in zip(active, results):
+                    if result is None:
+                        continue  # failed: keep the old cursor, retry next run
+                    posts, next_state = result
+                    for post in posts:
+                        if post.created_at.timestamp() < since[query]:
+                            continue
+                        if query not in newest or post.created_at > newest[query].created_at:
+                            newest[query] = post
+                        if post.external_id in seen_ids:
+                            continue
+                        seen_ids.add(post.external_id)
+                        page.append(post)
+
+                    if next_state is None:
+                        if query in newest:
+                            self._pending_cursors[query] = newest[query]
+                    else:
+                        states[query] = next_state
+
+                count += len(page)
+                yield page
+
+                if not states:
+                    break
+                if time.monotonic() >= deadline:
+                    logger.warning(f"{self.source}_time_budget_exhausted", unfinished=len(states))
+                    break
+            else:
+                if states:
+                    logger.warning(f"{self.source}_page_budget_exhausted", unfinished=len(states))
+
+        logger.info(f"{self.source}_collected", count=count, **self.http_cache.stats)
+
+    async def _fetch_page(
+        self, client: httpx.AsyncClient, query: str, since: float, state: Any, deadline: float
+    ) -> Page | None:
+        """
+        Fetch and parse one page. Returns None on an API error or when the
+        source's rate limit wouldn't allow the request before `deadline`, and
+        an empty page (with the cached next state) when the response is
+        unchanged since the last identical request.
+        """
+        governor = rate_limit.governor(self.source)
+        if not await governor.acquire(deadline):
+            logger.warning(f"{self.source}_request_deferred", query=query, **governor.snapshot())
+            return None
+
+        url, params, headers = self._request(query, since, state)
+        key = self.http_cache.key(url, params)
+        headers = {**headers, **self.http_cache.validators(key)}
+
+        started = time.perf_counter()
+        response = await client.get(url, params=params, headers=headers)
+        _FETCH_SECONDS.observe(time.perf_counter() - started, source=self.source, query=query)
+        _FETCH_RESPONSES.inc(source=self.source, status=response.status_code)
+        _FETCH_BYTES.inc(len(response.content), source=self.source, query=query)
+        governor.observe(response)
+        if response.status_code == 304:
+            hit, next_state = self.http_cache.not_modified(key)
+            if hit:
+                return [], next_state
+        if response.status_code != 200:
+            logger.warning(
+                f"{self.source}_api_error",
+                query=query,
+                status_code=response.status_code,
+            )
+            return None
+
+        hit, next_state = self.http_cache.unchanged(key, response)
+        if hit:
+            return [], next_state
+        posts, next_state = self._parse_page(response.json(), since, state)
+        self.http_cache.store(key, response, next_state)
+        return posts, next_state
+
+    def _since(self, query: str, cutoff: float) -> float:
+        """
+        Oldest creation timestamp worth fetching for `query`: the query's
+        cursor, or the lookback cutoff when the cursor is missing or older.
+        The bound is inclusive, so the newest item from the previous run comes
+        back once more and is dropped by dedup rather than risking a gap.
+        """
+        cursor = self.cursors.get(query)
+        if cursor is not None and cursor.get("created", 0) > cutoff:
+            return cursor["created"]
+        return cutoff
+
+    def commit_cursors(self) -> None:
+        """
+        Persist the cursor advances of the last stream_pages() run and keep
+        the responses it cached.
+        """
+        self.http_cache.commit()
+        pending, self._pending_cursors = self._pending_cursors, {}
+        for query, newest in pending.items():
+            self.cursors.advance(query, newest.created_at.timestamp())
+
+    async def _gather_queries(
+        self, queries: list[str], fetch: Callable[[str], Awaitable[T]]
+    ) -> list[T | None]:
+        """
+        Run fetch(query) for every query concurrently, at most
+        max_concurrent_queries at a time. Results are returned in query
+        order; a query that raises is logged and yields None, so one slow or
+        failing query never discards the others' results.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_queries))
+
+        async def _run(query: str) -> T | None:
+            async with semaphore:
+                try:
+                    return await fetch(query)
+                except Exception as exc:
+                    logger.warning(f"{self.source}_query_failed", query=query, error=str(exc))
+                    return None
+
+        return await asyncio.gather(*(_run(query) for query in queries))
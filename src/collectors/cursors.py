@@ -0,0 +1,57 @@
+"""
+Per-query high-water marks for incremental collection.
+
+Each collector keeps, per query, the newest `created` timestamp it has seen.
+Later runs ask the API only for items from that point on, or stop paging
+there where the API has no date filter. State is a small JSON file per
+source under collector_state_dir; an empty dir setting keeps it in memory.
+"""
+
+import json
+from pathlib import Path
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CursorStore:
+    """JSON-backed map of query → cursor dict for one source."""
+
+    def __init__(self, source: str, state_dir: str = ""):
+        self.source = source
+        self.path = Path(state_dir) / f"{source}_cursors.json" if state_dir else None
+        self._cursors: dict[str, dict] | None = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._cursors is None:
+            self._cursors = {}
+            if self.path is not None and self.path.exists():
+                try:
+                    self._cursors = json.loads(self.path.read_text())
+                except (OSError, ValueError) as exc:
+                    logger.warning("cursor_load_failed", source=self.source, error=str(exc))
+        return self._cursors
+
+    def get(self, query: str) -> dict | None:
+        return self._load().get(query)
+
+    def advance(self, query: str, created: float) -> None:
+        """Move the query's cursor forward to `created`; never moves it back."""
+        cursors = self._load()
+        current = cursors.get(query)
+        if current is not None and current.get("created", 0) >= created:
+            return
+        cursors[query] = {"created": created}
+        self._save()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._cursors))
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning("cursor_save_failed", source=self.source, error=str(exc))
@@ -1,12 +1,7 @@
 from datetime import datetime, timezone
 
-import httpx
-
-from src.collectors.base import BaseCollector, Post
+from src.collectors.base import BaseCollector, Page, Post
 from src.config import settings
-from src.utils.logging import get_logger
-
-logger = get_logger(__name__)
 
 _BASE_URL = "https://api.github.com/search/issues"
 _QUERIES = [
@@ -14,16 +9,30 @@ _QUERIES = [
     "companies house xbrl",
     "companies house rate limit",
 ]
+_PAGE_SIZE = 30
+_MAX_SEARCH_RESULTS = 1000  # the search API never returns more than this per query
+
+
+def _parse_created(created_str: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(created_str.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
 
 
 class GitHubIssuesCollector(BaseCollector):
     """Collects recent GitHub issues mentioning Companies House."""
 
-    async def collect(self) -> list[Post]:
-        seen_ids: set[str] = set()
-        posts: list[Post] = []
-        cutoff = datetime.now(timezone.utc).timestamp() - self.lookback_seconds
+    source = "github"
+    max_concurrent_queries = 2  # search API: 10 requests/min anonymous, 30 with a token
+
+    def _queries(self) -> list[str]:
+        return _QUERIES
 
+    def _first_page_state(self, query: str, since: float) -> int:
+        return 1
+
+    def _request(self, query: str, since: float, state: int) -> tuple[str, dict, dict]:
         headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -31,62 +40,41 @@ class GitHubIssuesCollector(BaseCollector):
         if settings.github_token:
             headers["Authorization"] = f"Bearer {settings.github_token}"
 
-        try:
-            async with httpx.AsyncClient(timeout=15.0, headers=headers) as client:
-                for query in _QUERIES:
-                    params = {
-                        "q": f"{query} is:issue",
-                        "sort": "created",
-                        "order": "desc",
-                        "per_page": 30,
-                    }
-                    response = await client.get(_BASE_URL, params=params)
-                    if response.status_code != 200:
-                        logger.warning(
-                            "github_api_error",
-                            query=query,
-                            status_code=response.status_code,
-                        )
-                        continue
-                    data = response.json()
-
-                    for item in data.get("items", []):
-                        issue_id = str(item.get("id", ""))
-                        if not issue_id or issue_id in seen_ids:
-                            continue
-
-                        created_str = item.get("created_at", "")
-                        try:
-                            created_dt = datetime.fromisoformat(
-                                created_str.replace("Z", "+00:00")
-                            )
-                        except (ValueError, AttributeError):
-                            continue
-
-                        if created_dt.timestamp() < cutoff:
-                            continue
+        created_from = datetime.fromtimestamp(int(since), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        params = {
+            "q": f"{query} is:issue created:>={created_from}",
+            "sort": "created",
+            "order": "desc",
+            "per_page": _PAGE_SIZE,
+            "page": state,
+        }
+        return _BASE_URL, params, headers
 
-                        seen_ids.add(issue_id)
-                        labels = [
-                            lbl["name"]
-                            for lbl in item.get("labels", [])
-                            if isinstance(lbl, dict) and "name" in lbl
-                        ]
+    def _parse_page(self, data: dict, since: float, state: int) -> Page:
+        items = data.get("items", [])
+        posts = [post for post in map(self._parse_item, items) if post is not None]
+        total = min(data.get("total_count", 0), _MAX_SEARCH_RESULTS)
+        more = len(items) == _PAGE_SIZE and state * _PAGE_SIZE < total
+        return posts, state + 1 if more else None
 
-                        posts.append(
-                            Post(
-                                source="github",
-                                external_id=issue_id,
-                                url=item.get("html_url", ""),
-                                title=item.get("title", ""),
-                                body=item.get("body") or "",
-                                tags=labels,
-                                created_at=created_dt,
-                            )
-                        )
-        except Exception as exc:
-            logger.warning("github_collect_failed", error=str(exc))
-            return []
+    @staticmethod
+    def _parse_item(item: dict) -> Post | None:
+        """Build a Post from a search result item; None if created_at is unparseable."""
+        created_dt = _parse_created(item.get("created_at", ""))
+        if created_dt is None or not item.get("id"):
+            return None
 
-        logger.info("github_collected", count=len(posts))
-        return posts
+        labels = tuple(
+            lbl["name"]
+            for lbl in item.get("labels", [])
+            if isinstance(lbl, dict) and "name" in lbl
+        )
+        return Post(
+            source="github",
+            external_id=str(item.get("id", "")),
+            url=item.get("html_url", ""),
+            title=item.get("title", ""),
+            body=item.get("body") or "",
+            tags=labels,
+            created_at=created_dt,
+        )
@@ -1,67 +1,57 @@
+import re
 from datetime import datetime, timezone
 
-import httpx
-
-from src.collectors.base import BaseCollector, Post
-from src.utils.logging import get_logger
-
-logger = get_logger(__name__)
+from src.collectors.base import BaseCollector, Page, Post
 
 _BASE_URL = "https://hn.algolia.com/api/v1/search_by_date"
 _QUERIES = ["companies house", "companies-house api", "iXBRL companies house"]
+_PAGE_SIZE = 50
 
 
 class HackerNewsCollector(BaseCollector):
     """Collects recent HN posts via Algolia search API."""
 
-    async def collect(self) -> list[Post]:
-        seen_ids: set[str] = set()
-        posts: list[Post] = []
-        cutoff = datetime.now(timezone.utc).timestamp() - self.lookback_seconds
-
-        try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                for query in _QUERIES:
-                    params = {
-                        "query": query,
-                        "tags": "story",
-                        "hitsPerPage": 50,
-                    }
-                    response = await client.get(_BASE_URL, params=params)
-                    if response.status_code != 200:
-                        logger.warning(
-                            "hackernews_api_error",
-                            query=query,
-                            status_code=response.status_code,
-                        )
-                        continue
-                    data = response.json()
-
-                    for hit in data.get("hits", []):
-                        oid = str(hit.get("objectID", ""))
-                        if oid in seen_ids:
-                            continue
-
-                        created_ts = hit.get("created_at_i", 0)
-                        if created_ts < cutoff:
-                            continue
-
-                        seen_ids.add(oid)
-                        body = hit.get("story_text") or hit.get("comment_text") or ""
-                        posts.append(
-                            Post(
-                                source="hackernews",
-                                external_id=oid,
-                                url=hit.get("url") or f"https://news.ycombinator.com/item?id={oid}",
-                                title=hit.get("title", ""),
-                                body=body,
-                                tags=[t for t in hit.get("_tags", []) if not t.startswith("author_")],
-                                created_at=datetime.fromtimestamp(created_ts, tz=timezone.utc),
-                            )
-                        )
-        except Exception as exc:
-            logger.warning("hackernews_collect_failed", error=str(exc))
-            return []
-
-        logger.info("hackernews_collected", count=len(posts))
-        return posts
+    source = "hackernews"
+    max_concurrent_queries = 3  # Algolia allows 10k requests/hour per IP
+    # Per-request server timings; processingTimingsMS nests up to three levels
+    volatile_body = re.compile(
+        rb'"(?:processingTimeMS|serverTimeMS)":\s*\d+'
+        rb'|"processingTimingsMS":\s*\{(?:[^{}]|\{(?:[^{}]|\{[^{}]*\})*\})*\}'
+    )
+
+    def _queries(self) -> list[str]:
+        return _QUERIES
+
+    def _first_page_state(self, query: str, since: float) -> int:
+        return 0
+
+    def _request(self, query: str, since: float, state: int) -> tuple[str, dict, dict]:
+        params = {
+            "query": query,
+            "tags": "story",
+            "hitsPerPage": _PAGE_SIZE,
+            "page": state,
+            "numericFilters": f"created_at_i>={int(since)}",
+        }
+        return _BASE_URL, params, {}
+
+    def _parse_page(self, data: dict, since: float, state: int) -> Page:
+        posts = [self._parse_hit(hit) for hit in data.get("hits", [])]
+        # numericFilters already limits results to the window, so every page counts
+        more = posts and state + 1 < data.get("nbPages", 0)
+        return posts, state + 1 if more else None
+
+    @staticmethod
+    def _parse_hit(hit: dict) -> Post:
+        oid = str(hit.get("objectID", ""))
+        created_ts = hit.get("created_at_i", 0)
+        body = hit.get("story_text") or hit.get("comment_text") or ""
+        return Post(
+            source="hackernews",
+            external_id=oid,
+            url=hit.get("url") or f"https://news.ycombinator.com/item?id={oid}",
+            title=hit.get("title", ""),
+            body=body,
+            tags=tuple(t for t in hit.get("_tags", []) if not t.startswith("author_")),
+            created_at=datetime.fromtimestamp(created_ts, tz=timezone.utc),
+        )
@@ -0,0 +1,129 @@
+"""
+Conditional-request cache for collector page fetches.
+
+Each entry remembers, per URL + params, the validators the API sent
+(ETag / Last-Modified), a hash of the response body, and the paging state
+that followed the page. The next identical request carries If-None-Match /
+If-Modified-Since; a 304, or a 200 whose body hashes the same, is reported
+as unchanged so the collector can skip JSON parsing, Post construction and
+scoring for that page.
+
+Cache keys include every query param, so a hit needs the request to be
+identical: in practice a query whose cursor didn't move since the last run.
+
+New entries stay pending until commit(), which the collector makes alongside
+its cursors once the run's posts have been processed. A run that dies first
+leaves the old entries in place, so its pages are parsed again next run
+rather than reported as unchanged.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+
+
+@dataclass
+class _Entry:
+    etag: str | None
+    last_modified: str | None
+    body_hash: bytes
+    next_state: Any
+
+
+def _header(response: httpx.Response, name: str) -> str | None:
+    return response.headers.get(name) or None
+
+
+class ResponseCache:
+    """
+    LRU map of request key → validators for one collector instance.
+
+    volatile_body: optional bytes regex for fields that change on every
+    response (timings, remaining quota); matches are removed before hashing
+    so otherwise identical bodies still compare equal.
+    """
+
+    def __init__(self, max_entries: int = 256, volatile_body: re.Pattern[bytes] | None = None):
+        self.max_entries = max_entries
+        self.volatile_body = volatile_body
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Stored since the last commit(); not yet used for lookups
+        self._pending: dict[str, _Entry] = {}
+        self.stats = {"not_modified": 0, "unchanged": 0, "changed": 0}
+
+    @staticmethod
+    def key(url: str, params: dict) -> str:
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Conditional request headers for `key` (empty when nothing is cached)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified(self, key: str) -> tuple[bool, Any]:
+        """
+        Handle a 304 for `key`. Returns (True, next_state) from the cached
+        entry, or (False, None) if the entry was evicted in the meantime.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats["not_modified"] += 1
+        return True, entry.next_state
+
+    def unchanged(self, key: str, response: httpx.Response) -> tuple[bool, Any]:
+        """Like not_modified(), for a 200 whose body hashes the same as last time."""
+        entry = self._entries.get(key)
+        body_hash = self._body_hash(response)
+        if entry is None or entry.body_hash != body_hash:
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats["unchanged"] += 1
+        return True, entry.next_state
+
+    def store(self, key: str, response: httpx.Response, next_state: Any) -> None:
+        """Remember a freshly parsed 200 response, pending until commit()."""
+        if self.max_entries <= 0:
+            return
+        self.stats["changed"] += 1
+        self._pending[key] = _Entry(
+            etag=_header(response, "ETag"),
+            last_modified=_header(response, "Last-Modified"),
+            body_hash=self._body_hash(response),
+            next_state=next_state,
+        )
+
+    def commit(self) -> None:
+        """Make the entries stored since the last commit() available to lookups."""
+        pending, self._pending = self._pending, {}
+        for key, entry in pending.items():
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self) -> None:
+        """Drop the entries stored since the last commit()."""
+        self._pending = {}
+
+    def _body_hash(self, response: httpx.Response) -> bytes:
+        content = response.content
+        if self.volatile_body is not None:
+            content = self.volatile_body.sub(b"", content)
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
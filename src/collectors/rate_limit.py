@@ -0,0 +1,198 @@
+"""
+Per-source request governor shared by every query of a collector.
+
+Each source gets one token bucket sized to its documented limit. Every page
+request takes a token first, so concurrent queries share one budget instead
+of each assuming it has the whole allowance. After each response the
+bucket is corrected from what the API reports:
+
+- GitHub, Reddit: X-RateLimit-Remaining / X-RateLimit-Reset (GitHub sends
+                  an epoch timestamp, Reddit seconds from now)
+- Stack Exchange: quota_remaining / backoff in the JSON body
+- any source:     Retry-After on a 403/429
+
+When the remaining quota hits zero, or the API asks for a backoff, requests
+block until the window resets. A collector run that would have to wait past
+its time budget skips the request instead.
+"""
+
+import asyncio
+import re
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from src.config import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# source → (sustained requests per second, burst size)
+_PROFILES: dict[str, tuple[float, float]] = {
+    "stackoverflow": (1.0, 10),        # 30/s hard cap; the daily quota is the real limit
+    "hackernews": (2.0, 10),           # Algolia: 10k requests/hour per IP
+    "reddit": (10 / 60, 10),           # unauthenticated JSON: ~10 requests/min
+    "github": (10 / 60, 10),           # search API: 10/min anonymous
+}
+_GITHUB_TOKEN_PROFILE = (30 / 60, 30)  # search API: 30/min with a token
+
+# Blocking period after a 403/429 that names no reset time
+_DEFAULT_BACKOFF_SECONDS = 60.0
+
+# X-RateLimit-Reset values above this are epoch seconds rather than a delay
+_EPOCH_THRESHOLD = 1_000_000_000
+
+_BODY_QUOTA = re.compile(rb'"quota_remaining":\s*(\d+)')
+_BODY_BACKOFF = re.compile(rb'"backoff":\s*(\d+)')
+
+
+def _header_float(response: httpx.Response, name: str) -> float | None:
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Retry-After as seconds from now (delta-seconds or HTTP-date form)."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateGovernor:
+    """Token bucket for one source, corrected by the API's own quota reports."""
+
+    def __init__(self, source: str, rate: float, burst: float):
+        self.source = source
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self.remaining: int | None = None  # as last reported by the API
+        self.reset_at: float | None = None  # epoch seconds, when known
+        self.throttled = 0  # 403/429 responses seen
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_time(self, now: float) -> float:
+        self._refill(now)
+        wait = max(0.0, self._blocked_until - now)
+        if self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self.rate)
+        return wait
+
+    async def acquire(self, deadline: float | None = None) -> bool:
+        """
+        Wait for a request slot. Returns False without waiting when the slot
+        wouldn't come before `deadline` (a time.monotonic() value).
+        """
+        # Serialised so waiters are served in order and share one refill
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    self._tokens -= 1
+                    return True
+                if deadline is not None and now + wait > deadline:
+                    return False
+                await asyncio.sleep(wait)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Update the bucket from a response's rate-limit headers and body fields."""
+        now = time.monotonic()
+        wall = time.time()
+
+        remaining = _header_float(response, "X-RateLimit-Remaining")
+        reset = _header_float(response, "X-RateLimit-Reset")
+        if reset is not None:
+            # GitHub sends an epoch timestamp, Reddit seconds until the reset
+            self.reset_at = reset if reset > _EPOCH_THRESHOLD else wall + reset
+
+        if remaining is None and (match := _BODY_QUOTA.search(response.content)):
+            remaining = float(match.group(1))
+        backoff = None
+        if match := _BODY_BACKOFF.search(response.content):
+            backoff = float(match.group(1))
+
+        if remaining is not None:
+            self.remaining = int(remaining)
+            # Never plan on more requests than the API says are left
+            self._refill(now)
+            self._tokens = min(self._tokens, remaining)
+            if remaining < 1 and self.reset_at is not None:
+                self._block(now, self.reset_at - wall)
+
+        if backoff is not None:
+            self._block(now, backoff)
+
+        if response.status_code in (403, 429):
+            retry_after = _retry_after(response)
+            if retry_after is None and response.status_code == 403 and self.remaining != 0:
+                return  # a plain permission error, not a rate limit
+            self.throttled += 1
+            if retry_after is None:
+                retry_after = (
+                    self.reset_at - wall if self.reset_at is not None else _DEFAULT_BACKOFF_SECONDS
+                )
+            self._block(now, retry_after)
+            logger.warning(f"{self.source}_rate_limited", retry_after=round(retry_after, 1))
+
+    def _block(self, now: float, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, now + max(0.0, seconds))
+
+    def snapshot(self) -> dict:
+        """Remaining quota and local pacing state, for /health and the scheduler."""
+        now = time.monotonic()
+        self._refill(now)
+        reset_in = None
+        if self.reset_at is not None:
+            reset_in = round(max(0.0, self.reset_at - time.time()), 1)
+        return {
+            "remaining": self.remaining,
+            "reset_in_seconds": reset_in,
+            "tokens": round(self._tokens, 2),
+            "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 1),
+            "throttled": self.throttled,
+        }
+
+
+_governors: dict[str, RateGovernor] = {}
+
+
+def governor(source: str) -> RateGovernor:
+    """The shared governor for `source`, created on first use."""
+    gov = _governors.get(source)
+    if gov is None:
+        rate, burst = _PROFILES.get(source, (1.0, 10))
+        if source == "github" and settings.github_token:
+            rate, burst = _GITHUB_TOKEN_PROFILE
+        gov = _governors[source] = RateGovernor(source, rate, burst)
+    return gov
+
+
+def quota_stats() -> dict[str, dict]:
+    """Per-source snapshot of every governor used so far."""
+    return {source: gov.snapshot() for source, gov in _governors.items()}
+
+
+def reset() -> None:
+    """Forget all governors (tests)."""
+    _governors.clear()
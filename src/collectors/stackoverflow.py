@@ -1,66 +1,56 @@
+import re
 from datetime import datetime, timezone
 
-import httpx
-
-from src.collectors.base import BaseCollector, Post
+from src.collectors.base import BaseCollector, Page, Post
 from src.config import settings
-from src.utils.logging import get_logger
-
-logger = get_logger(__name__)
 
 _BASE_URL = "https://api.stackexchange.com/2.3/questions"
 _TAGS = "companies-house;xbrl;uk-company-api"
 _SITE = "stackoverflow"
+_PAGE_SIZE = 50
 
 
 class StackOverflowCollector(BaseCollector):
     """Collects recent Stack Overflow questions tagged with CH/XBRL tags."""
 
-    async def collect(self) -> list[Post]:
+    source = "stackoverflow"
+    # Every response reports the caller's remaining daily quota
+    volatile_body = re.compile(rb'"quota_remaining":\s*\d+')
+
+    def _queries(self) -> list[str]:
+        return [_TAGS]
+
+    def _first_page_state(self, query: str, since: float) -> int:
+        return 1
+
+    def _request(self, query: str, since: float, state: int) -> tuple[str, dict, dict]:
         params = {
-            "tagged": _TAGS,
+            "tagged": query,
             "site": _SITE,
             "order": "desc",
             "sort": "creation",
             "filter": "withbody",
-            "pagesize": 50,
+            "pagesize": _PAGE_SIZE,
+            "page": state,
+            "fromdate": int(since),
         }
         if settings.stackoverflow_api_key:
             params["key"] = settings.stackoverflow_api_key
-
-        try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(_BASE_URL, params=params)
-                if response.status_code != 200:
-                    logger.warning(
-                        "stackoverflow_api_error",
-                        status_code=response.status_code,
-                    )
-                    return []
-                data = response.json()
-        except Exception as exc:
-            logger.warning("stackoverflow_collect_failed", error=str(exc))
-            return []
-
-        cutoff = datetime.now(timezone.utc).timestamp() - self.lookback_seconds
-        posts: list[Post] = []
-
-        for item in data.get("items", []):
-            created_ts = item.get("creation_date", 0)
-            if created_ts < cutoff:
-                continue
-
-            posts.append(
-                Post(
-                    source="stackoverflow",
-                    external_id=str(item["question_id"]),
-                    url=item.get("link", ""),
-                    title=item.get("title", ""),
-                    body=item.get("body", ""),
-                    tags=item.get("tags", []),
-                    created_at=datetime.fromtimestamp(created_ts, tz=timezone.utc),
-                )
-            )
-
-        logger.info("stackoverflow_collected", count=len(posts))
-        return posts
+        return _BASE_URL, params, {}
+
+    def _parse_page(self, data: dict, since: float, state: int) -> Page:
+        posts = [self._parse_item(item) for item in data.get("items", [])]
+        more = data.get("has_more") and posts and posts[-1].created_at.timestamp() >= since
+        return posts, state + 1 if more else None
+
+    @staticmethod
+    def _parse_item(item: dict) -> Post:
+        return Post(
+            source="stackoverflow",
+            external_id=str(item["question_id"]),
+            url=item.get("link", ""),
+            title=item.get("title", ""),
+            body=item.get("body", ""),
+            tags=tuple(item.get("tags", ())),
+            created_at=datetime.fromtimestamp(item.get("creation_date", 0), tz=timezone.utc),
+        )
@@ -11,15 +11,45 @@ class Settings(BaseSettings):
 
     # Discord
     scout_webhook_url: str = Field(default="")
+    # Batch embeds arriving within this window into one webhook call (0 = off)
+    discord_batch_window_seconds: float = Field(default=0.0)
 
     # Telegram
     telegram_bot_token: str = Field(default="")
     telegram_chat_id: str = Field(default="")
 
+    # Notification retry outbox (backoff doubles from base up to max seconds)
+    notify_retry_base_seconds: float = Field(default=30.0)
+    notify_retry_max_seconds: float = Field(default=3600.0)
+    notify_max_attempts: int = Field(default=8)
+    notify_outbox_interval_seconds: int = Field(default=60)
+    notify_outbox_batch_size: int = Field(default=50)
+
     # Supabase
     supabase_url: str = Field(default="")
     supabase_key: str = Field(default="")
 
+    # Dedup backend: "auto" (Supabase if configured, else SQLite), "supabase",
+    # "sqlite" or "memory"
+    dedup_backend: str = Field(default="auto")
+    dedup_sqlite_path: str = Field(default="data/scout_seen_posts.db")
+    dedup_retention_days: int = Field(default=30)
+
+    # In-memory dedup cache size; entries also expire after lookback_seconds
+    seen_cache_max_size: int = Field(default=100_000)
+
+    # Optional Bloom pre-filter in front of backend dedup lookups
+    bloom_filter_enabled: bool = Field(default=False)
+    bloom_filter_path: str = Field(default="data/seen_posts.bloom")
+    bloom_filter_capacity: int = Field(default=200_000)
+    bloom_filter_error_rate: float = Field(default=0.01)
+    bloom_filter_rebuild_seconds: int = Field(default=3600)
+
+    # Dedup write-behind buffer (Supabase upserts)
+    dedup_flush_size: int = Field(default=50)
+    dedup_flush_interval_seconds: int = Field(default=30)
+    dedup_flush_retries: int = Field(default=3)
+
     # External API — for draft reply links
     api_base_url: str = Field(default="https://ch-api-production-b552.up.railway.app")
 
@@ -31,12 +61,45 @@ class Settings(BaseSettings):
     # Scoring
     min_relevance_score: float = Field(default=0.5)
 
+    # Off-loop scoring: batches this large go to a process pool in chunks
+    # (smaller ones to a thread); 0 workers = one per CPU core
+    scoring_process_min_posts: int = Field(default=5000)
+    scoring_chunk_size: int = Field(default=2000)
+    scoring_workers: int = Field(default=0)
+
     # Poll intervals (minutes)
     poll_interval_stackoverflow: int = Field(default=360)
     poll_interval_hackernews: int = Field(default=360)
     poll_interval_reddit: int = Field(default=360)
     poll_interval_github: int = Field(default=360)
 
+    # Adaptive polling: each collector's interval moves between these bounds
+    # (minutes) to aim for adaptive_target_leads new relevant posts per poll
+    adaptive_polling: bool = Field(default=False)
+    poll_interval_min: int = Field(default=15)
+    poll_interval_max: int = Field(default=1440)
+    adaptive_target_leads: float = Field(default=1.0)
+
+    # Max collectors run_all_collectors() runs at once
+    collector_concurrency: int = Field(default=4)
+
+    # Pipeline stages: bounded queue size and workers per stage
+    pipeline_queue_size: int = Field(default=8)
+    pipeline_score_workers: int = Field(default=1)
+    pipeline_dedup_workers: int = Field(default=1)
+    pipeline_notify_workers: int = Field(default=2)
+    pipeline_persist_workers: int = Field(default=2)
+
+    # Paging budget per collector run (pages per query, and wall-clock seconds)
+    collector_max_pages: int = Field(default=5)
+    collector_time_budget_seconds: float = Field(default=60.0)
+
+    # Conditional-request cache entries per collector (0 disables)
+    collector_http_cache_size: int = Field(default=256)
+
+    # Per-source incremental collection cursors ("" keeps them in memory only)
+    collector_state_dir: str = Field(default="data/cursors")
+
     # Lookback window (seconds)
     lookback_seconds: int = Field(default=86400)
 
@@ -1,5 +1,13 @@
 """
-Deduplication against Supabase scout_seen_posts + in-memory fallback.
+Deduplication of seen posts: an in-memory cache in front of a pluggable
+persistent backend.
+
+Backends (selected by DEDUP_BACKEND, "auto" by default):
+- SupabaseBackend — shared scout_seen_posts table; used when SUPABASE_URL and
+  SUPABASE_KEY are set.
+- SQLiteBackend — local WAL-mode database at DEDUP_SQLITE_PATH; the default
+  when Supabase isn't configured, so restarts don't re-notify.
+- none ("memory") — in-memory cache only.
 
 Supabase schema (create once):
 
@@ -16,92 +24,955 @@ Supabase schema (create once):
       created_at TIMESTAMPTZ DEFAULT now(),
       UNIQUE(source, external_id)
     );
+
+    -- Notifications waiting to be retried (see src.notifier.drain_outbox)
+    CREATE TABLE scout_outbox (
+      id BIGSERIAL PRIMARY KEY,
+      source TEXT NOT NULL,
+      external_id TEXT NOT NULL,
+      channel TEXT NOT NULL,
+      payload JSONB NOT NULL,
+      attempts INTEGER NOT NULL DEFAULT 0,
+      next_attempt_at DOUBLE PRECISION NOT NULL,
+      created_at DOUBLE PRECISION NOT NULL,
+      last_error TEXT,
+      UNIQUE(source, external_id, channel)
+    );
 """
 
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
 from src.collectors.base import Post
 from src.config import settings
 from src.scoring import ScoredPost
+from src.utils import metrics
+from src.utils.bloom import BloomFilter
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-# In-memory fallback when Supabase is unavailable
-_seen_in_memory: set[tuple[str, str]] = set()
+_IO_SECONDS = metrics.histogram(
+    "scout_dedup_io_seconds", "Dedup backend round-trip time.", ("backend", "op")
+)
+_IO_ERRORS = metrics.counter("scout_dedup_io_errors_total", "Failed dedup backend calls.", ("backend", "op"))
+_CACHE_LOOKUPS = metrics.counter(
+    "scout_dedup_cache_lookups_total",
+    "Dedup lookups answered by the in-memory cache (hit) or passed on (miss).",
+    ("result",),
+)
 
 
-def _get_supabase_client():
-    """Return a Supabase client or None if credentials are absent."""
-    if not settings.supabase_url or not settings.supabase_key:
-        return None
+class _SeenCache:
+    """
+    Bounded in-memory set of seen (source, external_id) keys.
+
+    Entries expire ttl_seconds after they were added — a collector never
+    returns posts older than its lookback window, so older keys can't match
+    again — and the oldest entries are evicted beyond max_size. Keys are
+    stored compactly: interned source plus an int for all-digit ids.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, int | str], float] = OrderedDict()
+
+    @staticmethod
+    def _compact(key: tuple[str, str]) -> tuple[str, int | str]:
+        source, external_id = key
+        if external_id.isascii() and external_id.isdigit() and (external_id == "0" or external_id[0] != "0"):
+            return sys.intern(source), int(external_id)
+        return sys.intern(source), external_id
+
+    def add(self, key: tuple[str, str]) -> None:
+        compact = self._compact(key)
+        self._entries[compact] = time.monotonic()
+        self._entries.move_to_end(compact)
+        self._evict()
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        compact = self._compact(key)
+        added = self._entries.get(compact)
+        if added is None:
+            return False
+        if time.monotonic() - added > self.ttl_seconds:
+            del self._entries[compact]
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        entries = self._entries
+        while entries and (len(entries) > self.max_size or next(iter(entries.values())) < cutoff):
+            entries.popitem(last=False)
+
+
+# In-memory dedup cache; also the only dedup state when no backend is configured
+_seen_in_memory = _SeenCache(settings.seen_cache_max_size, settings.lookback_seconds)
+
+# Max external_ids per lookup — keeps the PostgREST query string short
+_LOOKUP_CHUNK_SIZE = 100
+
+# Rows per load_recent() request; PostgREST caps responses at max-rows (1000
+# by default), so larger windows are paged
+_LOAD_PAGE_SIZE = 1000
+
+# Write-behind buffer for mark_seen(): rows keyed by (source, external_id)
+# until a flush is acknowledged by the backend
+_pending_rows: dict[tuple[str, str], dict] = {}
+_pending_since: float | None = None
+_flush_lock = asyncio.Lock()
+
+# First retry delay for a failed flush; doubles on each further attempt
+_FLUSH_BACKOFF_SECONDS = 1.0
+
+# Optional Bloom pre-filter of every seen key (bloom_filter_enabled). Built by
+# warm_seen_cache() and rebuilt by rebuild_bloom_filter(), only from a
+# complete load of the lookback window; until then, or when a load fails or
+# is cut short, it is None and every cache miss goes to the backend.
+_bloom: BloomFilter | None = None
+_bloom_stats = {"definite_misses": 0, "possible_hits": 0, "false_positives": 0}
+
+
+# --------------------------------------------------------------------------- #
+# Persistent backends
+# --------------------------------------------------------------------------- #
+
+
+class DedupBackend(ABC):
+    """
+    Durable store of seen posts behind the in-memory cache.
+
+    Methods are synchronous and may raise; callers time them, log failures
+    and call reset() so the next call starts from a fresh connection.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def fetch_seen(self, source: str, external_ids: list[str]) -> set[str]:
+        """Return the subset of external_ids already stored for source."""
+        ...
+
+    @abstractmethod
+    def upsert(self, rows: list[dict]) -> None:
+        """Insert or update rows keyed by (source, external_id)."""
+        ...
+
+    @abstractmethod
+    def load_recent(self, since: datetime, limit: int) -> list[tuple[str, str]]:
+        """Return up to limit (source, external_id) keys stored at or after since, newest first."""
+        ...
+
+    @abstractmethod
+    def ping(self) -> None:
+        """Run a trivial query; raise if the store is unreachable."""
+        ...
+
+    def prune(self, before: datetime) -> int:
+        """Delete rows stored before the given time. Returns rows removed."""
+        return 0
+
+    def reset(self) -> None:
+        """Drop any open connection; the next call reconnects."""
+
+    # Notification outbox: rows keyed by (source, external_id, channel) with
+    # fields payload (dict), attempts, next_attempt_at, created_at (epoch
+    # seconds) and last_error.
+
+    @abstractmethod
+    def outbox_put(self, row: dict) -> None:
+        """Insert or replace one outbox row."""
+        ...
+
+    @abstractmethod
+    def outbox_due(self, now: float, limit: int) -> list[dict]:
+        """Rows with next_attempt_at <= now, soonest first."""
+        ...
+
+    @abstractmethod
+    def outbox_delete(self, source: str, external_id: str, channel: str) -> None:
+        ...
+
+    @abstractmethod
+    def outbox_stats(self, now: float) -> tuple[int, int, float | None]:
+        """(rows, rows due at `now`, oldest created_at or None)."""
+        ...
+
+
+class _MemoryOutbox:
+    """Process-local outbox used when no dedup backend is configured."""
+
+    def __init__(self):
+        self.rows: dict[tuple[str, str, str], dict] = {}
+
+    def outbox_put(self, row: dict) -> None:
+        self.rows[(row["source"], row["external_id"], row["channel"])] = dict(row)
+
+    def outbox_due(self, now: float, limit: int) -> list[dict]:
+        due = sorted((r for r in self.rows.values() if r["next_attempt_at"] <= now),
+                     key=lambda r: r["next_attempt_at"])
+        return [dict(r) for r in due[:limit]]
+
+    def outbox_delete(self, source: str, external_id: str, channel: str) -> None:
+        self.rows.pop((source, external_id, channel), None)
+
+    def outbox_stats(self, now: float) -> tuple[int, int, float | None]:
+        rows = self.rows.values()
+        due = sum(1 for r in rows if r["next_attempt_at"] <= now)
+        oldest = min((r["created_at"] for r in rows), default=None)
+        return len(self.rows), due, oldest
+
+
+class SupabaseBackend(DedupBackend):
+    """scout_seen_posts in Supabase, via one lazily created process-wide client."""
+
+    name = "supabase"
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from supabase import create_client
+            self._client = create_client(settings.supabase_url, settings.supabase_key)
+        return self._client
+
+    def reset(self) -> None:
+        self._client = None
+
+    def ping(self) -> None:
+        self.client.table("scout_seen_posts").select("id").limit(1).execute()
+
+    def fetch_seen(self, source: str, external_ids: list[str]) -> set[str]:
+        if not external_ids:
+            return set()
+        result = (
+            self.client.table("scout_seen_posts")
+            .select("external_id")
+            .eq("source", source)
+            .in_("external_id", external_ids)
+            .execute()
+        )
+        return {str(row["external_id"]) for row in result.data or []}
+
+    def upsert(self, rows: list[dict]) -> None:
+        # Conflicts (UNIQUE constraint) are resolved as updates to handle races
+        self.client.table("scout_seen_posts").upsert(
+            rows, on_conflict="source,external_id"
+        ).execute()
+
+    def load_recent(self, since: datetime, limit: int) -> list[tuple[str, str]]:
+        # Paged until an empty page: a short page may only mean the server's
+        # max-rows is below _LOAD_PAGE_SIZE
+        keys: list[tuple[str, str]] = []
+        while len(keys) < limit:
+            end = min(len(keys) + _LOAD_PAGE_SIZE, limit) - 1
+            result = (
+                self.client.table("scout_seen_posts")
+                .select("source,external_id")
+                .gte("created_at", since.isoformat())
+                .order("created_at", desc=True)
+                .order("id")
+                .range(len(keys), end)
+                .execute()
+            )
+            rows = result.data or []
+            if not rows:
+                break
+            keys.extend((row["source"], str(row["external_id"])) for row in rows)
+        return keys
+
+    def outbox_put(self, row: dict) -> None:
+        self.client.table("scout_outbox").upsert(
+            row, on_conflict="source,external_id,channel"
+        ).execute()
+
+    def outbox_due(self, now: float, limit: int) -> list[dict]:
+        result = (
+            self.client.table("scout_outbox")
+            .select("source,external_id,channel,payload,attempts,next_attempt_at,created_at,last_error")
+            .lte("next_attempt_at", now)
+            .order("next_attempt_at")
+            .limit(limit)
+            .execute()
+        )
+        return list(result.data or [])
+
+    def outbox_delete(self, source: str, external_id: str, channel: str) -> None:
+        (
+            self.client.table("scout_outbox")
+            .delete()
+            .eq("source", source)
+            .eq("external_id", external_id)
+            .eq("channel", channel)
+            .execute()
+        )
+
+    def outbox_stats(self, now: float) -> tuple[int, int, float | None]:
+        table = self.client.table("scout_outbox")
+        oldest = table.select("created_at", count="exact").order("created_at").limit(1).execute()
+        due = table.select("id", count="exact").lte("next_attempt_at", now).limit(1).execute()
+        first = (oldest.data or [None])[0]
+        return oldest.count or 0, due.count or 0, first["created_at"] if first else None
+
+
+class SQLiteBackend(DedupBackend):
+    """Local scout_seen_posts table in a WAL-mode SQLite database."""
+
+    name = "sqlite"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scout_seen_posts (
+          id INTEGER PRIMARY KEY,
+          source TEXT NOT NULL,
+          external_id TEXT NOT NULL,
+          url TEXT NOT NULL,
+          title TEXT,
+          matched_pain_points TEXT,
+          relevance_score REAL,
+          notified INTEGER DEFAULT 0,
+          responded INTEGER DEFAULT 0,
+          created_at REAL NOT NULL,
+          UNIQUE(source, external_id)
+        );
+        CREATE INDEX IF NOT EXISTS scout_seen_posts_created_at
+          ON scout_seen_posts (created_at);
+        CREATE TABLE IF NOT EXISTS scout_outbox (
+          id INTEGER PRIMARY KEY,
+          source TEXT NOT NULL,
+          external_id TEXT NOT NULL,
+          channel TEXT NOT NULL,
+          payload TEXT NOT NULL,
+          attempts INTEGER NOT NULL DEFAULT 0,
+          next_attempt_at REAL NOT NULL,
+          created_at REAL NOT NULL,
+          last_error TEXT,
+          UNIQUE(source, external_id, channel)
+        );
+        CREATE INDEX IF NOT EXISTS scout_outbox_next_attempt_at
+          ON scout_outbox (next_attempt_at);
+    """
+
+    _OUTBOX_COLUMNS = (
+        "source", "external_id", "channel", "payload", "attempts",
+        "next_attempt_at", "created_at", "last_error",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def reset(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def ping(self) -> None:
+        self.conn.execute("SELECT 1")
+
+    def fetch_seen(self, source: str, external_ids: list[str]) -> set[str]:
+        if not external_ids:
+            return set()
+        placeholders = ",".join("?" * len(external_ids))
+        rows = self.conn.execute(
+            f"SELECT external_id FROM scout_seen_posts WHERE source = ? AND external_id IN ({placeholders})",
+            [source, *external_ids],
+        )
+        return {row[0] for row in rows}
+
+    def upsert(self, rows: list[dict]) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO scout_seen_posts
+                  (source, external_id, url, title, matched_pain_points, relevance_score, notified, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, external_id) DO UPDATE SET
+                  url = excluded.url,
+                  title = excluded.title,
+                  matched_pain_points = excluded.matched_pain_points,
+                  relevance_score = excluded.relevance_score,
+                  notified = excluded.notified
+                """,
+                [
+                    (
+                        row["source"], row["external_id"], row["url"], row["title"],
+                        json.dumps(row["matched_pain_points"]), row["relevance_score"],
+                        int(row["notified"]), now,
+                    )
+                    for row in rows
+                ],
+            )
+
+    def load_recent(self, since: datetime, limit: int) -> list[tuple[str, str]]:
+        rows = self.conn.execute(
+            "SELECT source, external_id FROM scout_seen_posts WHERE created_at >= ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (since.timestamp(), limit),
+        )
+        return [(source, external_id) for source, external_id in rows]
+
+    def prune(self, before: datetime) -> int:
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM scout_seen_posts WHERE created_at < ?", (before.timestamp(),))
+        return cursor.rowcount
+
+    def outbox_put(self, row: dict) -> None:
+        values = [json.dumps(row[col]) if col == "payload" else row.get(col) for col in self._OUTBOX_COLUMNS]
+        with self._transaction() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO scout_outbox ({', '.join(self._OUTBOX_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(self._OUTBOX_COLUMNS))})",
+                values,
+            )
+
+    def outbox_due(self, now: float, limit: int) -> list[dict]:
+        rows = self.conn.execute(
+            f"SELECT {', '.join(self._OUTBOX_COLUMNS)} FROM scout_outbox "
+            "WHERE next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+            (now, limit),
+        )
+        due = []
+        for values in rows:
+            row = dict(zip(self._OUTBOX_COLUMNS, values))
+            row["payload"] = json.loads(row["payload"])
+            due.append(row)
+        return due
+
+    def outbox_delete(self, source: str, external_id: str, channel: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM scout_outbox WHERE source = ? AND external_id = ? AND channel = ?",
+                (source, external_id, channel),
+            )
+
+    def outbox_stats(self, now: float) -> tuple[int, int, float | None]:
+        depth, due, oldest = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(next_attempt_at <= ?), 0), MIN(created_at) FROM scout_outbox",
+            (now,),
+        ).fetchone()
+        return depth, due, oldest
+
+    @contextmanager
+    def _transaction(self):
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+# Process-wide backend, resolved on first use (None means memory-only)
+_backend: DedupBackend | None = None
+_backend_resolved = False
+
+# Cumulative time spent waiting on the backend, see io_stats()
+_io_stats = {"calls": 0, "errors": 0, "seconds": 0.0}
+
+
+def _create_backend() -> DedupBackend | None:
+    choice = settings.dedup_backend
+    supabase_configured = bool(settings.supabase_url and settings.supabase_key)
+    if choice == "supabase" or (choice == "auto" and supabase_configured):
+        return SupabaseBackend() if supabase_configured else None
+    if choice in ("sqlite", "auto") and settings.dedup_sqlite_path:
+        return SQLiteBackend(settings.dedup_sqlite_path)
+    return None
+
+
+def _get_backend() -> DedupBackend | None:
+    """Return the shared dedup backend, or None when running memory-only."""
+    global _backend, _backend_resolved
+    if not _backend_resolved:
+        _backend = _create_backend()
+        _backend_resolved = True
+        logger.info("dedup_backend_selected", backend=_backend.name if _backend else "memory")
+    return _backend
+
+
+@contextmanager
+def use_backend(backend: DedupBackend | None):
+    """
+    Route dedup through `backend` (None = memory-only) inside the block,
+    starting from an empty cache, write buffer and Bloom filter. The
+    previous backend is restored on exit. For offline tools like src.bench;
+    unflushed rows are dropped, so call flush_seen() first.
+    """
+    global _backend, _backend_resolved, _bloom
+    saved = _backend, _backend_resolved, _bloom
+    _backend, _backend_resolved, _bloom = backend, True, None
+    _seen_in_memory.clear()
+    _pending_rows.clear()
+    try:
+        yield
+    finally:
+        _backend, _backend_resolved, _bloom = saved
+        _seen_in_memory.clear()
+        _pending_rows.clear()
+
+
+@contextmanager
+def _timed_io(backend: DedupBackend, op: str):
+    """Time one backend call and reset its connection if the call fails."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _io_stats["errors"] += 1
+        _IO_ERRORS.inc(backend=backend.name, op=op)
+        backend.reset()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _io_stats["calls"] += 1
+        _io_stats["seconds"] += elapsed
+        _IO_SECONDS.observe(elapsed, backend=backend.name, op=op)
+
+
+def io_stats() -> dict:
+    """Return cumulative dedup I/O counters (calls, errors, total and mean latency)."""
+    calls = _io_stats["calls"]
+    return {
+        "calls": calls,
+        "errors": _io_stats["errors"],
+        "total_ms": round(_io_stats["seconds"] * 1000, 1),
+        "mean_ms": round(_io_stats["seconds"] * 1000 / calls, 1) if calls else 0.0,
+    }
+
+
+def check_connection() -> bool:
+    """
+    Health check: run a trivial query on the backend.
+
+    Returns False (and drops the connection so it is recreated) if the
+    backend is unreachable; True if healthy or running memory-only.
+    """
+    backend = _get_backend()
+    if backend is None:
+        return True
     try:
-        from supabase import create_client
-        return create_client(settings.supabase_url, settings.supabase_key)
+        with _timed_io(backend, "ping"):
+            backend.ping()
+        return True
     except Exception as exc:
-        logger.warning("supabase_client_init_failed", error=str(exc))
+        logger.warning("dedup_health_check_failed", backend=backend.name, error=str(exc))
+        return False
+
+
+# --------------------------------------------------------------------------- #
+# Public interface
+# --------------------------------------------------------------------------- #
+
+
+def _bloom_key(key: tuple[str, str]) -> str:
+    return f"{key[0]}\x1f{key[1]}"
+
+
+def _remember(key: tuple[str, str]) -> None:
+    """Record a key as seen in the in-memory cache and the Bloom filter."""
+    _seen_in_memory.add(key)
+    if _bloom is not None:
+        _bloom.add(_bloom_key(key))
+
+
+def save_bloom_filter() -> None:
+    """Persist the Bloom filter to bloom_filter_path (no-op when disabled)."""
+    if _bloom is None or not settings.bloom_filter_path:
+        return
+    try:
+        _bloom.save(settings.bloom_filter_path)
+    except OSError as exc:
+        logger.warning("bloom_filter_save_failed", error=str(exc))
+
+
+def bloom_stats() -> dict:
+    """
+    Bloom pre-filter counters. false_positive_rate is measured: possible hits
+    the backend then reported as new, over all keys that turned out new.
+    """
+    misses = _bloom_stats["definite_misses"]
+    false_positives = _bloom_stats["false_positives"]
+    negatives = misses + false_positives
+    return {
+        "enabled": _bloom is not None,
+        **_bloom_stats,
+        "false_positive_rate": round(false_positives / negatives, 4) if negatives else 0.0,
+        "estimated_error_rate": round(_bloom.estimated_error_rate(), 6) if _bloom is not None else 0.0,
+    }
+
+
+def _seen_locally(key: tuple[str, str]) -> bool:
+    """True if the key is cached, or buffered and not yet flushed to the backend."""
+    return key in _seen_in_memory or key in _pending_rows
+
+
+def _load_window(backend: DedupBackend) -> tuple[list[tuple[str, str]], bool] | None:
+    """
+    Keys the backend stored within the lookback window, up to
+    seen_cache_max_size, and whether that is all of them. None on error.
+    """
+    limit = settings.seen_cache_max_size
+    since = datetime.now(timezone.utc) - timedelta(seconds=settings.lookback_seconds)
+    try:
+        with _timed_io(backend, "load_recent"):
+            # One extra key tells a full window from one that was cut short
+            keys = backend.load_recent(since, limit + 1)
+    except Exception as exc:
+        logger.warning("dedup_load_recent_failed", backend=backend.name, error=str(exc))
         return None
+    return keys[:limit], len(keys) <= limit
+
+
+def _bloom_incomplete(keys: int) -> None:
+    global _bloom
+    _bloom = None
+    logger.warning("bloom_filter_disabled", reason="lookback_window_over_limit", keys=keys)
+
+
+async def warm_seen_cache() -> int:
+    """
+    Preload the in-memory cache with every key the backend recorded within
+    the lookback window. Call once at startup so the first run after a
+    deploy doesn't query the backend for posts it has already handled.
+
+    Returns the number of keys loaded.
+    """
+    global _bloom
+    backend = _get_backend()
+    if backend is None:
+        return 0
+
+    loaded = _load_window(backend)
+    if loaded is None:
+        _bloom = None  # can't prove the filter is complete
+        return 0
+    keys, complete = loaded
+
+    if settings.bloom_filter_enabled:
+        if complete:
+            _bloom = _load_bloom_filter()
+        else:
+            _bloom_incomplete(len(keys))
+    for key in keys:
+        _remember(key)
+    save_bloom_filter()
+    logger.info("seen_cache_warmed", keys=len(keys), bloom_filter=_bloom is not None)
+    return len(keys)
+
+
+async def rebuild_bloom_filter() -> bool:
+    """
+    Replace the Bloom filter with a fresh one built from the backend's
+    lookback window. This adds keys other processes stored since the last
+    build and drops expired ones, so the filter stays within capacity.
+    Scheduled every bloom_filter_rebuild_seconds. Returns whether a filter
+    is in place afterwards.
+    """
+    global _bloom
+    backend = _get_backend()
+    if not settings.bloom_filter_enabled or backend is None:
+        return False
+
+    loaded = _load_window(backend)
+    if loaded is None:
+        _bloom = None
+        return False
+    keys, complete = loaded
+    if not complete:
+        _bloom_incomplete(len(keys))
+        return False
+
+    bloom = BloomFilter(settings.bloom_filter_capacity, settings.bloom_filter_error_rate)
+    # Buffered rows aren't in the backend yet
+    for key in [*keys, *_pending_rows]:
+        bloom.add(_bloom_key(key))
+    _bloom = bloom
+    save_bloom_filter()
+    logger.info("bloom_filter_rebuilt", keys=len(keys) + len(_pending_rows))
+    return True
+
+
+def _load_bloom_filter() -> BloomFilter:
+    """
+    Load the persisted filter, or start an empty one. Either way the caller
+    then adds every key from the lookback window, so keys other processes
+    wrote to the backend since the file was saved are covered as well.
+    """
+    capacity, error_rate = settings.bloom_filter_capacity, settings.bloom_filter_error_rate
+    if settings.bloom_filter_path:
+        bf = BloomFilter.load(settings.bloom_filter_path, capacity, error_rate)
+        if bf is not None:
+            return bf
+    return BloomFilter(capacity, error_rate)
 
 
 async def is_new(post: Post) -> bool:
     """
     Return True if this (source, external_id) has never been seen before.
 
-    Checks Supabase first; falls back to in-memory set.
+    Checks the in-memory cache first, then the backend.
     Does NOT insert — call mark_seen() after notification.
     """
-    key = (post.source, post.external_id)
+    return bool(await filter_new([post]))
 
-    # In-memory fast path
-    if key in _seen_in_memory:
-        return False
 
-    supabase = _get_supabase_client()
-    if supabase is None:
-        return True  # no Supabase → rely on in-memory only
+async def filter_new(posts: list[Post]) -> list[Post]:
+    """
+    Return the posts whose (source, external_id) has never been seen, in order.
 
-    try:
-        result = (
-            supabase.table("scout_seen_posts")
-            .select("id")
-            .eq("source", post.source)
-            .eq("external_id", post.external_id)
-            .limit(1)
-            .execute()
-        )
-        if result.data:
-            _seen_in_memory.add(key)
-            return False
-        return True
-    except Exception as exc:
-        logger.warning("supabase_dedup_check_failed", error=str(exc))
-        return True  # assume new on error
+    Posts missing from the in-memory cache are resolved with one backend
+    query per source (per chunk of ids) rather than one round trip per post.
+    With the Bloom pre-filter enabled, only keys it reports as possibly seen
+    are queried. Ids found are added to the cache. Does NOT insert — call
+    mark_seen() after notification.
+    """
+    candidates = [p for p in posts if not _seen_locally((p.source, p.external_id))]
+    _CACHE_LOOKUPS.inc(len(posts) - len(candidates), result="hit")
+    _CACHE_LOOKUPS.inc(len(candidates), result="miss")
+    if not candidates:
+        return []
+
+    backend = _get_backend()
+    if backend is None:
+        return _unique(candidates)
+
+    ids_by_source: dict[str, dict[str, None]] = {}
+    for post in candidates:
+        key = (post.source, post.external_id)
+        if _bloom is not None:
+            # A definite miss is new without asking the backend
+            if _bloom_key(key) not in _bloom:
+                _bloom_stats["definite_misses"] += 1
+                continue
+            _bloom_stats["possible_hits"] += 1
+        ids_by_source.setdefault(post.source, {})[post.external_id] = None
+
+    for source, id_set in ids_by_source.items():
+        ids = list(id_set)
+        for start in range(0, len(ids), _LOOKUP_CHUNK_SIZE):
+            chunk = ids[start:start + _LOOKUP_CHUNK_SIZE]
+            try:
+                with _timed_io(backend, "fetch_seen"):
+                    found = backend.fetch_seen(source, chunk)
+            except Exception as exc:
+                logger.warning("dedup_check_failed", backend=backend.name, source=source, error=str(exc))
+                continue  # assume new on error
+            for external_id in found:
+                _remember((source, external_id))
+            if _bloom is not None:
+                _bloom_stats["false_positives"] += len(chunk) - len(found)
+
+    return _unique(p for p in candidates if not _seen_locally((p.source, p.external_id)))
+
+
+def _unique(posts) -> list[Post]:
+    """Drop repeated (source, external_id) keys, keeping the first occurrence."""
+    keys: set[tuple[str, str]] = set()
+    unique = []
+    for post in posts:
+        key = (post.source, post.external_id)
+        if key not in keys:
+            keys.add(key)
+            unique.append(post)
+    return unique
 
 
 async def mark_seen(scored: ScoredPost, notified: bool = True) -> None:
     """
-    Record the post in Supabase and the in-memory set.
-    Silently ignores conflicts (UNIQUE constraint) to handle races.
+    Record the post in the in-memory cache and queue its backend row.
+
+    Rows are written behind: they collect in a buffer and go out as one
+    multi-row upsert once the buffer reaches dedup_flush_size rows or its
+    oldest row is dedup_flush_interval_seconds old (see flush_seen()).
+    The in-memory cache answers dedup checks for buffered posts meanwhile.
     """
+    global _pending_since
     post = scored.post
     key = (post.source, post.external_id)
-    _seen_in_memory.add(key)
+    _remember(key)
 
-    supabase = _get_supabase_client()
-    if supabase is None:
+    if _get_backend() is None:
         return
 
-    row = {
+    if not _pending_rows:
+        _pending_since = time.monotonic()
+    _pending_rows[key] = {
         "source": post.source,
         "external_id": post.external_id,
         "url": post.url,
         "title": post.title,
-        "matched_pain_points": scored.matched_pain_points,
+        "matched_pain_points": list(scored.matched_pain_points),
         "relevance_score": float(scored.score),
         "notified": notified,
     }
 
+    if len(_pending_rows) >= settings.dedup_flush_size or _pending_age() >= settings.dedup_flush_interval_seconds:
+        await flush_seen()
+
+
+def _pending_age() -> float:
+    """Seconds since the oldest buffered row was queued (0 when empty)."""
+    if not _pending_rows or _pending_since is None:
+        return 0.0
+    return time.monotonic() - _pending_since
+
+
+async def flush_seen() -> bool:
+    """
+    Upsert every buffered row to the backend in one request.
+
+    Retries with exponential backoff. Rows leave the buffer only once the
+    backend acknowledges the upsert; after the last failed attempt they stay
+    queued for the next flush. Returns True when the buffer is empty afterwards.
+    """
+    global _pending_since
+    async with _flush_lock:
+        backend = _get_backend()
+        if not _pending_rows or backend is None:
+            return True
+
+        batch = dict(_pending_rows)
+        for attempt in range(settings.dedup_flush_retries):
+            try:
+                with _timed_io(backend, "upsert"):
+                    backend.upsert(list(batch.values()))
+            except Exception as exc:
+                logger.warning("dedup_mark_seen_failed", backend=backend.name, rows=len(batch),
+                               attempt=attempt + 1, error=str(exc))
+                if attempt + 1 < settings.dedup_flush_retries:
+                    await asyncio.sleep(_FLUSH_BACKOFF_SECONDS * 2 ** attempt)
+                continue
+
+            for key, row in batch.items():
+                # Keep rows re-queued with newer data while we were retrying
+                if _pending_rows.get(key) is row:
+                    del _pending_rows[key]
+            _pending_since = time.monotonic() if _pending_rows else None
+            save_bloom_filter()
+            logger.debug("dedup_mark_seen_flushed", backend=backend.name, rows=len(batch))
+            return not _pending_rows
+
+        return False
+
+
+async def prune_seen() -> int:
+    """Delete backend rows older than dedup_retention_days. Returns rows removed."""
+    backend = _get_backend()
+    if backend is None:
+        return 0
+    before = datetime.now(timezone.utc) - timedelta(days=settings.dedup_retention_days)
     try:
-        supabase.table("scout_seen_posts").upsert(
-            row, on_conflict="source,external_id"
-        ).execute()
+        with _timed_io(backend, "prune"):
+            removed = backend.prune(before)
     except Exception as exc:
-        logger.warning("supabase_mark_seen_failed", error=str(exc))
+        logger.warning("dedup_prune_failed", backend=backend.name, error=str(exc))
+        return 0
+    if removed:
+        logger.info("dedup_pruned", backend=backend.name, rows=removed)
+    return removed
+
+
+# --------------------------------------------------------------------------- #
+# Notification outbox
+# --------------------------------------------------------------------------- #
+
+_memory_outbox = _MemoryOutbox()
+
+# Last known outbox size, refreshed on every outbox write and drain pass
+_outbox_stats: dict = {"depth": 0, "due": 0, "oldest_created_at": None}
+
+
+def _outbox_store():
+    """The backend when one is configured (durable), else the process-local outbox."""
+    return _get_backend() or _memory_outbox
+
+
+def _outbox_call(method: str, *args):
+    """Run one outbox operation, timed like other backend I/O. Raises on failure."""
+    store = _outbox_store()
+    if store is _memory_outbox:
+        return getattr(store, method)(*args)
+    with _timed_io(store, method):
+        return getattr(store, method)(*args)
+
+
+async def outbox_put(row: dict) -> bool:
+    """Queue (or re-queue) a notification for retry. Returns False if it couldn't be stored."""
+    try:
+        _outbox_call("outbox_put", row)
+    except Exception as exc:
+        logger.warning("outbox_put_failed", channel=row["channel"], external_id=row["external_id"],
+                       error=str(exc))
+        return False
+    await refresh_outbox_stats()
+    return True
+
+
+async def outbox_due(limit: int) -> list[dict]:
+    """Notifications whose next attempt is due, soonest first."""
+    try:
+        return _outbox_call("outbox_due", time.time(), limit)
+    except Exception as exc:
+        logger.warning("outbox_read_failed", error=str(exc))
+        return []
+
+
+async def outbox_delete(row: dict) -> None:
+    try:
+        _outbox_call("outbox_delete", row["source"], row["external_id"], row["channel"])
+    except Exception as exc:
+        logger.warning("outbox_delete_failed", channel=row["channel"], external_id=row["external_id"],
+                       error=str(exc))
+
+
+async def refresh_outbox_stats() -> None:
+    try:
+        depth, due, oldest = _outbox_call("outbox_stats", time.time())
+    except Exception as exc:
+        logger.warning("outbox_stats_failed", error=str(exc))
+        return
+    _outbox_stats.update(depth=depth, due=due, oldest_created_at=oldest)
+
+
+def outbox_stats() -> dict:
+    """Outbox depth, rows due now and age of the oldest row, as of the last refresh."""
+    oldest = _outbox_stats["oldest_created_at"]
+    return {
+        "depth": _outbox_stats["depth"],
+        "due": _outbox_stats["due"],
+        "oldest_age_seconds": round(time.time() - oldest, 1) if oldest is not None else 0.0,
+        "durable": _get_backend() is not None,
+    }
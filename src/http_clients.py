@@ -0,0 +1,101 @@
+"""
+Application-scoped HTTP clients, one pooled httpx.AsyncClient per upstream host.
+
+start() is called from the FastAPI lifespan and aclose() on shutdown, so
+connections and TLS sessions are reused across collector runs and
+notifications. Outside the app (CLI, tests) client() falls back to a
+short-lived client with the same settings.
+"""
+
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# HTTP/2 is negotiated via ALPN and falls back to HTTP/1.1 per host, so it is
+# safe to request wherever the optional h2 package is installed.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# name → (timeout seconds, max connections to that host)
+_PROFILES: dict[str, tuple[float, int]] = {
+    "stackoverflow": (15.0, 2),
+    "hackernews": (15.0, 4),
+    "reddit": (15.0, 2),
+    "github": (15.0, 4),
+    "discord": (10.0, 4),
+    "telegram": (10.0, 4),
+}
+
+_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _client_kwargs(name: str) -> dict:
+    timeout, max_connections = _PROFILES[name]
+    return {
+        "timeout": timeout,
+        "http2": _HTTP2_AVAILABLE,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+
+
+async def start() -> None:
+    """Create the shared client for every profile (idempotent)."""
+    for name in _PROFILES:
+        if name not in _clients:
+            _clients[name] = httpx.AsyncClient(**_client_kwargs(name))
+    logger.info("http_clients_started", clients=len(_clients), http2=_HTTP2_AVAILABLE)
+
+
+async def aclose() -> None:
+    """Close every shared client and its connection pool."""
+    while _clients:
+        name, client = _clients.popitem()
+        try:
+            await client.aclose()
+        except Exception as exc:
+            logger.warning("http_client_close_failed", client=name, error=str(exc))
+    logger.info("http_clients_closed")
+
+
+@asynccontextmanager
+async def override(name: str, replacement: httpx.AsyncClient) -> AsyncIterator[None]:
+    """
+    Serve `replacement` as the client for `name` inside the block (e.g. one
+    with an httpx.MockTransport), then close it and restore the previous one.
+    """
+    previous = _clients.get(name)
+    _clients[name] = replacement
+    try:
+        yield
+    finally:
+        if previous is None:
+            _clients.pop(name, None)
+        else:
+            _clients[name] = previous
+        await replacement.aclose()
+
+
+@asynccontextmanager
+async def client(name: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield the shared client for `name`, or a temporary one (closed on exit)
+    when start() hasn't been called. Never close the yielded client yourself;
+    pass per-request headers rather than mutating it.
+    """
+    shared = _clients.get(name)
+    if shared is not None:
+        yield shared
+        return
+    async with httpx.AsyncClient(**_client_kwargs(name)) as temporary:
+        yield temporary
@@ -1,8 +1,22 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from src import http_clients
+from src.collectors.rate_limit import quota_stats
 from src.config import settings
+from src.dedup import (
+    bloom_stats,
+    check_connection,
+    flush_seen,
+    io_stats,
+    outbox_stats,
+    save_bloom_filter,
+    warm_seen_cache,
+)
+from src.scoring import shutdown_scoring_pool
+from src.utils import metrics
 from src.utils.logging import get_logger, setup_logging
 
 setup_logging()
@@ -11,11 +25,17 @@ logger = get_logger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await http_clients.start()
+
     # Only start the scheduler in non-test environments
     scheduler = None
     if settings.app_env != "test":
         from src.scheduler import create_scheduler
 
+        # Opens the dedup backend up front so misconfiguration shows at boot
+        if check_connection():
+            await warm_seen_cache()
+
         scheduler = create_scheduler()
         scheduler.start()
         logger.info("scheduler_started", jobs=len(scheduler.get_jobs()))
@@ -26,6 +46,12 @@ async def lifespan(app: FastAPI):
         scheduler.shutdown(wait=False)
         logger.info("scheduler_stopped")
 
+    # Persist anything still sitting in the dedup write-behind buffer
+    await flush_seen()
+    save_bloom_filter()
+    await http_clients.aclose()
+    shutdown_scoring_pool()
+
 
 app = FastAPI(
     title="CH Scout Agent",
@@ -45,4 +71,14 @@ async def health():
         "status": "ok",
         "service": "ch-scout-agent",
         "environment": settings.app_env,
+        "dedup_io": io_stats(),
+        "dedup_bloom": bloom_stats(),
+        "collector_quota": quota_stats(),
+        "notify_outbox": outbox_stats(),
     }
+
+
+@app.get("/metrics", tags=["Health"], openapi_extra={"security": []}, response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Counters and latency histograms in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
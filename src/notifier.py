@@ -1,12 +1,38 @@
+"""
+Lead notifications: pluggable channels, concurrent fan-out, and a retry outbox.
+
+A send that fails with a retryable error (429, 5xx, timeout, network error)
+is stored in the notification outbox (kept in the dedup backend) and retried
+by drain_outbox(). Retries use exponential backoff, and wait at least as long
+as the service's own retry_after when it sends one.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+
 import httpx
 
+from src import http_clients
+from src.collectors.base import Post
 from src.config import settings
-from src.scoring import ScoredPost
+from src.dedup import mark_seen, outbox_delete, outbox_due, outbox_put, refresh_outbox_stats
+from src.scoring import PainPoint, ScoredPost
 from src.templates import get_draft_reply
+from src.utils import metrics
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_SEND_SECONDS = metrics.histogram(
+    "scout_notification_seconds", "Time to deliver a notification, per channel.", ("channel",)
+)
+_SEND_FAILURES = metrics.counter(
+    "scout_notification_failures_total", "Failed notification sends.", ("channel", "reason")
+)
+
 _MAX_BODY_LEN = 300
 
 
@@ -21,47 +47,242 @@ def _escape_html(text: str) -> str:
     return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
+# ---------------------------------------------------------------------------
+# Rendering — shared by every channel
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Notification:
+    """A ScoredPost plus the channel-independent text, rendered once per post."""
+    scored: ScoredPost
+    draft: str
+    pain_points: str
+    source_label: str
+
+
+def render(scored: ScoredPost) -> Notification:
+    return Notification(
+        scored=scored,
+        draft=get_draft_reply(scored.matched_pain_points),
+        pain_points=", ".join(scored.matched_pain_points) if scored.matched_pain_points else "general",
+        source_label=scored.post.source.capitalize(),
+    )
+
+
+@dataclass
+class Delivery:
+    """Outcome of one channel send."""
+    ok: bool
+    status: int | None = None         # HTTP status; None when no response arrived
+    retryable: bool = False           # worth queueing in the outbox
+    retry_after: float | None = None  # seconds the service asked us to wait
+    error: str = ""
+
+
+def _http_delivery(response: httpx.Response, ok_statuses: tuple[int, ...], retry_after=None) -> Delivery:
+    status = response.status_code
+    if status in ok_statuses:
+        return Delivery(ok=True, status=status)
+    return Delivery(
+        ok=False,
+        status=status,
+        retryable=status == 429 or status >= 500,
+        retry_after=retry_after(response) if status == 429 and retry_after else None,
+        error=f"HTTP {status}",
+    )
+
+
+def _json_retry_after(*path: str):
+    """Read a 429's retry_after from the JSON body at `path`, else the Retry-After header."""
+    def read(response: httpx.Response) -> float | None:
+        try:
+            value = response.json()
+            for key in path:
+                value = value[key]
+            return float(value)
+        except Exception:
+            pass
+        try:
+            return float(response.headers["Retry-After"])
+        except Exception:
+            return None
+    return read
+
+
+class NotificationChannel(ABC):
+    """
+    A destination for lead notifications.
+
+    Subclasses set `name` and implement enabled() and send(). Register an
+    instance with register_channel() and send_notification() includes it.
+    send() returns a Delivery (or a plain bool) rather than raising on
+    delivery failure; a retryable Delivery puts the post in the outbox.
+    """
+
+    name: str = ""
+    # Upper bound on one send() before it counts as failed
+    timeout_seconds: float = 10.0
+
+    @abstractmethod
+    def enabled(self) -> bool:
+        """True when the channel is configured (checked on every send)."""
+        ...
+
+    @abstractmethod
+    async def send(self, notification: Notification) -> "Delivery | bool":
+        ...
+
+
 # ---------------------------------------------------------------------------
 # Discord
 # ---------------------------------------------------------------------------
 
 
-async def _send_discord(scored: ScoredPost) -> bool:
-    if not settings.scout_webhook_url:
-        return False
+# Discord accepts at most 10 embeds per message and 6000 characters across them
+_DISCORD_MAX_EMBEDS = 10
+_DISCORD_MAX_MESSAGE_CHARS = 6000
+# 429 bodies carry {"retry_after": seconds}
+_DISCORD_RETRY_AFTER = _json_retry_after("retry_after")
 
-    post = scored.post
-    draft = get_draft_reply(scored.matched_pain_points)
-    pain_points_str = ", ".join(scored.matched_pain_points) if scored.matched_pain_points else "general"
 
-    embed = {
-        "title": _truncate(post.title, 256),
-        "url": post.url,
-        "color": 0x5865F2,
-        "fields": [
-            {"name": "Source", "value": post.source.capitalize(), "inline": True},
-            {"name": "Score", "value": f"{scored.score:.2f}", "inline": True},
-            {"name": "Pain points", "value": pain_points_str, "inline": True},
-            {"name": "Draft reply", "value": _truncate(draft, 1024), "inline": False},
-        ],
-        "footer": {"text": "ch-scout-agent • do not auto-post"},
-    }
-    if post.body:
-        embed["description"] = _truncate(post.body)
+def _embed_size(embed: dict) -> int:
+    """Characters Discord counts towards the per-message embed limit."""
+    size = len(embed.get("title", "")) + len(embed.get("description", ""))
+    size += len(embed.get("footer", {}).get("text", ""))
+    for field in embed.get("fields", []):
+        size += len(field["name"]) + len(field["value"])
+    return size
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(settings.scout_webhook_url, json={"embeds": [embed]})
-            if response.status_code in (200, 204):
-                logger.info("discord_notification_sent", source=post.source,
-                            external_id=post.external_id, score=scored.score)
-                return True
-            logger.warning("discord_notification_failed", status_code=response.status_code,
-                           body=response.text[:200])
-            return False
-    except Exception as exc:
-        logger.warning("discord_notification_exception", error=str(exc))
-        return False
+
+class _DiscordBatcher:
+    """
+    Packs embeds submitted within discord_batch_window_seconds into one
+    webhook message (up to 10 embeds / 6000 characters) and resolves each
+    submitter with the outcome for its own post.
+    """
+
+    def __init__(self, channel: "DiscordChannel"):
+        self.channel = channel
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._pending_chars = 0
+        self._timer: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, embed: dict, window: float) -> Delivery:
+        size = _embed_size(embed)
+        if self._pending and self._pending_chars + size > _DISCORD_MAX_MESSAGE_CHARS:
+            self._flush()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((embed, future))
+        self._pending_chars += size
+
+        if len(self._pending) >= _DISCORD_MAX_EMBEDS:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after(window))
+        return await future
+
+    async def _flush_after(self, window: float) -> None:
+        await asyncio.sleep(window)
+        self._timer = None
+        self._flush()
+
+    def _flush(self) -> None:
+        batch, self._pending, self._pending_chars = self._pending, [], 0
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        if batch:
+            task = asyncio.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        # Submitters that already gave up (channel timeout) aren't sent, so a
+        # post is never delivered while recorded as failed
+        batch = [(embed, future) for embed, future in batch if not future.done()]
+        if not batch:
+            return
+        delivery = await self.channel.post_embeds([embed for embed, _ in batch])
+        if not delivery.ok and not delivery.retryable and delivery.status is not None and len(batch) > 1:
+            # One malformed embed rejects the whole message: retry singly
+            logger.warning("discord_batch_rejected", status_code=delivery.status, size=len(batch))
+            results = await asyncio.gather(*(self.channel.post_embeds([embed]) for embed, _ in batch))
+        else:
+            results = [delivery] * len(batch)
+            if delivery.ok:
+                logger.info("discord_batch_sent", size=len(batch))
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class DiscordChannel(NotificationChannel):
+    name = "discord"
+
+    def __init__(self):
+        self._batcher = _DiscordBatcher(self)
+
+    def enabled(self) -> bool:
+        return bool(settings.scout_webhook_url)
+
+    @staticmethod
+    def embed(notification: Notification) -> dict:
+        scored = notification.scored
+        post = scored.post
+        embed = {
+            "title": _truncate(post.title, 256),
+            "url": post.url,
+            "color": 0x5865F2,
+            "fields": [
+                {"name": "Source", "value": notification.source_label, "inline": True},
+                {"name": "Score", "value": f"{scored.score:.2f}", "inline": True},
+                {"name": "Pain points", "value": notification.pain_points, "inline": True},
+                {"name": "Draft reply", "value": _truncate(notification.draft, 1024), "inline": False},
+            ],
+            "footer": {"text": "ch-scout-agent • do not auto-post"},
+        }
+        if post.body:
+            embed["description"] = _truncate(post.body)
+        return embed
+
+    async def send(self, notification: Notification) -> Delivery:
+        scored = notification.scored
+        post = scored.post
+        embed = self.embed(notification)
+
+        window = settings.discord_batch_window_seconds
+        if window > 0:
+            delivery = await self._batcher.submit(embed, window)
+        else:
+            delivery = await self.post_embeds([embed])
+        if delivery.ok:
+            logger.info("discord_notification_sent", source=post.source,
+                        external_id=post.external_id, score=scored.score)
+        return delivery
+
+    async def post_embeds(self, embeds: list[dict]) -> Delivery:
+        """POST one webhook message."""
+        try:
+            async with http_clients.client("discord") as client:
+                response = await client.post(settings.scout_webhook_url, json={"embeds": embeds})
+                if response.status_code not in (200, 204):
+                    logger.warning("discord_notification_failed", status_code=response.status_code,
+                                   body=response.text[:200], embeds=len(embeds))
+                return _http_delivery(response, (200, 204), _DISCORD_RETRY_AFTER)
+        except Exception as exc:
+            logger.warning("discord_notification_exception", error=str(exc))
+            return Delivery(ok=False, retryable=True, error=str(exc))
+
+
+_discord = DiscordChannel()
+
+
+async def _send_discord(scored: ScoredPost) -> bool:
+    return _discord.enabled() and (await _discord.send(render(scored))).ok
 
 
 # ---------------------------------------------------------------------------
@@ -69,64 +290,249 @@ async def _send_discord(scored: ScoredPost) -> bool:
 # ---------------------------------------------------------------------------
 
 
-async def _send_telegram(scored: ScoredPost) -> bool:
-    if not settings.telegram_bot_token or not settings.telegram_chat_id:
-        return False
+# 429 bodies carry {"parameters": {"retry_after": seconds}}
+_TELEGRAM_RETRY_AFTER = _json_retry_after("parameters", "retry_after")
 
-    post = scored.post
-    draft = get_draft_reply(scored.matched_pain_points)
-    pain_points_str = ", ".join(scored.matched_pain_points) if scored.matched_pain_points else "general"
-
-    parts = [
-        f"<b>{_escape_html(pain_points_str)}</b> | {post.source.capitalize()} | score {scored.score:.2f}",
-        f'<a href="{post.url}">{_escape_html(_truncate(post.title, 200))}</a>',
-    ]
-    if post.body and post.body.strip():
-        parts.append(f"\n<i>{_escape_html(_truncate(post.body, 400))}</i>")
-    parts.append(f"\n💬 <code>{_escape_html(_truncate(draft, 280))}</code>")
-    text = "\n".join(parts)
-
-    payload = {
-        "chat_id": settings.telegram_chat_id,
-        "text": text,
-        "parse_mode": "HTML",
-        "disable_web_page_preview": True,
-    }
 
-    url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
+class TelegramChannel(NotificationChannel):
+    name = "telegram"
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload)
-            if response.status_code == 200:
-                logger.info("telegram_notification_sent", source=post.source,
-                            external_id=post.external_id, score=scored.score)
-                return True
-            logger.warning("telegram_notification_failed", status_code=response.status_code,
-                           body=response.text[:200])
-            return False
-    except Exception as exc:
-        logger.warning("telegram_notification_exception", error=str(exc))
-        return False
+    def enabled(self) -> bool:
+        return bool(settings.telegram_bot_token and settings.telegram_chat_id)
+
+    @staticmethod
+    def text(notification: Notification) -> str:
+        scored = notification.scored
+        post = scored.post
+        parts = [
+            f"<b>{_escape_html(notification.pain_points)}</b> | {notification.source_label}"
+            f" | score {scored.score:.2f}",
+            f'<a href="{post.url}">{_escape_html(_truncate(post.title, 200))}</a>',
+        ]
+        if post.body and post.body.strip():
+            parts.append(f"\n<i>{_escape_html(_truncate(post.body, 400))}</i>")
+        parts.append(f"\n💬 <code>{_escape_html(_truncate(notification.draft, 280))}</code>")
+        return "\n".join(parts)
+
+    async def send(self, notification: Notification) -> Delivery:
+        scored = notification.scored
+        post = scored.post
+        payload = {
+            "chat_id": settings.telegram_chat_id,
+            "text": self.text(notification),
+            "parse_mode": "HTML",
+            "disable_web_page_preview": True,
+        }
+        url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
+
+        try:
+            async with http_clients.client("telegram") as client:
+                response = await client.post(url, json=payload)
+                if response.status_code == 200:
+                    logger.info("telegram_notification_sent", source=post.source,
+                                external_id=post.external_id, score=scored.score)
+                else:
+                    logger.warning("telegram_notification_failed", status_code=response.status_code,
+                                   body=response.text[:200])
+                return _http_delivery(response, (200,), _TELEGRAM_RETRY_AFTER)
+        except Exception as exc:
+            logger.warning("telegram_notification_exception", error=str(exc))
+            return Delivery(ok=False, retryable=True, error=str(exc))
+
+
+_telegram = TelegramChannel()
+
+
+async def _send_telegram(scored: ScoredPost) -> bool:
+    return _telegram.enabled() and (await _telegram.send(render(scored))).ok
 
 
 # ---------------------------------------------------------------------------
 # Public interface — fans out to all configured channels
 # ---------------------------------------------------------------------------
 
+_channels: list[NotificationChannel] = [_discord, _telegram]
+
+
+def register_channel(channel: NotificationChannel) -> None:
+    """Add a channel to every future send_notification() fan-out."""
+    _channels.append(channel)
+
+
+async def _send_with_timeout(channel: NotificationChannel, notification: Notification) -> Delivery:
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(channel.send(notification), channel.timeout_seconds)
+    except asyncio.TimeoutError:
+        logger.warning(f"{channel.name}_notification_timeout", timeout_seconds=channel.timeout_seconds)
+        delivery, reason = Delivery(ok=False, retryable=True, error="timeout"), "timeout"
+    except Exception as exc:
+        logger.warning(f"{channel.name}_notification_exception", error=str(exc))
+        delivery, reason = Delivery(ok=False, retryable=True, error=str(exc)), "exception"
+    else:
+        delivery = result if isinstance(result, Delivery) else Delivery(ok=bool(result))
+        reason = str(delivery.status) if delivery.status is not None else "error"
+
+    _SEND_SECONDS.observe(time.perf_counter() - started, channel=channel.name)
+    if not delivery.ok:
+        _SEND_FAILURES.inc(channel=channel.name, reason=reason)
+    return delivery
+
+
+async def _deliver(scored: ScoredPost) -> dict[str, Delivery]:
+    channels = [channel for channel in _channels if channel.enabled()]
+    if not channels:
+        return {}
+    notification = render(scored)
+    results = await asyncio.gather(*(_send_with_timeout(ch, notification) for ch in channels))
+    return {channel.name: delivery for channel, delivery in zip(channels, results)}
+
+
+async def dispatch(scored: ScoredPost) -> dict[str, bool]:
+    """
+    Render once and send to every enabled channel concurrently.
+
+    Returns each enabled channel's result by name; a channel that times out
+    or raises counts as False.
+    """
+    return {name: delivery.ok for name, delivery in (await _deliver(scored)).items()}
+
 
 async def send_notification(scored: ScoredPost) -> bool:
     """
-    Send a notification to all configured channels (Discord and/or Telegram).
+    Send a notification to all configured channels (Discord, Telegram and
+    any registered extras) concurrently.
 
-    Returns True if at least one channel succeeded.
+    Channels that fail with a retryable error are queued in the outbox for
+    drain_outbox() to retry. Returns True if at least one channel succeeded.
     Never raises — callers treat notification failure as non-fatal.
     """
-    discord_ok = await _send_discord(scored)
-    telegram_ok = await _send_telegram(scored)
+    deliveries = await _deliver(scored)
 
-    if not discord_ok and not telegram_ok:
-        logger.warning("no_notification_channels_configured_or_all_failed")
+    for name, delivery in deliveries.items():
+        if delivery.retryable:
+            await _queue_retry(scored, name, delivery)
+
+    if not any(delivery.ok for delivery in deliveries.values()):
+        logger.warning("no_notification_channels_configured_or_all_failed",
+                       channels={name: delivery.error for name, delivery in deliveries.items()})
         return False
 
     return True
+
+
+# ---------------------------------------------------------------------------
+# Retry outbox
+# ---------------------------------------------------------------------------
+
+
+def _retry_delay(attempts: int, retry_after: float | None) -> float:
+    """Exponential backoff after `attempts` failures, never shorter than retry_after."""
+    backoff = min(settings.notify_retry_max_seconds, settings.notify_retry_base_seconds * 2 ** (attempts - 1))
+    return max(backoff, retry_after or 0.0)
+
+
+def _payload(scored: ScoredPost) -> dict:
+    post = scored.post
+    return {
+        "source": post.source,
+        "external_id": post.external_id,
+        "url": post.url,
+        "title": post.title,
+        "body": post.body,
+        "tags": list(post.tags),
+        "created_at": post.created_at.isoformat(),
+        "score": scored.score,
+        "matched_pain_points": list(scored.matched_pain_points),
+    }
+
+
+def _scored_from_payload(payload: dict) -> ScoredPost:
+    post = Post(
+        source=payload["source"],
+        external_id=payload["external_id"],
+        url=payload["url"],
+        title=payload["title"],
+        body=payload["body"],
+        tags=tuple(payload["tags"]),
+        created_at=datetime.fromisoformat(payload["created_at"]),
+    )
+    return ScoredPost(
+        post=post,
+        score=payload["score"],
+        matched_pain_points=tuple(PainPoint(name) for name in payload["matched_pain_points"]),
+    )
+
+
+async def _queue_retry(scored: ScoredPost, channel: str, delivery: Delivery) -> None:
+    now = time.time()
+    queued = await outbox_put({
+        "source": scored.post.source,
+        "external_id": scored.post.external_id,
+        "channel": channel,
+        "payload": _payload(scored),
+        "attempts": 1,
+        "next_attempt_at": now + _retry_delay(1, delivery.retry_after),
+        "created_at": now,
+        "last_error": delivery.error,
+    })
+    if queued:
+        logger.info("notification_queued_for_retry", channel=channel, external_id=scored.post.external_id,
+                    retry_after=delivery.retry_after)
+
+
+async def drain_outbox() -> dict:
+    """
+    Retry every due outbox notification once. Run periodically by the scheduler.
+
+    A success updates the post's seen row to notified. A retryable failure is
+    rescheduled with backoff until notify_max_attempts; anything else is
+    dropped and logged. After a 429 the channel's remaining rows wait for
+    the next pass. Returns counts for this pass.
+    """
+    rows = await outbox_due(settings.notify_outbox_batch_size)
+    summary = {"due": len(rows), "sent": 0, "retrying": 0, "gave_up": 0}
+    by_name = {channel.name: channel for channel in _channels}
+    throttled: set[str] = set()
+
+    for row in rows:
+        name = row["channel"]
+        if name in throttled:
+            continue
+        channel = by_name.get(name)
+        if channel is None or not channel.enabled():
+            logger.warning("outbox_channel_unavailable", channel=name, external_id=row["external_id"])
+            await outbox_delete(row)
+            summary["gave_up"] += 1
+            continue
+
+        scored = _scored_from_payload(row["payload"])
+        delivery = await _send_with_timeout(channel, render(scored))
+        if delivery.ok:
+            await outbox_delete(row)
+            await mark_seen(scored, notified=True)
+            summary["sent"] += 1
+            continue
+
+        attempts = row["attempts"] + 1
+        if not delivery.retryable or attempts >= settings.notify_max_attempts:
+            logger.warning("notification_gave_up", channel=name, external_id=row["external_id"],
+                           attempts=attempts, error=delivery.error)
+            await outbox_delete(row)
+            summary["gave_up"] += 1
+            continue
+
+        if delivery.status == 429:
+            throttled.add(name)
+        await outbox_put({
+            **row,
+            "attempts": attempts,
+            "next_attempt_at": time.time() + _retry_delay(attempts, delivery.retry_after),
+            "last_error": delivery.error,
+        })
+        summary["retrying"] += 1
+
+    await refresh_outbox_stats()
+    if rows:
+        logger.info("outbox_drained", **summary)
+    return summary
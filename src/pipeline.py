@@ -1,69 +1,243 @@
 """
-Collect → Score → Dedup → Notify pipeline.
+Collect → Score → Dedup → Notify → Persist pipeline.
 
-Each collector runs independently; failures in one don't affect others.
+Within a collector run the stages are concurrent workers joined by bounded
+asyncio queues. Each collector runs independently; failures in one don't
+affect others. run_all_collectors() runs them concurrently.
 """
 
-from src.collectors.base import BaseCollector
+import asyncio
+import time
+
+from src.collectors.base import BaseCollector, Post
 from src.config import settings
-from src.dedup import is_new, mark_seen
+from src.dedup import filter_new, mark_seen
 from src.notifier import send_notification
-from src.scoring import score
+from src.scoring import ScoredPost, score_batch_async
+from src.utils import metrics
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-
-async def run_collector(collector: BaseCollector) -> dict:
-    """
-    Run the full pipeline for a single collector.
-
-    Returns a summary dict with counts for logging/monitoring.
-    """
-    name = type(collector).__name__
-    summary = {
+_POSTS_COLLECTED = metrics.counter("scout_posts_collected_total", "Posts collected.", ("collector",))
+_POSTS_ABOVE_THRESHOLD = metrics.counter(
+    "scout_posts_above_threshold_total", "Posts scoring at or above the threshold.", ("collector",)
+)
+_POSTS_NEW = metrics.counter("scout_posts_new_total", "Relevant posts not seen before.", ("collector",))
+_SCORING_SECONDS_PER_POST = metrics.histogram(
+    "scout_scoring_seconds_per_post",
+    "Scoring time per post, averaged over each page.",
+    ("collector",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01),
+)
+
+
+def _empty_summary(name: str) -> dict:
+    return {
         "collector": name,
         "collected": 0,
         "above_threshold": 0,
         "new": 0,
         "notified": 0,
+        "collect_ms": 0.0,
+        "duration_ms": 0.0,
     }
 
-    try:
-        posts = await collector.collect()
-    except Exception as exc:
-        logger.error("pipeline_collect_failed", collector=name, error=str(exc))
-        return summary
 
-    summary["collected"] = len(posts)
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
 
-    for post in posts:
-        scored = score(post)
 
-        if scored.score < settings.min_relevance_score:
-            continue
+# Sentinel telling a stage worker that its upstream has finished
+_DONE = object()
 
-        summary["above_threshold"] += 1
 
-        if not await is_new(post):
-            continue
+class _Stage:
+    """
+    One pipeline stage: `workers` tasks pulling from a bounded queue.
 
-        summary["new"] += 1
+    handler(item) returns the items to pass downstream. A full downstream
+    queue blocks the handler's worker, so backpressure travels back to the
+    collector. Per-stage counts, latency and peak queue depth are recorded.
+    """
 
-        notified = await send_notification(scored)
+    def __init__(self, name: str, handler, workers: int, queue_size: int):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.downstream: _Stage | None = None
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_latency = 0.0
+        self.max_depth = 0
+
+    async def put(self, item) -> None:
+        await self.queue.put(item)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def close(self) -> None:
+        """Tell every worker that no more items are coming."""
+        for _ in range(self.workers):
+            await self.queue.put(_DONE)
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self._worker() for _ in range(self.workers)))
+        if self.downstream is not None:
+            await self.downstream.close()
+
+    async def _worker(self) -> None:
+        while (item := await self.queue.get()) is not _DONE:
+            started = time.perf_counter()
+            outputs = await self.handler(item)
+            elapsed = time.perf_counter() - started
+            self.items += 1
+            self.busy_seconds += elapsed
+            self.max_latency = max(self.max_latency, elapsed)
+            if self.downstream is not None:
+                for output in outputs:
+                    await self.downstream.put(output)
+
+    def stats(self) -> dict:
+        return {
+            "items": self.items,
+            "workers": self.workers,
+            "avg_ms": round(self.busy_seconds / self.items * 1000, 1) if self.items else 0.0,
+            "max_ms": round(self.max_latency * 1000, 1),
+            "max_queue_depth": self.max_depth,
+        }
+
+
+def _build_stages(summary: dict) -> list[_Stage]:
+    """score → dedup → notify → persist, chained, each updating `summary`."""
+    collector = summary["collector"]
+
+    async def score_page(posts: list[Post]) -> list[list[ScoredPost]]:
+        # Off the event loop, so /health and other collectors stay responsive
+        started = time.perf_counter()
+        scored_posts = await score_batch_async(posts)
+        if posts:
+            per_post = (time.perf_counter() - started) / len(posts)
+            _SCORING_SECONDS_PER_POST.observe(per_post, collector=collector)
+        above = [s for s in scored_posts if s.score >= settings.min_relevance_score]
+        summary["above_threshold"] += len(above)
+        _POSTS_ABOVE_THRESHOLD.inc(len(above), collector=collector)
+        return [above] if above else []
+
+    async def dedup_page(above: list[ScoredPost]) -> list[list[ScoredPost]]:
+        by_key: dict[tuple[str, str], ScoredPost] = {}
+        for scored in above:
+            by_key.setdefault((scored.post.source, scored.post.external_id), scored)
+        # One bulk dedup lookup per page
+        new_posts = await filter_new([scored.post for scored in above])
+        new = [by_key[(post.source, post.external_id)] for post in new_posts]
+        summary["new"] += len(new)
+        _POSTS_NEW.inc(len(new), collector=collector)
+        return [new] if new else []
+
+    async def notify_page(new: list[ScoredPost]) -> list[tuple[ScoredPost, bool]]:
+        # The whole page is handed to the channels at once, so Discord can
+        # pack it into batches whatever the number of notify workers
+        results = await asyncio.gather(*(send_notification(scored) for scored in new))
+        summary["notified"] += sum(results)
+        return list(zip(new, results))
+
+    async def persist(item: tuple[ScoredPost, bool]) -> list:
+        scored, notified = item
         await mark_seen(scored, notified=notified)
+        return []
+
+    queue_size = settings.pipeline_queue_size
+    stages = [
+        _Stage("score", score_page, settings.pipeline_score_workers, queue_size),
+        _Stage("dedup", dedup_page, settings.pipeline_dedup_workers, queue_size),
+        _Stage("notify", notify_page, settings.pipeline_notify_workers, queue_size),
+        _Stage("persist", persist, settings.pipeline_persist_workers, queue_size),
+    ]
+    for upstream, downstream in zip(stages, stages[1:]):
+        upstream.downstream = downstream
+    return stages
 
-        if notified:
-            summary["notified"] += 1
 
+async def run_collector(collector: BaseCollector) -> dict:
+    """
+    Run the full pipeline for a single collector.
+
+    collect → score → dedup → notify → persist run as concurrent stages
+    joined by bounded queues (settings.pipeline_*), so pages are scored
+    while later ones are fetched and one slow webhook doesn't hold up the
+    posts behind it. Full queues hold back the collector. If the collector
+    fails part-way, posts already collected are still processed; an error
+    in a later stage aborts the run without committing the collector's
+    cursors, so the next run fetches the same posts again.
+
+    Returns a summary dict with counts for logging/monitoring, including
+    per-stage latency and peak queue depth under "stages".
+    """
+    name = type(collector).__name__
+    summary = _empty_summary(name)
+    started = time.perf_counter()
+    collect_seconds = 0.0
+    stages = _build_stages(summary)
+
+    async def collect() -> None:
+        nonlocal collect_seconds
+        pages = collector.stream_pages()
+        while True:
+            waited = time.perf_counter()
+            try:
+                posts = await anext(pages)
+            except StopAsyncIteration:
+                break
+            except Exception as exc:
+                logger.error("pipeline_collect_failed", collector=name, error=str(exc))
+                break
+            finally:
+                collect_seconds += time.perf_counter() - waited
+            summary["collected"] += len(posts)
+            _POSTS_COLLECTED.inc(len(posts), collector=name)
+            await stages[0].put(posts)
+        await stages[0].close()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(collect())
+            for stage in stages:
+                group.create_task(stage.run())
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    # Every collected post has now been through persist, so the next run may
+    # start from the new cursors
+    collector.commit_cursors()
+
+    summary["collect_ms"] = round(collect_seconds * 1000, 1)
+    summary["duration_ms"] = _elapsed_ms(started)
+    summary["stages"] = {stage.name: stage.stats() for stage in stages}
     logger.info("pipeline_run_complete", **summary)
     return summary
 
 
 async def run_all_collectors(collectors: list[BaseCollector]) -> list[dict]:
-    """Run the pipeline for every collector and return all summaries."""
-    results = []
-    for collector in collectors:
-        result = await run_collector(collector)
-        results.append(result)
-    return results
+    """
+    Run the pipeline for every collector concurrently and return all summaries.
+
+    At most settings.collector_concurrency collectors run at once. Summaries
+    come back in the same order as `collectors`; a collector that raises
+    gets an empty summary with an "error" key instead of failing the others.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.collector_concurrency))
+
+    async def _run(collector: BaseCollector) -> dict:
+        async with semaphore:
+            return await run_collector(collector)
+
+    results = await asyncio.gather(*(_run(c) for c in collectors), return_exceptions=True)
+
+    summaries = []
+    for collector, result in zip(collectors, results):
+        if isinstance(result, BaseException):
+            name = type(collector).__name__
+            logger.error("pipeline_run_failed", collector=name, error=str(result))
+            result = {**_empty_summary(name), "error": str(result)}
+        summaries.append(result)
+    return summaries
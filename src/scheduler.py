@@ -1,8 +1,12 @@
 """
 APScheduler wiring.
 
-Each collector gets its own interval job. The scheduler is started/stopped
-as part of the FastAPI lifespan.
+Each collector gets its own interval job, plus jobs that flush the dedup
+write-behind buffer, prune old dedup rows and retry queued notifications.
+The scheduler is started/stopped as part of the FastAPI lifespan.
+
+With ADAPTIVE_POLLING on, each collector job retunes its own interval after
+every run from the yield of recent polls and the source's remaining quota.
 
 CLI usage (run all collectors once, print results, exit):
     python -m src.scheduler --run-now
@@ -10,19 +14,46 @@ CLI usage (run all collectors once, print results, exit):
 
 import asyncio
 import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
+from apscheduler.events import EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED, JobEvent, JobSubmissionEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from src import http_clients
+from src.collectors.base import BaseCollector
 from src.collectors.github_issues import GitHubIssuesCollector
 from src.collectors.hackernews import HackerNewsCollector
+from src.collectors.rate_limit import quota_stats
 from src.collectors.reddit import RedditCollector
 from src.collectors.stackoverflow import StackOverflowCollector
 from src.config import settings
+from src.dedup import (
+    bloom_stats,
+    flush_seen,
+    io_stats,
+    prune_seen,
+    rebuild_bloom_filter,
+    save_bloom_filter,
+    warm_seen_cache,
+)
+from src.notifier import drain_outbox
 from src.pipeline import run_all_collectors, run_collector
+from src.utils import metrics
 from src.utils.logging import get_logger, setup_logging
 
 logger = get_logger(__name__)
 
+_JOB_LAG_SECONDS = metrics.histogram(
+    "scout_scheduler_job_lag_seconds",
+    "Delay between a job's scheduled run time and its submission.",
+    ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
+_JOBS_MISSED = metrics.counter(
+    "scout_scheduler_jobs_missed_total", "Job runs skipped because they were too late.", ("job",)
+)
+
 
 def _build_collectors():
     lb = settings.lookback_seconds
@@ -34,6 +65,96 @@ def _build_collectors():
     ]
 
 
+# --------------------------------------------------------------------------- #
+# Adaptive polling
+# --------------------------------------------------------------------------- #
+
+# Weight of the latest poll in the smoothed lead rate
+_LEAD_RATE_ALPHA = 0.3
+# Share of a lead credited to a relevant post dedup had already seen
+_REPEAT_LEAD_WEIGHT = 0.5
+# Largest change to an interval after one poll (either direction)
+_MAX_STEP_FACTOR = 2.0
+
+
+@dataclass
+class PollState:
+    """Adaptive interval for one collector, updated after each run."""
+    interval_minutes: float
+    leads_per_hour: float | None = None  # exponentially smoothed
+    throttled: int = 0                   # governor's throttled count at the last run
+
+
+def next_poll_interval(state: PollState, summary: dict, quota: dict | None) -> float:
+    """
+    Update `state` from one run's summary and return the next interval.
+
+    Aims for settings.adaptive_target_leads new relevant posts per poll
+    given the smoothed lead rate, moving at most 2x per step. Above-threshold
+    posts that were already seen count for half a lead each: they show the
+    source is active (the first run after a restart re-reads the whole
+    lookback window) without adding new leads. The interval is
+    then stretched if the source throttled us since the last run or is out
+    of quota until its reset, and finally clamped to the configured bounds.
+    """
+    current = state.interval_minutes
+    new = summary.get("new", 0)
+    repeats = max(0, summary.get("above_threshold", new) - new)
+    observed = (new + _REPEAT_LEAD_WEIGHT * repeats) / (current / 60)
+    if state.leads_per_hour is None:
+        state.leads_per_hour = observed
+    else:
+        state.leads_per_hour = (
+            _LEAD_RATE_ALPHA * observed + (1 - _LEAD_RATE_ALPHA) * state.leads_per_hour
+        )
+
+    if state.leads_per_hour > 0:
+        target = settings.adaptive_target_leads / state.leads_per_hour * 60
+    else:
+        target = settings.poll_interval_max
+    interval = min(max(target, current / _MAX_STEP_FACTOR), current * _MAX_STEP_FACTOR)
+
+    if quota:
+        if quota["throttled"] > state.throttled or quota["blocked_for_seconds"] > 0:
+            interval = max(interval, current * _MAX_STEP_FACTOR, quota["blocked_for_seconds"] / 60)
+        if quota["remaining"] == 0 and quota["reset_in_seconds"] is not None:
+            interval = max(interval, quota["reset_in_seconds"] / 60)
+        state.throttled = quota["throttled"]
+
+    interval = min(max(interval, settings.poll_interval_min), settings.poll_interval_max)
+    state.interval_minutes = interval
+    return interval
+
+
+async def _run_adaptive(scheduler: AsyncIOScheduler, collector: BaseCollector, state: PollState) -> dict:
+    """Run one collector, then reschedule its job using next_poll_interval()."""
+    summary = await run_collector(collector)
+    previous = state.interval_minutes
+    interval = next_poll_interval(state, summary, quota_stats().get(collector.source))
+
+    job_id = type(collector).__name__
+    if interval != previous:
+        scheduler.reschedule_job(job_id, trigger="interval", minutes=interval)
+    logger.info(
+        "poll_interval_adjusted",
+        collector=job_id,
+        previous_minutes=round(previous, 1),
+        interval_minutes=round(interval, 1),
+        leads_per_hour=round(state.leads_per_hour or 0.0, 3),
+    )
+    return summary
+
+
+def _record_job_lag(event: JobSubmissionEvent) -> None:
+    now = datetime.now(timezone.utc)
+    for run_time in event.scheduled_run_times:
+        _JOB_LAG_SECONDS.observe(max(0.0, (now - run_time).total_seconds()), job=event.job_id)
+
+
+def _record_missed_job(event: JobEvent) -> None:
+    _JOBS_MISSED.inc(job=event.job_id)
+
+
 def create_scheduler() -> AsyncIOScheduler:
     """Create and configure the APScheduler instance (not yet started)."""
     scheduler = AsyncIOScheduler()
@@ -47,16 +168,63 @@ def create_scheduler() -> AsyncIOScheduler:
     ]
 
     for collector, interval_minutes in intervals:
+        if settings.adaptive_polling:
+            func, args = _run_adaptive, [scheduler, collector, PollState(interval_minutes)]
+        else:
+            func, args = run_collector, [collector]
         scheduler.add_job(
-            run_collector,
+            func,
             "interval",
             minutes=interval_minutes,
-            args=[collector],
+            args=args,
             id=type(collector).__name__,
             max_instances=1,
             coalesce=True,
         )
 
+    # Age-based flush of the dedup write-behind buffer
+    scheduler.add_job(
+        flush_seen,
+        "interval",
+        seconds=settings.dedup_flush_interval_seconds,
+        id="flush_seen",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Drop dedup rows past the retention window (local SQLite backend only)
+    scheduler.add_job(
+        prune_seen,
+        "interval",
+        hours=24,
+        id="prune_seen",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Rebuild the dedup Bloom filter from the backend (see rebuild_bloom_filter)
+    if settings.bloom_filter_enabled:
+        scheduler.add_job(
+            rebuild_bloom_filter,
+            "interval",
+            seconds=settings.bloom_filter_rebuild_seconds,
+            id="rebuild_bloom_filter",
+            max_instances=1,
+            coalesce=True,
+        )
+
+    # Retry notifications that failed with a retryable error
+    scheduler.add_job(
+        drain_outbox,
+        "interval",
+        seconds=settings.notify_outbox_interval_seconds,
+        id="drain_outbox",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    scheduler.add_listener(_record_job_lag, EVENT_JOB_SUBMITTED)
+    scheduler.add_listener(_record_missed_job, EVENT_JOB_MISSED)
     return scheduler
 
 
@@ -68,9 +236,20 @@ async def _run_now() -> None:
     setup_logging()
     collectors = _build_collectors()
     logger.info("run_now_started", collector_count=len(collectors))
-    results = await run_all_collectors(collectors)
+    await http_clients.start()
+    await warm_seen_cache()
+    try:
+        results = await run_all_collectors(collectors)
+    finally:
+        await http_clients.aclose()
+    await flush_seen()
+    save_bloom_filter()
     for r in results:
         logger.info("run_now_result", **r)
+    logger.info("run_now_dedup_io", **io_stats())
+    logger.info("run_now_dedup_bloom", **bloom_stats())
+    for source, quota in quota_stats().items():
+        logger.info("run_now_quota", source=source, **quota)
 
 
 if __name__ == "__main__":
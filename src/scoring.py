@@ -1,6 +1,15 @@
-from dataclasses import dataclass, field
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import StrEnum
+
+import ahocorasick
 
 from src.collectors.base import Post
+from src.config import settings
+from src.utils.text import normalize
 
 # --------------------------------------------------------------------------- #
 # Keyword definitions
@@ -18,8 +27,21 @@ _CH_CONTEXT_KEYWORDS = [
     "companieshouse",
 ]
 
-_PAIN_POINT_KEYWORDS: dict[str, list[str]] = {
-    "rate_limit": [
+
+class PainPoint(StrEnum):
+    """
+    Pain point names. Members are str subclasses, so they compare, hash and
+    serialise as their value, and every ScoredPost shares the same objects.
+    """
+
+    RATE_LIMIT = "rate_limit"
+    IXBRL_PARSING = "ixbrl_parsing"
+    DIRECTOR_NETWORK = "director_network"
+    PSC_BENEFICIAL_OWNERSHIP = "psc_beneficial_ownership"
+
+
+_PAIN_POINT_KEYWORDS: dict[PainPoint, list[str]] = {
+    PainPoint.RATE_LIMIT: [
         "rate limit",
         "rate-limit",
         "429",
@@ -28,7 +50,7 @@ _PAIN_POINT_KEYWORDS: dict[str, list[str]] = {
         "throttle",
         "quota exceeded",
     ],
-    "ixbrl_parsing": [
+    PainPoint.IXBRL_PARSING: [
         "ixbrl",
         "xbrl",
         "inline xbrl",
@@ -39,7 +61,7 @@ _PAIN_POINT_KEYWORDS: dict[str, list[str]] = {
         "profit and loss",
         "taxonomy",
     ],
-    "director_network": [
+    PainPoint.DIRECTOR_NETWORK: [
         "director network",
         "connected companies",
         "shared directors",
@@ -49,7 +71,7 @@ _PAIN_POINT_KEYWORDS: dict[str, list[str]] = {
         "officer",
         "appointments",
     ],
-    "psc_beneficial_ownership": [
+    PainPoint.PSC_BENEFICIAL_OWNERSHIP: [
         "psc",
         "persons with significant control",
         "person with significant control",
@@ -90,16 +112,80 @@ _CH_CONTEXT_WEIGHT = 0.4
 _NO_DEV_CONTEXT_MULTIPLIER = 0.5
 
 
+# --------------------------------------------------------------------------- #
+# Compiled keyword matcher
+# --------------------------------------------------------------------------- #
+
+# Group names for the two non-pain-point keyword lists. Pain point groups use
+# their _PAIN_POINT_KEYWORDS key directly.
+_CH_GROUP = "_ch_context"
+_DEV_GROUP = "_dev_context"
+
+
+def _build_keyword_groups() -> dict[str, tuple[str, ...]]:
+    """Map each normalised keyword to every group it belongs to."""
+    groups: dict[str, list[str]] = {_CH_GROUP: _CH_CONTEXT_KEYWORDS, _DEV_GROUP: _DEV_CONTEXT_KEYWORDS}
+    groups.update(_PAIN_POINT_KEYWORDS)
+
+    keyword_groups: dict[str, list[str]] = {}
+    for group, keywords in groups.items():
+        for kw in keywords:
+            # Same normalisation as post text: "rate-limit" becomes "rate limit"
+            names = keyword_groups.setdefault(normalize(kw), [])
+            if group not in names:
+                names.append(group)
+    return {kw: tuple(names) for kw, names in keyword_groups.items()}
+
+
+# Word endings a keyword may carry and still count as a whole-word match
+# ("rate limiting", "apis", "throttled"), while "rest" in "restore" doesn't.
+_INFLECTIONS = ("", "s", "es", "d", "ed", "ing", "r", "er", "rs", "ers")
+# A keyword ending in a letter may also carry a version digit ("python3",
+# "oauth2", "http2"); "429" doesn't match "4291".
+_VERSION_DIGITS = tuple("0123456789")
+# Known prefixed spellings that also count as the bare keyword: iXBRL is
+# inline XBRL, so a post about it mentions XBRL too.
+_KEYWORD_PREFIXES: dict[str, tuple[str, ...]] = {"xbrl": ("i",)}
+
+
+def _build_automaton(keywords) -> ahocorasick.Automaton:
+    """
+    Compile keywords into an Aho-Corasick automaton (one linear pass per text).
+
+    Normalised text is words separated by single spaces, so word boundaries
+    are part of the patterns: " api " and its inflections (" apis ", ...),
+    matched against the text padded with a space on each side. Values are
+    the keywords a pattern stands for (" directors " is both "directors"
+    and an inflection of "director").
+    """
+    patterns: dict[str, list[str]] = {}
+    for kw in keywords:
+        endings = _INFLECTIONS + (_VERSION_DIGITS if kw[-1].isalpha() else ())
+        for prefix in ("", *_KEYWORD_PREFIXES.get(kw, ())):
+            for ending in endings:
+                patterns.setdefault(f" {prefix}{kw}{ending} ", []).append(kw)
+
+    automaton = ahocorasick.Automaton()
+    for pattern, kws in patterns.items():
+        automaton.add_word(pattern, tuple(kws))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_GROUPS = _build_keyword_groups()
+_KEYWORD_AUTOMATON = _build_automaton(_KEYWORD_GROUPS)
+
+
 # --------------------------------------------------------------------------- #
 # Result type
 # --------------------------------------------------------------------------- #
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScoredPost:
     post: Post
     score: float
-    matched_pain_points: list[str] = field(default_factory=list)
+    matched_pain_points: tuple[PainPoint, ...] = ()
 
 
 # --------------------------------------------------------------------------- #
@@ -108,14 +194,47 @@ class ScoredPost:
 
 
 def _searchable_text(post: Post) -> str:
-    """Combine title, body, and tags into a single lower-cased string."""
-    parts = [post.title, post.body] + post.tags
-    return " ".join(parts).lower()
+    """Normalised title, body and tags, built on first scoring (see Post.normalise)."""
+    return post.normalise()
+
+
+def _match_groups(text: str) -> dict[str, int]:
+    """
+    Scan normalised text once and count distinct whole-word keyword hits per group.
+
+    A single pass over the text regardless of how many keywords are defined.
+    Keywords inside longer words ("rest" in "interest") don't match.
+    """
+    # The automaton reports overlapping matches too ("api" inside "ch api").
+    hits = {kw for _, kws in _KEYWORD_AUTOMATON.iter(f" {text} ") for kw in kws}
+
+    counts: dict[str, int] = {}
+    for kw in hits:
+        for group in _KEYWORD_GROUPS[kw]:
+            counts[group] = counts.get(group, 0) + 1
+    return counts
+
+
+def _score_counts(counts: dict[str, int]) -> tuple[float, tuple[PainPoint, ...]]:
+    """Score and matched pain points from per-group keyword counts (see _match_groups)."""
+    # CH context bonus
+    ch_score = _CH_CONTEXT_WEIGHT if counts.get(_CH_GROUP) else 0.0
+
+    # Pain point scores
+    pain_scores: dict[str, float] = {}
+    for pain_point in _PAIN_POINT_KEYWORDS:
+        count = counts.get(pain_point, 0)
+        if count > 0:
+            pain_scores[pain_point] = min(_MAX_PAIN_POINT_SCORE, count * _KEYWORD_WEIGHT)
+
+    matched = tuple(sorted(pain_scores.keys()))
+    total = min(1.0, ch_score + sum(pain_scores.values()))
 
+    # Halve score when no developer/technical language is present
+    if not counts.get(_DEV_GROUP):
+        total = total * _NO_DEV_CONTEXT_MULTIPLIER
 
-def _count_keyword_matches(text: str, keywords: list[str]) -> int:
-    """Count how many distinct keywords from the list appear in text."""
-    return sum(1 for kw in keywords if kw.lower() in text)
+    return round(total, 4), matched
 
 
 def score(post: Post) -> ScoredPost:
@@ -124,31 +243,101 @@ def score(post: Post) -> ScoredPost:
 
     Returns a ScoredPost with:
     - score: float in [0.0, 1.0]
-    - matched_pain_points: list of pain point keys that contributed
+    - matched_pain_points: tuple of pain point keys that contributed
 
     Developer context check: if no programming/API language is detected the
     score is halved, pushing general-public and legal posts (which often
     mention Companies House or directors without API intent) below threshold.
     """
-    text = _searchable_text(post)
+    total, matched = _score_counts(_match_groups(_searchable_text(post)))
+    return ScoredPost(post=post, score=total, matched_pain_points=matched)
 
-    # CH context bonus
-    ch_present = any(kw.lower() in text for kw in _CH_CONTEXT_KEYWORDS)
-    ch_score = _CH_CONTEXT_WEIGHT if ch_present else 0.0
 
-    # Pain point scores
-    pain_scores: dict[str, float] = {}
-    for pain_point, keywords in _PAIN_POINT_KEYWORDS.items():
-        count = _count_keyword_matches(text, keywords)
-        if count > 0:
-            pain_scores[pain_point] = min(_MAX_PAIN_POINT_SCORE, count * _KEYWORD_WEIGHT)
+def score_batch(posts: list[Post]) -> list[ScoredPost]:
+    """
+    Score many posts, in order. The unit of work for the pipeline's score
+    stage and for the thread/process-pool paths below.
+    """
+    return [score(post) for post in posts]
 
-    matched = sorted(pain_scores.keys())
-    total = min(1.0, ch_score + sum(pain_scores.values()))
 
-    # Halve score when no developer/technical language is present
-    dev_present = any(kw.lower() in text for kw in _DEV_CONTEXT_KEYWORDS)
-    if not dev_present:
-        total = total * _NO_DEV_CONTEXT_MULTIPLIER
+# --------------------------------------------------------------------------- #
+# Off-loop / parallel scoring
+# --------------------------------------------------------------------------- #
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared scoring pool (settings.scoring_workers, 0 = one per core)."""
+    global _process_pool
+    if _process_pool is None:
+        workers = settings.scoring_workers or os.cpu_count() or 1
+        # spawn, not fork: the parent runs an event loop and scheduler threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown_scoring_pool() -> None:
+    """Stop the scoring worker processes, if any were started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def _chunks(posts: list[Post], size: int) -> list[list[Post]]:
+    size = max(1, size)
+    return [posts[i:i + size] for i in range(0, len(posts), size)]
+
+
+def _score_chunk(posts: list[Post]) -> list[tuple[float, tuple[PainPoint, ...]]]:
+    """
+    Worker entry point. Returns only (score, pain points) so Posts aren't
+    pickled back; PainPoint members unpickle as the parent's own members.
+    """
+    return [(s.score, s.matched_pain_points) for s in score_batch(posts)]
+
+
+def _attach(posts: list[Post], chunk_results) -> list[ScoredPost]:
+    results = [result for chunk in chunk_results for result in chunk]
+    scored_posts = []
+    for post, (total, matched) in zip(posts, results):
+        # The workers normalised copies; trim the parent's own post too
+        post.truncate_body()
+        scored_posts.append(ScoredPost(post=post, score=total, matched_pain_points=matched))
+    return scored_posts
+
+
+def score_batch_parallel(posts: list[Post]) -> list[ScoredPost]:
+    """
+    Blocking score_batch() for big offline jobs: chunks are scored across
+    the process pool. Batches under settings.scoring_process_min_posts are
+    scored in-process, where pool start-up and pickling would cost more.
+    """
+    if len(posts) < settings.scoring_process_min_posts:
+        return score_batch(posts)
+    pool = _get_process_pool()
+    return _attach(posts, pool.map(_score_chunk, _chunks(posts, settings.scoring_chunk_size)))
+
+
+async def score_batch_async(posts: list[Post]) -> list[ScoredPost]:
+    """
+    score_batch() without blocking the event loop. Small batches run on a
+    worker thread; batches of settings.scoring_process_min_posts or more are
+    chunked across the process pool. Results are identical and in order.
+    """
+    if not posts:
+        return []
+    if len(posts) < settings.scoring_process_min_posts:
+        return await asyncio.to_thread(score_batch, posts)
 
-    return ScoredPost(post=post, score=round(total, 4), matched_pain_points=matched)
+    loop = asyncio.get_running_loop()
+    pool = _get_process_pool()
+    chunk_results = await asyncio.gather(*(
+        loop.run_in_executor(pool, _score_chunk, chunk)
+        for chunk in _chunks(posts, settings.scoring_chunk_size)
+    ))
+    return _attach(posts, chunk_results)
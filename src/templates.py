@@ -46,7 +46,7 @@ _DEFAULT_TEMPLATE = (
 )
 
 
-def get_draft_reply(matched_pain_points: list[str]) -> str:
+def get_draft_reply(matched_pain_points: tuple[str, ...]) -> str:
     """Return a draft reply based on the first matched pain point."""
     for point in matched_pain_points:
         if point in _TEMPLATES:
@@ -0,0 +1,67 @@
+"""Fixed-size Bloom filter for string keys, persistable to disk."""
+
+import hashlib
+import math
+import struct
+from pathlib import Path
+
+_HEADER = struct.Struct("<4sII")  # magic, bit count, hash count
+_MAGIC = b"BLM1"
+
+
+class BloomFilter:
+    """
+    Probabilistic set: `key in bf` is never False for an added key, and is
+    True for an absent key with probability close to error_rate while the
+    filter holds no more than `capacity` keys.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = bits
+        self.num_hashes = max(1, round(bits / capacity * math.log(2)))
+        self._bits = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def estimated_error_rate(self) -> float:
+        """False-positive probability implied by the current fill ratio."""
+        set_bits = int.from_bytes(self._bits, "big").bit_count()
+        return (set_bits / self.num_bits) ** self.num_hashes
+
+    def save(self, path: str) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_bytes(_HEADER.pack(_MAGIC, self.num_bits, self.num_hashes) + bytes(self._bits))
+        tmp.replace(target)
+
+    @classmethod
+    def load(cls, path: str, capacity: int, error_rate: float = 0.01) -> "BloomFilter | None":
+        """
+        Read a filter saved by save(). Returns None if the file is missing,
+        corrupt, or was built for a different capacity/error rate.
+        """
+        bf = cls(capacity, error_rate)
+        try:
+            data = Path(path).read_bytes()
+            magic, num_bits, num_hashes = _HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        payload = data[_HEADER.size:]
+        if magic != _MAGIC or (num_bits, num_hashes) != (bf.num_bits, bf.num_hashes) or len(payload) != len(bf._bits):
+            return None
+        bf._bits = bytearray(payload)
+        return bf
@@ -0,0 +1,201 @@
+"""
+Minimal in-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are created once at import time next to the code
+they measure, then updated with label values as keyword arguments:
+
+    _FETCH_SECONDS = metrics.histogram("scout_fetch_seconds", "Fetch latency.", ("source",))
+    _FETCH_SECONDS.observe(0.12, source="github")
+
+An update is a dict lookup plus a few additions under an uncontended lock,
+so instrumentation stays on in production. render() produces the body for
+GET /metrics.
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
+# Seconds; covers sub-millisecond cache hits up to slow webhook calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as exc:
+            raise ValueError(f"{self.name}: missing label {exc}") from None
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Exposition lines for every label set, without the HELP/TYPE header."""
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every recorded value."""
+        ...
+
+
+class Counter(_Metric):
+    """A monotonically increasing total per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Observation counts per bucket, plus their sum and count, per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values → [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            series = [(key, list(values)) for key, values in self._series.items()]
+        lines = []
+        for key, values in series:
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), values[:-1]):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+_registry: dict[str, _Metric] = {}
+
+
+def _register(cls, name: str, *args, **kwargs):
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = cls(name, *args, **kwargs)
+    elif not isinstance(metric, cls):
+        raise ValueError(f"metric {name} already registered as a {metric.kind}")
+    return metric
+
+
+def counter(name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+    """The registered counter `name`, created on first use."""
+    return _register(Counter, name, help, labels)
+
+
+def histogram(
+    name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+) -> Histogram:
+    """The registered histogram `name`, created on first use."""
+    return _register(Histogram, name, help, labels, buckets)
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text format (version 0.0.4)."""
+    lines = []
+    for metric in _registry.values():
+        lines.extend(metric._header())
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Zero every metric, keeping the registrations (tests)."""
+    for metric in _registry.values():
+        metric.clear()
@@ -0,0 +1,73 @@
+"""
+Text normalisation for keyword matching.
+
+Stack Overflow and HN Algolia bodies are HTML. GitHub issues and Reddit
+self-posts are markdown, which may contain inline HTML and entities. Before
+matching, the markup, URLs and punctuation are removed, the text is
+Unicode-casefolded, and the words are joined by single spaces, so word
+boundaries are simply spaces. Code blocks
+keep their contents, because the language and library names in them are
+useful developer-context signals.
+"""
+
+import html
+import re
+import string
+
+# source → markup of the body returned by its API (anything else is plain text)
+BODY_FORMATS = {
+    "stackoverflow": "html",
+    "hackernews": "html",
+    "github": "markdown",
+    "reddit": "markdown",
+}
+
+# Opening/closing tags, comments and doctypes; a bare "a < b > c" is left alone
+_HTML_TAG = re.compile(r"<!--.*?-->|</?[a-zA-Z][^>]*>|<![^>]*>", re.DOTALL)
+_URL = re.compile(r"\b(?:https?://|www\.)\S+")
+_MD_IMAGE_OR_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+
+# Names whose punctuation would otherwise be split off, spelled as one word
+_SYMBOL_NAMES = (("c#", " csharp"), ("c++", " cplusplus"), (".net", " dotnet"))
+# All punctuation separates words ("_" is a word character, as in snake_case)
+_SEPARATORS = str.maketrans({char: " " for char in string.punctuation + "‘’“”«»–—…" if char != "_"})
+
+
+def strip_html(text: str) -> str:
+    """Drop tags and comments, then decode entities."""
+    return html.unescape(_HTML_TAG.sub(" ", text))
+
+
+def strip_markdown(text: str) -> str:
+    """
+    Replace links and images with their text and drop inline HTML. The rest
+    of markdown's syntax is punctuation, which normalize() removes.
+    """
+    if "](" in text:
+        text = _MD_IMAGE_OR_LINK.sub(r"\1", text)
+    return strip_html(text)
+
+
+def normalize(text: str) -> str:
+    """
+    Remove URLs and punctuation, casefold, and join the words with single
+    spaces. "c#", "c++" and ".net" become "csharp", "cplusplus" and "dotnet".
+    """
+    text = text.casefold()
+    if "http" in text or "www." in text:
+        text = _URL.sub(" ", text)
+    for name, word in _SYMBOL_NAMES:
+        if name in text:
+            text = text.replace(name, word)
+    return " ".join(text.translate(_SEPARATORS).split())
+
+
+def search_text(source: str, title: str, body: str, tags: tuple[str, ...]) -> str:
+    """Title, markup-free body and tags as one normalised string."""
+    body_format = BODY_FORMATS.get(source)
+    if body_format == "html":
+        body = strip_html(body)
+    elif body_format == "markdown":
+        body = strip_markdown(body)
+    # Stack Exchange and Algolia return entity-encoded titles
+    return normalize(" ".join([html.unescape(title), body, *tags]))
@@ -5,3 +5,5 @@ os.environ["APP_ENV"] = "test"
 os.environ["SUPABASE_URL"] = ""
 os.environ["SUPABASE_KEY"] = ""
 os.environ["SCOUT_WEBHOOK_URL"] = ""
+os.environ["DEDUP_BACKEND"] = "memory"
+os.environ["COLLECTOR_STATE_DIR"] = ""
@@ -0,0 +1,34 @@
+import io
+import json
+
+
+def _line(external_id: str, title: str, **extra) -> str:
+    return json.dumps({"source": "github", "external_id": external_id, "url": "https://example.com",
+                       "title": title, "body": "", **extra})
+
+
+def test_backfill_writes_only_matches():
+    from src.backfill import run_backfill
+
+    lines = [
+        _line("1", "Companies House API 429 rate limit exceeded", created_at="2024-01-01T00:00:00+00:00"),
+        _line("2", "Python list comprehension tips"),
+        "",
+    ]
+    out = io.StringIO()
+    summary = run_backfill(lines, out, min_score=0.5)
+
+    assert summary["scored"] == 2
+    assert summary["above_threshold"] == 1
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["external_id"] for r in rows] == ["1"]
+    assert "rate_limit" in rows[0]["matched_pain_points"]
+
+
+def test_parse_post_handles_numeric_ids_and_missing_fields():
+    from src.backfill import parse_post
+
+    post = parse_post(json.dumps({"source": "hackernews", "external_id": 123}))
+    assert post.external_id == "123"
+    assert post.body == ""
+    assert post.tags == ()
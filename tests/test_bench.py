@@ -0,0 +1,43 @@
+import json
+
+
+def test_synthetic_posts_cover_every_source():
+    from src.bench import synthetic_posts
+
+    posts = synthetic_posts(40)
+
+    assert len(posts) == 40
+    assert {post.source for post in posts} == {"stackoverflow", "hackernews", "reddit", "github"}
+    assert [p.external_id for p in posts] == [p.external_id for p in synthetic_posts(40)]
+
+
+def test_run_benchmarks_reports_json():
+    from src import dedup
+    from src.bench import run_benchmarks
+    from src.config import settings
+
+    backend_before = dedup._backend
+    report = run_benchmarks(n=120, repeat=1)
+
+    json.dumps(report)
+    results = report["results"]
+    assert set(results) == {
+        "score", "score_batch", "parse.stackoverflow", "parse.hackernews",
+        "parse.reddit", "parse.github", "pipeline", "memory", "backfill_memory",
+    }
+    assert results["score"]["items"] == 120
+    assert results["pipeline"]["notified"] == results["pipeline"]["above_threshold"]
+    assert results["memory"]["peak_kb"] > 0
+    # Stand-ins are removed afterwards
+    assert dedup._backend is backend_before
+    assert settings.scout_webhook_url == ""
+
+
+def test_main_rejects_unknown_benchmark(capsys):
+    import pytest
+
+    from src.bench import main
+
+    with pytest.raises(SystemExit):
+        main(["--only", "score,bogus"])
+    assert "bogus" in capsys.readouterr().err
@@ -0,0 +1,45 @@
+from src.utils.bloom import BloomFilter
+
+
+def test_added_keys_are_always_found():
+    bf = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"github\x1f{i}" for i in range(1000)]
+    for key in keys:
+        bf.add(key)
+    assert all(key in bf for key in keys)
+
+
+def test_false_positive_rate_near_target():
+    bf = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bf.add(f"seen-{i}")
+    false_positives = sum(f"unseen-{i}" in bf for i in range(10_000))
+    assert false_positives / 10_000 < 0.03
+    assert 0.0 < bf.estimated_error_rate() < 0.03
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    bf = BloomFilter(capacity=100)
+    bf.add("reddit\x1fabc")
+    bf.save(path)
+
+    loaded = BloomFilter.load(path, capacity=100)
+    assert loaded is not None
+    assert "reddit\x1fabc" in loaded
+
+
+def test_load_rejects_missing_or_mismatched_file(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    assert BloomFilter.load(path, capacity=100) is None
+
+    BloomFilter(capacity=100).save(path)
+    assert BloomFilter.load(path, capacity=5000) is None
+
+
+def test_estimated_error_rate_follows_fill_ratio():
+    bf = BloomFilter(capacity=100)
+    assert bf.estimated_error_rate() == 0.0
+
+    bf._bits = bytearray(b"\xff" * len(bf._bits))
+    assert bf.estimated_error_rate() > 1.0 - 1e-9
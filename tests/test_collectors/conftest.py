@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_governors():
+    """Give every test fresh per-source buckets (they hold event-loop-bound locks)."""
+    from src.collectors import rate_limit
+
+    rate_limit.reset()
+    yield
+    rate_limit.reset()
@@ -0,0 +1,25 @@
+def test_cursor_only_moves_forward(tmp_path):
+    from src.collectors.cursors import CursorStore
+
+    store = CursorStore("github", str(tmp_path))
+    store.advance("q", 200.0)
+    store.advance("q", 100.0)
+    assert store.get("q") == {"created": 200.0}
+
+
+def test_cursor_persists_per_source(tmp_path):
+    from src.collectors.cursors import CursorStore
+
+    CursorStore("reddit", str(tmp_path)).advance("q", 123.0)
+
+    assert CursorStore("reddit", str(tmp_path)).get("q") == {"created": 123.0}
+    assert CursorStore("github", str(tmp_path)).get("q") is None
+
+
+def test_cursor_in_memory_without_state_dir():
+    from src.collectors.cursors import CursorStore
+
+    store = CursorStore("hackernews")
+    store.advance("q", 1.0)
+    assert store.get("q") == {"created": 1.0}
+    assert store.path is None
@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 FIXTURE = json.loads(
@@ -9,11 +10,8 @@ FIXTURE = json.loads(
 )
 
 
-def _mock_response(data: dict, status_code: int = 200):
-    response = MagicMock()
-    response.status_code = status_code
-    response.json.return_value = data
-    return response
+def _mock_response(data: dict, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(status_code, json=data)
 
 
 def _make_collector(lookback: int = 999_999_999):
@@ -58,7 +56,7 @@ async def test_collect_maps_fields_correctly():
     assert "github.com" in first.url
     assert first.title != ""
     assert first.body != ""
-    assert isinstance(first.tags, list)
+    assert isinstance(first.tags, tuple)
     assert first.created_at is not None
 
 
@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 FIXTURE = json.loads(
@@ -9,11 +10,8 @@ FIXTURE = json.loads(
 )
 
 
-def _mock_response(data: dict, status_code: int = 200):
-    response = MagicMock()
-    response.status_code = status_code
-    response.json.return_value = data
-    return response
+def _mock_response(data: dict, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(status_code, json=data)
 
 
 def _make_collector(lookback: int = 999_999_999):
@@ -124,3 +122,46 @@ async def test_deduplication_across_queries():
     # 3 hits in fixture, multiple queries, but IDs should be deduplicated
     ids = [p.external_id for p in posts]
     assert len(ids) == len(set(ids))
+
+
+@pytest.mark.asyncio
+async def test_failed_query_keeps_other_results():
+    """One query raising must not discard the hits from the other queries."""
+    collector = _make_collector()
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(side_effect=[
+            httpx.ReadTimeout("slow query"),
+            _mock_response(FIXTURE),
+            _mock_response({}, status_code=500),
+        ])
+        mock_client_class.return_value = mock_client
+
+        posts = await collector.collect()
+
+    assert mock_client.get.call_count == 3
+    assert len(posts) == len(FIXTURE["hits"])
+
+
+@pytest.mark.asyncio
+async def test_second_run_only_requests_newer_hits():
+    """After a run, each query asks Algolia only for hits since its newest one."""
+    collector = _make_collector()
+    newest = max(hit["created_at_i"] for hit in FIXTURE["hits"])
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(return_value=_mock_response(FIXTURE))
+        mock_client_class.return_value = mock_client
+
+        await collector.collect()
+        mock_client.get.reset_mock()
+        posts = await collector.collect()
+
+    for call in mock_client.get.call_args_list:
+        assert call.kwargs["params"]["numericFilters"] == f"created_at_i>={newest}"
+    # The mock ignores the filter; client-side filtering drops the older hits
+    assert all(p.created_at.timestamp() >= newest for p in posts)
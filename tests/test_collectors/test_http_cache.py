@@ -0,0 +1,164 @@
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+def _response(status_code: int = 200, body: bytes = b"{}", headers: dict | None = None) -> httpx.Response:
+    return httpx.Response(status_code, content=body, headers=headers or {})
+
+
+def test_validators_sent_after_store():
+    from src.collectors.http_cache import ResponseCache
+
+    cache = ResponseCache()
+    key = cache.key("https://api.example.com/search", {"q": "ch", "page": 1})
+    assert cache.validators(key) == {}
+
+    cache.store(key, _response(headers={"ETag": '"v1"', "Last-Modified": "Fri, 01 Mar 2024 10:00:00 GMT"}), 2)
+    assert cache.validators(key) == {}  # pending until committed
+    cache.commit()
+
+    assert cache.validators(key) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Fri, 01 Mar 2024 10:00:00 GMT",
+    }
+    assert cache.not_modified(key) == (True, 2)
+
+
+def test_key_ignores_param_order():
+    from src.collectors.http_cache import ResponseCache
+
+    assert ResponseCache.key("u", {"a": 1, "b": 2}) == ResponseCache.key("u", {"b": 2, "a": 1})
+
+
+def test_body_hash_ignores_volatile_fields():
+    from src.collectors.http_cache import ResponseCache
+
+    cache = ResponseCache(volatile_body=re.compile(rb'"quota_remaining":\s*\d+'))
+    key = cache.key("u", {})
+    cache.store(key, _response(body=b'{"items": [], "quota_remaining": 299}'), None)
+    cache.commit()
+
+    assert cache.unchanged(key, _response(body=b'{"items": [], "quota_remaining": 298}')) == (True, None)
+    assert cache.unchanged(key, _response(body=b'{"items": [1], "quota_remaining": 297}'))[0] is False
+
+
+def test_lru_eviction():
+    from src.collectors.http_cache import ResponseCache
+
+    cache = ResponseCache(max_entries=2)
+    for page in range(3):
+        cache.store(cache.key("u", {"page": page}), _response(), None)
+    cache.commit()
+
+    assert len(cache) == 2
+    assert cache.not_modified(cache.key("u", {"page": 0})) == (False, None)
+
+
+def test_discard_drops_uncommitted_entries():
+    from src.collectors.http_cache import ResponseCache
+
+    cache = ResponseCache()
+    key = cache.key("u", {})
+    cache.store(key, _response(), None)
+    cache.discard()
+    cache.commit()
+
+    assert cache.unchanged(key, _response())[0] is False
+
+
+@pytest.mark.asyncio
+async def test_github_304_skips_parsing():
+    """A repeat poll sends If-None-Match and a 304 yields no posts without parsing."""
+    from src.collectors.github_issues import GitHubIssuesCollector, _QUERIES
+
+    body = (FIXTURES / "github_issues_response.json").read_bytes()
+    collector = GitHubIssuesCollector(lookback_seconds=999_999_999)
+    # Cursors already at the newest fixture post, so both runs send identical requests
+    newest = datetime.fromisoformat("2024-03-01T12:00:00+00:00").timestamp()
+    for query in _QUERIES:
+        collector.cursors.advance(query, newest)
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(return_value=_response(body=body, headers={"ETag": '"abc"'}))
+        mock_client_class.return_value = mock_client
+
+        first = await collector.collect()
+
+        mock_client.get = AsyncMock(return_value=_response(304))
+        with patch.object(collector, "_parse_page") as parse:
+            second = await collector.collect()
+
+    assert len(first) == 1  # only the post at the cursor is inside the window
+    assert second == []
+    parse.assert_not_called()
+    for call in mock_client.get.call_args_list:
+        assert call.kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert collector.http_cache.stats["not_modified"] == len(_QUERIES)
+
+
+@pytest.mark.asyncio
+async def test_identical_body_short_circuits_without_validators():
+    """APIs without ETags are compared by body hash (timing fields ignored)."""
+    from src.collectors.hackernews import HackerNewsCollector
+
+    data = json.loads((FIXTURES / "hackernews_hits.json").read_text())
+    collector = HackerNewsCollector(lookback_seconds=999_999_999)
+    for query in ("companies house", "companies-house api", "iXBRL companies house"):
+        collector.cursors.advance(query, 1709297200)
+
+    def body(timing: int) -> bytes:
+        return json.dumps({**data, "processingTimeMS": timing}).encode()
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(return_value=_response(body=body(3)))
+        mock_client_class.return_value = mock_client
+        first = await collector.collect()
+
+        mock_client.get = AsyncMock(return_value=_response(body=body(7)))
+        second = await collector.collect()
+
+    assert first
+    assert second == []
+    assert collector.http_cache.stats["unchanged"] == 3
+
+
+@pytest.mark.asyncio
+async def test_aborted_run_is_parsed_again():
+    """Pages cached by a run whose cursors were never committed aren't skipped as unchanged."""
+    from src.collectors.stackoverflow import StackOverflowCollector
+
+    body = (FIXTURES / "stackoverflow_questions.json").read_bytes()
+    collector = StackOverflowCollector(lookback_seconds=999_999_999)
+    # Cursor at the newest fixture post, so every run sends the same request
+    collector.cursors.advance("companies-house;xbrl;uk-company-api", 1709002000)
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(side_effect=lambda *args, **kwargs: _response(body=body))
+        mock_client_class.return_value = mock_client
+
+        aborted = [post async for post in collector.stream()]  # no commit_cursors()
+        retried = [post async for post in collector.stream()]
+        collector.commit_cursors()
+        after_commit = [post async for post in collector.stream()]
+
+    assert len(aborted) == 1
+    assert [post.external_id for post in retried] == [post.external_id for post in aborted]
+    assert after_commit == []
+    assert collector.http_cache.stats["unchanged"] == 1
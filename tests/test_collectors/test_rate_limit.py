@@ -0,0 +1,109 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+
+def _response(status_code: int = 200, body: bytes = b"{}", headers: dict | None = None) -> httpx.Response:
+    return httpx.Response(status_code, content=body, headers=headers or {})
+
+
+@pytest.mark.asyncio
+async def test_burst_then_deadline_defers():
+    from src.collectors.rate_limit import RateGovernor
+
+    gov = RateGovernor("test", rate=0.01, burst=2)
+    assert await gov.acquire()
+    assert await gov.acquire()
+    # Next token is ~100s away: a request with a 1s deadline is skipped, not awaited
+    assert await gov.acquire(deadline=time.monotonic() + 1) is False
+
+
+@pytest.mark.asyncio
+async def test_acquire_paces_concurrent_requests():
+    import asyncio
+
+    from src.collectors.rate_limit import RateGovernor
+
+    gov = RateGovernor("test", rate=50, burst=1)
+    started = time.monotonic()
+    await asyncio.gather(*(gov.acquire() for _ in range(3)))
+    # One from the burst, then two more at 50/s
+    assert time.monotonic() - started >= 0.035
+
+
+def test_github_headers_exhausted_quota_blocks_until_reset():
+    from src.collectors.rate_limit import RateGovernor
+
+    gov = RateGovernor("github", rate=1, burst=10)
+    reset = time.time() + 30
+    gov.observe(_response(headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(reset))}))
+
+    snap = gov.snapshot()
+    assert snap["remaining"] == 0
+    assert snap["tokens"] == 0
+    assert 25 <= snap["blocked_for_seconds"] <= 31
+
+
+def test_reddit_relative_reset_and_remaining_caps_tokens():
+    from src.collectors.rate_limit import RateGovernor
+
+    gov = RateGovernor("reddit", rate=1, burst=10)
+    gov.observe(_response(headers={"x-ratelimit-remaining": "3.0", "x-ratelimit-reset": "120"}))
+
+    snap = gov.snapshot()
+    assert snap["remaining"] == 3
+    assert snap["tokens"] <= 3
+    assert 115 <= snap["reset_in_seconds"] <= 120
+    assert snap["blocked_for_seconds"] == 0
+
+
+def test_stack_exchange_body_quota_and_backoff():
+    from src.collectors.rate_limit import RateGovernor
+
+    gov = RateGovernor("stackoverflow", rate=1, burst=10)
+    gov.observe(_response(body=b'{"items": [], "quota_remaining": 250, "backoff": 10}'))
+
+    snap = gov.snapshot()
+    assert snap["remaining"] == 250
+    assert 9 <= snap["blocked_for_seconds"] <= 10
+
+
+def test_429_honours_retry_after_but_plain_403_does_not_block():
+    from src.collectors.rate_limit import RateGovernor
+
+    gov = RateGovernor("github", rate=1, burst=10)
+    gov.observe(_response(403))
+    assert gov.snapshot()["blocked_for_seconds"] == 0
+
+    gov.observe(_response(429, headers={"Retry-After": "5"}))
+    snap = gov.snapshot()
+    assert snap["throttled"] == 1
+    assert 4 <= snap["blocked_for_seconds"] <= 5
+
+
+@pytest.mark.asyncio
+async def test_queries_share_one_budget_per_source():
+    """Throttling seen by one query defers the rest, and the quota is reported per source."""
+    from src.collectors import rate_limit
+    from src.collectors.github_issues import GitHubIssuesCollector
+
+    collector = GitHubIssuesCollector(lookback_seconds=999_999_999, time_budget_seconds=1)
+    collector.max_concurrent_queries = 1
+    throttled = _response(429, headers={"Retry-After": "60", "X-RateLimit-Remaining": "0"})
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(return_value=throttled)
+        mock_client_class.return_value = mock_client
+
+        posts = await collector.collect()
+
+    assert posts == []
+    assert mock_client.get.call_count == 1  # the other queries were deferred, not sent
+    stats = rate_limit.quota_stats()["github"]
+    assert stats["remaining"] == 0
+    assert stats["throttled"] == 1
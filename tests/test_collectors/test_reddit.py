@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 FIXTURE = json.loads(
@@ -9,11 +10,8 @@ FIXTURE = json.loads(
 )
 
 
-def _mock_response(data: dict, status_code: int = 200):
-    response = MagicMock()
-    response.status_code = status_code
-    response.json.return_value = data
-    return response
+def _mock_response(data: dict, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(status_code, json=data)
 
 
 def _make_collector(lookback: int = 999_999_999):
@@ -106,3 +104,29 @@ async def test_collect_only_fetches_recent_posts():
         posts = await collector.collect()
 
     assert posts == []
+
+
+@pytest.mark.asyncio
+async def test_second_run_starts_from_newest_and_stops_at_cursor():
+    """With a cursor, paging still starts at the newest post and drops anything older."""
+    collector = _make_collector()
+    children = FIXTURE["data"]["children"]
+    newest = max((c["data"] for c in children), key=lambda d: d["created_utc"])
+    fresh = {**newest, "id": "fresh1", "created_utc": newest["created_utc"] + 60}
+    later = {**FIXTURE, "data": {**FIXTURE["data"], "children": [{"data": fresh}, *children]}}
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(side_effect=lambda *args, **kwargs: _mock_response(body))
+        mock_client_class.return_value = mock_client
+
+        body = FIXTURE
+        await collector.collect()
+        body = later
+        second = await collector.collect()
+
+    params = mock_client.get.call_args.kwargs["params"]
+    assert "before" not in params and "after" not in params
+    # The post at the cursor comes back too (the bound is inclusive)
+    assert [post.external_id for post in second] == ["fresh1", newest["id"]]
@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 FIXTURE = json.loads(
@@ -12,11 +13,8 @@ FIXTURE = json.loads(
 _FUTURE_TS = 9_999_999_999
 
 
-def _mock_response(data: dict, status_code: int = 200):
-    response = MagicMock()
-    response.status_code = status_code
-    response.json.return_value = data
-    return response
+def _mock_response(data: dict, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(status_code, json=data)
 
 
 def _make_collector(lookback: int = 999_999_999):
@@ -63,7 +61,7 @@ async def test_collect_maps_fields_correctly():
     assert "stackoverflow.com" in first.url
     assert "Companies House" in first.title
     assert first.body != ""
-    assert isinstance(first.tags, list)
+    assert isinstance(first.tags, tuple)
     assert first.created_at is not None
 
 
@@ -117,3 +115,55 @@ async def test_collect_only_fetches_recent_posts():
         posts = await collector.collect()
 
     assert posts == []
+
+
+def _page(first_id: int, has_more: bool) -> dict:
+    items = [
+        {**item, "question_id": first_id + i}
+        for i, item in enumerate(FIXTURE["items"])
+    ]
+    return {"items": items, "has_more": has_more}
+
+
+@pytest.mark.asyncio
+async def test_stream_pages_follows_has_more():
+    """Pages are yielded one by one until the API reports no more results."""
+    collector = _make_collector()
+    responses = [_mock_response(_page(1, True)), _mock_response(_page(10, False))]
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(side_effect=responses)
+        mock_client_class.return_value = mock_client
+
+        pages = [page async for page in collector.stream_pages()]
+
+    assert [len(page) for page in pages] == [3, 3]
+    assert [call.kwargs["params"]["page"] for call in mock_client.get.call_args_list] == [1, 2]
+    # Pending until the caller has processed the posts
+    assert collector.cursors.get("companies-house;xbrl;uk-company-api") is None
+    collector.commit_cursors()
+    assert collector.cursors.get("companies-house;xbrl;uk-company-api") == {"created": 1709002000.0}
+
+
+@pytest.mark.asyncio
+async def test_page_budget_stops_paging_without_advancing_cursor():
+    """A query cut short by max_pages keeps its old cursor so the rest is re-read next run."""
+    from src.collectors.stackoverflow import StackOverflowCollector
+
+    collector = StackOverflowCollector(lookback_seconds=999_999_999, max_pages=1)
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.get = AsyncMock(return_value=_mock_response(_page(1, True)))
+        mock_client_class.return_value = mock_client
+
+        posts = [post async for post in collector.stream()]
+
+    assert len(posts) == 3
+    assert mock_client.get.call_count == 1
+    assert collector.cursors.get("companies-house;xbrl;uk-company-api") is None
@@ -1,8 +1,8 @@
 """
 Tests for dedup module.
 
-Supabase is always absent in tests (empty env vars), so we exercise
-the in-memory fallback path.
+Tests run memory-only (DEDUP_BACKEND=memory in conftest); backend paths
+use a mocked Supabase client or a temporary SQLite database.
 """
 
 from datetime import datetime
@@ -26,7 +26,7 @@ def _make_post(external_id: str = "test-123", source: str = "stackoverflow") ->
 
 
 def _make_scored(post: Post) -> ScoredPost:
-    return ScoredPost(post=post, score=0.8, matched_pain_points=["rate_limit"])
+    return ScoredPost(post=post, score=0.8, matched_pain_points=("rate_limit",))
 
 
 @pytest.fixture(autouse=True)
@@ -34,8 +34,10 @@ def clear_in_memory_cache():
     """Reset in-memory dedup set between tests."""
     import src.dedup as dedup_module
     dedup_module._seen_in_memory.clear()
+    dedup_module._pending_rows.clear()
     yield
     dedup_module._seen_in_memory.clear()
+    dedup_module._pending_rows.clear()
 
 
 @pytest.mark.asyncio
@@ -87,3 +89,371 @@ async def test_different_id_same_source_is_new():
 
     assert await is_new(post1) is False
     assert await is_new(post2) is True
+
+
+@pytest.mark.asyncio
+async def test_filter_new_drops_seen_and_duplicate_posts():
+    """filter_new keeps unseen posts in order and drops repeats within the batch."""
+    from src.dedup import filter_new, mark_seen
+
+    seen = _make_post("seen-1")
+    fresh = _make_post("fresh-1")
+    await mark_seen(_make_scored(seen))
+
+    result = await filter_new([seen, fresh, _make_post("fresh-1"), _make_post("fresh-2")])
+
+    assert [p.external_id for p in result] == ["fresh-1", "fresh-2"]
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """Route dedup to a SupabaseBackend wrapping a mock client."""
+    from unittest.mock import MagicMock
+
+    import src.dedup as dedup_module
+
+    client = MagicMock()
+    backend = dedup_module.SupabaseBackend(client)
+    backend.reset = lambda: None  # keep the mock client across failures
+    monkeypatch.setattr(dedup_module.settings, "dedup_flush_size", 3)
+    monkeypatch.setattr(dedup_module.settings, "dedup_flush_interval_seconds", 3600)
+    monkeypatch.setattr(dedup_module, "_FLUSH_BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(dedup_module, "_get_backend", lambda: backend)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_filter_new_queries_supabase_once_per_source(fake_supabase):
+    """All candidate ids for a source are resolved with a single in_ query."""
+    import src.dedup as dedup_module
+    from src.dedup import filter_new
+
+    query = fake_supabase.table.return_value.select.return_value.eq.return_value.in_.return_value
+    query.execute.return_value.data = [{"external_id": "known"}]
+
+    posts = [_make_post("known"), _make_post("unknown"), _make_post("other", source="reddit")]
+    result = await filter_new(posts)
+
+    assert [p.external_id for p in result] == ["unknown", "other"]
+    assert query.execute.call_count == 2  # stackoverflow + reddit
+    assert ("stackoverflow", "known") in dedup_module._seen_in_memory
+
+
+def test_supabase_client_reused_and_reset_after_failure(monkeypatch):
+    """The client is created once, and a failed query forces a reconnect."""
+    from unittest.mock import MagicMock, patch
+
+    import src.dedup as dedup_module
+
+    clients = [MagicMock(), MagicMock()]
+    clients[0].table.return_value.select.return_value.limit.return_value.execute.side_effect = RuntimeError("boom")
+    backend = dedup_module.SupabaseBackend()
+    monkeypatch.setattr(dedup_module, "_get_backend", lambda: backend)
+
+    with patch("supabase.create_client", side_effect=clients) as create:
+        assert backend.client is backend.client
+        assert create.call_count == 1
+
+        assert dedup_module.check_connection() is False
+        assert backend.client is clients[1]
+        assert dedup_module.check_connection() is True
+
+    stats = dedup_module.io_stats()
+    assert stats["calls"] >= 2
+    assert stats["errors"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_mark_seen_buffers_until_flush_size(fake_supabase):
+    """Rows are upserted together once the buffer reaches dedup_flush_size."""
+    from src.dedup import is_new, mark_seen
+
+    upsert = fake_supabase.table.return_value.upsert
+    await mark_seen(_make_scored(_make_post("a")))
+    await mark_seen(_make_scored(_make_post("b")))
+    upsert.assert_not_called()
+    assert await is_new(_make_post("a")) is False  # served from memory while buffered
+
+    await mark_seen(_make_scored(_make_post("c")))
+    upsert.assert_called_once()
+    rows = upsert.call_args.args[0]
+    assert [r["external_id"] for r in rows] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_flush_failure_keeps_rows_buffered(fake_supabase):
+    """Rows stay queued after all retries fail and go out on the next flush."""
+    import src.dedup as dedup_module
+    from src.dedup import flush_seen, mark_seen
+
+    execute = fake_supabase.table.return_value.upsert.return_value.execute
+    execute.side_effect = RuntimeError("supabase down")
+
+    await mark_seen(_make_scored(_make_post("a")))
+    assert await flush_seen() is False
+    assert execute.call_count == dedup_module.settings.dedup_flush_retries
+    assert ("stackoverflow", "a") in dedup_module._pending_rows
+
+    execute.side_effect = None
+    assert await flush_seen() is True
+    assert not dedup_module._pending_rows
+
+
+def test_seen_cache_evicts_oldest_beyond_max_size():
+    from src.dedup import _SeenCache
+
+    cache = _SeenCache(max_size=2, ttl_seconds=3600)
+    cache.add(("github", "1"))
+    cache.add(("github", "2"))
+    cache.add(("reddit", "abc"))
+
+    assert ("github", "1") not in cache
+    assert ("github", "2") in cache
+    assert ("reddit", "abc") in cache
+    assert len(cache) == 2
+
+
+def test_seen_cache_expires_after_ttl(monkeypatch):
+    import src.dedup as dedup_module
+
+    now = [1000.0]
+    monkeypatch.setattr(dedup_module.time, "monotonic", lambda: now[0])
+    cache = dedup_module._SeenCache(max_size=10, ttl_seconds=60)
+    cache.add(("hackernews", "42"))
+
+    now[0] += 59
+    assert ("hackernews", "42") in cache
+    now[0] += 2
+    assert ("hackernews", "42") not in cache
+
+
+def test_seen_cache_keeps_leading_zero_ids_distinct():
+    from src.dedup import _SeenCache
+
+    cache = _SeenCache(max_size=10, ttl_seconds=60)
+    cache.add(("stackoverflow", "7"))
+    assert ("stackoverflow", "07") not in cache
+    assert ("stackoverflow", "7") in cache
+
+
+@pytest.mark.asyncio
+async def test_warm_seen_cache_loads_lookback_window(fake_supabase):
+    """Startup preload pages through recent keys and serves them from memory."""
+    from src.dedup import is_new, warm_seen_cache
+
+    query = (
+        fake_supabase.table.return_value.select.return_value.gte.return_value
+        .order.return_value.order.return_value.range.return_value
+    )
+    pages = [[{"source": "github", "external_id": 111}, {"source": "reddit", "external_id": "xyz"}], []]
+    query.execute.side_effect = [type("R", (), {"data": page})() for page in pages]
+
+    assert await warm_seen_cache() == 2
+    assert query.execute.call_count == 2
+
+    fake_supabase.table.reset_mock()
+    assert await is_new(_make_post("111", source="github")) is False
+    fake_supabase.table.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    import src.dedup as dedup_module
+
+    backend = dedup_module.SQLiteBackend(str(tmp_path / "seen.db"))
+    monkeypatch.setattr(dedup_module.settings, "dedup_flush_size", 2)
+    monkeypatch.setattr(dedup_module, "_get_backend", lambda: backend)
+    yield backend
+    backend.reset()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_survives_restart(sqlite_backend):
+    """Seen posts persist in SQLite, so a cold in-memory cache still dedups."""
+    import src.dedup as dedup_module
+    from src.dedup import filter_new, flush_seen, mark_seen
+
+    await mark_seen(_make_scored(_make_post("a")))
+    await flush_seen()
+    assert sqlite_backend.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    dedup_module._seen_in_memory.clear()  # simulate a restart
+    sqlite_backend.reset()
+
+    result = await filter_new([_make_post("a"), _make_post("b")])
+    assert [p.external_id for p in result] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_batches_and_upserts(sqlite_backend):
+    from src.dedup import mark_seen
+
+    await mark_seen(_make_scored(_make_post("a")), notified=False)
+    await mark_seen(_make_scored(_make_post("b")))  # reaches flush size
+    await mark_seen(_make_scored(_make_post("a")), notified=True)
+    await mark_seen(_make_scored(_make_post("c")))
+
+    rows = dict(sqlite_backend.conn.execute(
+        "SELECT external_id, notified FROM scout_seen_posts"
+    ).fetchall())
+    assert rows == {"a": 1, "b": 1, "c": 1}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_prune_and_warm(sqlite_backend):
+    import src.dedup as dedup_module
+    from src.dedup import flush_seen, mark_seen, prune_seen, warm_seen_cache
+
+    await mark_seen(_make_scored(_make_post("old")))
+    await flush_seen()
+    sqlite_backend.conn.execute("UPDATE scout_seen_posts SET created_at = 0")
+    await mark_seen(_make_scored(_make_post("recent")))
+    await flush_seen()
+
+    assert await prune_seen() == 1
+    dedup_module._seen_in_memory.clear()
+    assert await warm_seen_cache() == 1
+    assert ("stackoverflow", "recent") in dedup_module._seen_in_memory
+
+
+# ---------------------------------------------------------------------------
+# Bloom pre-filter
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_bloom_filter_skips_backend_for_definite_misses(sqlite_backend, tmp_path, monkeypatch):
+    import src.dedup as dedup_module
+    from src.dedup import bloom_stats, filter_new, flush_seen, mark_seen, warm_seen_cache
+
+    monkeypatch.setattr(dedup_module.settings, "bloom_filter_enabled", True)
+    monkeypatch.setattr(dedup_module.settings, "bloom_filter_path", str(tmp_path / "seen.bloom"))
+    monkeypatch.setattr(dedup_module, "_bloom", None)
+    monkeypatch.setattr(dedup_module, "_bloom_stats", dict.fromkeys(dedup_module._bloom_stats, 0))
+
+    await mark_seen(_make_scored(_make_post("a")))
+    await flush_seen()
+    dedup_module._seen_in_memory.clear()
+    await warm_seen_cache()
+    dedup_module._seen_in_memory.clear()  # force the backend path for "a"
+
+    fetch = sqlite_backend.fetch_seen
+    queried: list[list[str]] = []
+    monkeypatch.setattr(sqlite_backend, "fetch_seen", lambda source, ids: queried.append(ids) or fetch(source, ids))
+
+    result = await filter_new([_make_post("a"), _make_post("b")])
+
+    assert [p.external_id for p in result] == ["b"]
+    assert queried == [["a"]]  # "b" was a definite miss
+    assert bloom_stats()["definite_misses"] == 1
+    assert (tmp_path / "seen.bloom").exists()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_outbox_round_trip(sqlite_backend):
+    import time
+
+    from src.dedup import outbox_delete, outbox_due, outbox_put, outbox_stats
+
+    now = time.time()
+    row = {"source": "reddit", "external_id": "abc", "channel": "discord", "payload": {"title": "t"},
+           "attempts": 1, "next_attempt_at": now - 1, "created_at": now - 60, "last_error": "HTTP 429"}
+    assert await outbox_put(row)
+    assert await outbox_put({**row, "channel": "telegram", "next_attempt_at": now + 600})
+
+    due = await outbox_due(10)
+    assert [(r["channel"], r["payload"]) for r in due] == [("discord", {"title": "t"})]
+    stats = outbox_stats()
+    assert (stats["depth"], stats["due"], stats["durable"]) == (2, 1, True)
+    assert stats["oldest_age_seconds"] >= 60
+
+    await outbox_delete(due[0])
+    assert await outbox_due(10) == []
+
+
+def test_supabase_load_recent_pages_until_empty(fake_supabase):
+    """Pages are requested with range() until one comes back empty, whatever max-rows is."""
+    from datetime import datetime, timezone
+
+    import src.dedup as dedup_module
+
+    query = (
+        fake_supabase.table.return_value.select.return_value.gte.return_value
+        .order.return_value.order.return_value.range
+    )
+    # The server returns fewer rows than asked for (max-rows below _LOAD_PAGE_SIZE)
+    pages = [[{"source": "reddit", "external_id": i} for i in range(3)], [{"source": "reddit", "external_id": 3}], []]
+    query.return_value.execute.side_effect = [type("R", (), {"data": page})() for page in pages]
+
+    keys = dedup_module._get_backend().load_recent(datetime.now(timezone.utc), 100)
+
+    assert keys == [("reddit", str(i)) for i in range(4)]
+    assert [call.args for call in query.call_args_list] == [(0, 99), (3, 99), (4, 99)]
+
+
+@pytest.mark.asyncio
+async def test_bloom_filter_disabled_when_window_is_cut_short(sqlite_backend, tmp_path, monkeypatch):
+    """Keys left out of the filter would be definite misses, so a partial load builds none."""
+    import src.dedup as dedup_module
+    from src.dedup import filter_new, flush_seen, mark_seen, warm_seen_cache
+
+    monkeypatch.setattr(dedup_module.settings, "bloom_filter_enabled", True)
+    monkeypatch.setattr(dedup_module.settings, "bloom_filter_path", "")
+    monkeypatch.setattr(dedup_module, "_bloom", None)
+    for external_id in ("a", "b", "c"):
+        await mark_seen(_make_scored(_make_post(external_id)))
+    await flush_seen()
+    monkeypatch.setattr(dedup_module.settings, "seen_cache_max_size", 2)
+    dedup_module._seen_in_memory.clear()
+
+    assert await warm_seen_cache() == 2
+    assert dedup_module._bloom is None
+    dedup_module._seen_in_memory.clear()
+    assert await filter_new([_make_post(external_id) for external_id in ("a", "b", "c")]) == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_bloom_filter_adds_keys_stored_elsewhere(sqlite_backend, monkeypatch):
+    """Rows another process wrote after startup are picked up by the periodic rebuild."""
+    import src.dedup as dedup_module
+    from src.dedup import filter_new, mark_seen, rebuild_bloom_filter, warm_seen_cache
+
+    monkeypatch.setattr(dedup_module.settings, "bloom_filter_enabled", True)
+    monkeypatch.setattr(dedup_module.settings, "bloom_filter_path", "")
+    monkeypatch.setattr(dedup_module, "_bloom", None)
+    await warm_seen_cache()
+
+    # Written by another process: not in this process's cache or filter
+    sqlite_backend.upsert([{
+        "source": "stackoverflow", "external_id": "elsewhere", "url": "u", "title": "t",
+        "matched_pain_points": [], "relevance_score": 0.8, "notified": True,
+    }])
+    await mark_seen(_make_scored(_make_post("buffered")))  # not flushed yet
+
+    assert await rebuild_bloom_filter() is True
+    assert dedup_module._bloom_key(("stackoverflow", "buffered")) in dedup_module._bloom
+    dedup_module._seen_in_memory.clear()
+    new_posts = await filter_new([_make_post("elsewhere"), _make_post("new")])
+    assert [post.external_id for post in new_posts] == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_use_backend_routes_dedup_and_restores(tmp_path):
+    import src.dedup as dedup_module
+    from src.dedup import SQLiteBackend, flush_seen, is_new, mark_seen, use_backend
+
+    backend = SQLiteBackend(str(tmp_path / "seen.db"))
+    before = dedup_module._get_backend()
+    with use_backend(backend):
+        await mark_seen(_make_scored(_make_post("routed")))
+        await flush_seen()
+        assert backend.fetch_seen("stackoverflow", ["routed"]) == {"routed"}
+    backend.reset()
+
+    assert dedup_module._get_backend() is before
+    assert await is_new(_make_post("routed")) is True
@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reused_until_closed():
+    from src import http_clients
+
+    await http_clients.start()
+    try:
+        async with http_clients.client("github") as first:
+            pass
+        async with http_clients.client("github") as second:
+            pass
+        assert first is second
+        assert not first.is_closed
+    finally:
+        await http_clients.aclose()
+
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_temporary_client_when_not_started():
+    from src import http_clients
+
+    async with http_clients.client("discord") as temporary:
+        assert not temporary.is_closed
+    assert temporary.is_closed
+
+
+@pytest.mark.asyncio
+async def test_override_serves_replacement_then_restores():
+    import httpx
+
+    from src import http_clients
+
+    replacement = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+    async with http_clients.override("discord", replacement):
+        async with http_clients.client("discord") as client:
+            assert client is replacement
+            assert (await client.post("https://discord.invalid/hook")).status_code == 204
+
+    assert replacement.is_closed
+    assert "discord" not in http_clients._clients
@@ -0,0 +1,117 @@
+"""
+Tests for the Prometheus metrics registry and the /metrics endpoint.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+
+def _render() -> str:
+    from src.utils import metrics
+    return metrics.render()
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    from src.utils import metrics
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_counter_and_histogram_render_text_format():
+    from src.utils import metrics
+
+    requests = metrics.counter("test_requests_total", "Requests.", ("source",))
+    latency = metrics.histogram("test_latency_seconds", "Latency.", ("source",), buckets=(0.1, 1.0))
+    requests.inc(source="github")
+    requests.inc(2, source="github")
+    latency.observe(0.1, source="github")
+    latency.observe(0.5, source="github")
+    latency.observe(3.0, source="github")
+
+    text = metrics.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{source="github"} 3' in text
+    assert 'test_latency_seconds_bucket{source="github",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{source="github",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{source="github",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_sum{source="github"} 3.6' in text
+    assert 'test_latency_seconds_count{source="github"} 3' in text
+
+
+def test_registration_is_idempotent_and_labels_required():
+    from src.utils import metrics
+
+    first = metrics.counter("test_idempotent_total", "x", ("a",))
+    assert metrics.counter("test_idempotent_total", "x", ("a",)) is first
+    with pytest.raises(ValueError):
+        metrics.histogram("test_idempotent_total", "x")
+    with pytest.raises(ValueError):
+        first.inc()
+
+
+def test_label_values_are_escaped():
+    from src.utils import metrics
+
+    metrics.counter("test_escape_total", "x", ("query",)).inc(query='say "hi"\n')
+    assert 'test_escape_total{query="say \\"hi\\"\\n"} 1' in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_notification_failures_counted_per_channel(monkeypatch):
+    import src.notifier as notifier
+    from tests.test_notifier import _make_scored, _SlowChannel
+
+    monkeypatch.setattr(notifier, "_channels", [
+        _SlowChannel("webhook", 1.0, timeout_seconds=0.01),
+        _SlowChannel("slack", 0.0),
+    ])
+    await notifier.dispatch(_make_scored())
+
+    assert notifier._SEND_FAILURES.value(channel="webhook", reason="timeout") == 1
+    assert notifier._SEND_FAILURES.value(channel="slack", reason="timeout") == 0
+    assert notifier._SEND_SECONDS.count(channel="slack") == 1
+
+
+@pytest.mark.asyncio
+async def test_dedup_cache_hits_counted():
+    import src.dedup as dedup_module
+    from tests.test_dedup import _make_post
+
+    dedup_module._seen_in_memory.clear()
+    dedup_module._remember(("stackoverflow", "seen"))
+    await dedup_module.filter_new([_make_post("seen"), _make_post("fresh")])
+    dedup_module._seen_in_memory.clear()
+
+    assert dedup_module._CACHE_LOOKUPS.value(result="hit") == 1
+    assert dedup_module._CACHE_LOOKUPS.value(result="miss") == 1
+
+
+def test_scheduler_job_lag_observed():
+    from src.scheduler import _JOB_LAG_SECONDS, _record_job_lag
+
+    late = datetime.now(timezone.utc) - timedelta(seconds=2)
+    _record_job_lag(SimpleNamespace(job_id="flush_seen", scheduled_run_times=[late]))
+
+    assert _JOB_LAG_SECONDS.count(job="flush_seen") == 1
+    assert 'scout_scheduler_job_lag_seconds_bucket{job="flush_seen",le="1"} 0' in _render()
+    assert 'scout_scheduler_job_lag_seconds_bucket{job="flush_seen",le="5"} 1' in _render()
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+    from src.pipeline import _POSTS_COLLECTED
+
+    _POSTS_COLLECTED.inc(5, collector="StackOverflowCollector")
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'scout_posts_collected_total{collector="StackOverflowCollector"} 5' in response.text
+    assert "# TYPE scout_collector_fetch_seconds histogram" in response.text
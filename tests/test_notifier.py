@@ -1,3 +1,4 @@
+import dataclasses
 from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
@@ -10,7 +11,7 @@ from src.scoring import ScoredPost
 def _make_scored(
     title: str = "Companies House API 429",
     score: float = 0.8,
-    pain_points: list[str] | None = None,
+    pain_points: tuple[str, ...] | None = None,
 ) -> ScoredPost:
     post = Post(
         source="stackoverflow",
@@ -21,12 +22,13 @@ def _make_scored(
         tags=["companies-house"],
         created_at=datetime.utcnow(),
     )
-    return ScoredPost(post=post, score=score, matched_pain_points=pain_points or ["rate_limit"])
+    return ScoredPost(post=post, score=score, matched_pain_points=pain_points or ("rate_limit",))
 
 
 def _discord_only_settings(mock_settings):
     """Configure mock settings with Discord only (Telegram disabled)."""
     mock_settings.scout_webhook_url = "https://discord.com/api/webhooks/fake"
+    mock_settings.discord_batch_window_seconds = 0
     mock_settings.telegram_bot_token = ""
     mock_settings.telegram_chat_id = ""
     mock_settings.api_base_url = "https://ch-api-production-b552.up.railway.app"
@@ -296,6 +298,7 @@ async def test_returns_true_if_either_channel_succeeds():
     with patch("src.notifier.settings") as mock_settings, \
          patch("httpx.AsyncClient") as mock_client_class:
         mock_settings.scout_webhook_url = "https://discord.com/api/webhooks/fake"
+        mock_settings.discord_batch_window_seconds = 0
         mock_settings.telegram_bot_token = "123456:fake"
         mock_settings.telegram_chat_id = "999"
         mock_settings.api_base_url = "https://ch-api-production-b552.up.railway.app"
@@ -310,3 +313,261 @@ async def test_returns_true_if_either_channel_succeeds():
 
     assert result is True
     assert call_count == 2  # both channels attempted
+
+
+# ---------------------------------------------------------------------------
+# Channel fan-out
+# ---------------------------------------------------------------------------
+
+
+class _SlowChannel:
+    """Minimal NotificationChannel stand-in with a configurable delay."""
+
+    def __init__(
+        self, name: str, delay: float, result: bool = True, timeout_seconds: float = 1.0, log: list | None = None
+    ):
+        self.name = name
+        self.delay = delay
+        self.result = result
+        self.timeout_seconds = timeout_seconds
+        self.received = []
+        # Shared across channels to record the order sends start and finish
+        self.log = log if log is not None else []
+
+    def enabled(self) -> bool:
+        return True
+
+    async def send(self, notification) -> bool:
+        import asyncio
+        self.received.append(notification)
+        self.log.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", self.name))
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_channels_dispatched_concurrently_with_one_render(monkeypatch):
+    import src.notifier as notifier
+
+    log = []
+    slack = _SlowChannel("slack", 0.01, log=log)
+    email = _SlowChannel("email", 0.01, log=log)
+    monkeypatch.setattr(notifier, "_channels", [slack, email])
+
+    with patch("src.notifier.get_draft_reply", return_value="draft") as mock_draft:
+        results = await notifier.dispatch(_make_scored())
+
+    assert results == {"slack": True, "email": True}
+    # Both sends started before either finished
+    assert [event for event, _ in log] == ["start", "start", "end", "end"]
+    mock_draft.assert_called_once()
+    assert slack.received[0] is email.received[0]
+
+
+@pytest.mark.asyncio
+async def test_channel_timeout_fails_only_that_channel(monkeypatch):
+    import src.notifier as notifier
+
+    monkeypatch.setattr(notifier, "_channels", [
+        _SlowChannel("webhook", 1.0, timeout_seconds=0.01),
+        _SlowChannel("slack", 0.0),
+    ])
+
+    assert await notifier.dispatch(_make_scored()) == {"webhook": False, "slack": True}
+    assert await notifier.send_notification(_make_scored()) is True
+
+
+@pytest.mark.asyncio
+async def test_register_channel_adds_to_fan_out(monkeypatch):
+    import src.notifier as notifier
+
+    monkeypatch.setattr(notifier, "_channels", [])
+    failing = _SlowChannel("email", 0.0, result=False)
+    notifier.register_channel(failing)
+
+    assert await notifier.send_notification(_make_scored()) is False
+    assert len(failing.received) == 1
+
+
+# ---------------------------------------------------------------------------
+# Discord batching
+# ---------------------------------------------------------------------------
+
+
+def _scored_many(n: int) -> list[ScoredPost]:
+    scored = []
+    for i in range(n):
+        s = _make_scored(title=f"Companies House API 429 #{i}")
+        scored.append(dataclasses.replace(s, post=dataclasses.replace(s.post, external_id=str(i))))
+    return scored
+
+
+async def _send_batched(scored_posts, fake_post):
+    import asyncio
+
+    from src.notifier import DiscordChannel, render
+
+    channel = DiscordChannel()
+    with patch("src.notifier.settings") as mock_settings, \
+         patch("httpx.AsyncClient") as mock_client_class:
+        _discord_only_settings(mock_settings)
+        mock_settings.discord_batch_window_seconds = 0.01
+
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.post = fake_post
+        mock_client_class.return_value = mock_client
+
+        deliveries = await asyncio.gather(*(channel.send(render(s)) for s in scored_posts))
+        return [delivery.ok for delivery in deliveries]
+
+
+@pytest.mark.asyncio
+async def test_discord_batches_embeds_up_to_ten_per_call():
+    calls = []
+
+    async def fake_post(url, json=None, **kwargs):
+        calls.append(len(json["embeds"]))
+        r = AsyncMock()
+        r.status_code = 204
+        return r
+
+    results = await _send_batched(_scored_many(12), fake_post)
+
+    assert results == [True] * 12
+    assert calls == [10, 2]
+
+
+@pytest.mark.asyncio
+async def test_discord_batch_respects_message_character_limit():
+    calls = []
+
+    async def fake_post(url, json=None, **kwargs):
+        calls.append(len(json["embeds"]))
+        r = AsyncMock()
+        r.status_code = 204
+        return r
+
+    # Each embed carries a ~1000 character draft reply, so only a few fit in 6000
+    with patch("src.notifier.get_draft_reply", return_value="x" * 1000):
+        results = await _send_batched(_scored_many(6), fake_post)
+
+    assert all(results)
+    assert len(calls) > 1
+    assert sum(calls) == 6
+
+
+@pytest.mark.asyncio
+async def test_discord_rejected_batch_reports_per_post_results():
+    """A 400 for the whole batch falls back to single sends, so only the bad post fails."""
+    async def fake_post(url, json=None, **kwargs):
+        r = AsyncMock()
+        titles = [embed["title"] for embed in json["embeds"]]
+        r.status_code = 400 if any(t.endswith("#1") for t in titles) else 204
+        r.text = "Bad Request"
+        return r
+
+    results = await _send_batched(_scored_many(3), fake_post)
+
+    assert results == [True, False, True]
+
+
+# ---------------------------------------------------------------------------
+# Retry outbox
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Empty in-memory outbox with real retry settings."""
+    import src.dedup as dedup_module
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "notify_retry_base_seconds", 30.0)
+    monkeypatch.setattr(settings, "notify_retry_max_seconds", 3600.0)
+    monkeypatch.setattr(settings, "notify_max_attempts", 3)
+    dedup_module._memory_outbox.rows.clear()
+    yield dedup_module._memory_outbox.rows
+    dedup_module._memory_outbox.rows.clear()
+
+
+@pytest.mark.asyncio
+async def test_discord_429_queued_with_retry_after(outbox):
+    import time
+
+    from src.notifier import send_notification
+
+    with patch("src.notifier.settings") as mock_settings, \
+         patch("httpx.AsyncClient") as mock_client_class:
+        _discord_only_settings(mock_settings)
+        mock_settings.notify_retry_base_seconds = 30.0
+        mock_settings.notify_retry_max_seconds = 3600.0
+        mock_response = AsyncMock()
+        mock_response.status_code = 429
+        mock_response.text = "You are being rate limited."
+        mock_response.json = lambda: {"retry_after": 120.5, "global": False}
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_client_class.return_value = mock_client
+
+        result = await send_notification(_make_scored())
+
+    assert result is False
+    row = outbox[("stackoverflow", "123", "discord")]
+    assert row["attempts"] == 1
+    assert row["next_attempt_at"] - time.time() > 119
+    assert row["payload"]["matched_pain_points"] == ["rate_limit"]
+
+
+def test_retry_delay_doubles_and_respects_retry_after(outbox):
+    from src.notifier import _retry_delay
+
+    assert [_retry_delay(n, None) for n in (1, 2, 3)] == [30, 60, 120]
+    assert _retry_delay(20, None) == 3600
+    assert _retry_delay(1, 300) == 300
+
+
+@pytest.mark.asyncio
+async def test_drain_outbox_delivers_and_marks_notified(outbox, monkeypatch):
+    import src.notifier as notifier
+
+    slack = _SlowChannel("slack", 0.0, result=notifier.Delivery(ok=False, status=503, retryable=True))
+    monkeypatch.setattr(notifier, "_channels", [slack])
+    await notifier.send_notification(_make_scored())
+    row = outbox[("stackoverflow", "123", "slack")]
+    row["next_attempt_at"] = 0  # due now
+
+    slack.result = True
+    mark_seen = AsyncMock()
+    monkeypatch.setattr(notifier, "mark_seen", mark_seen)
+    summary = await notifier.drain_outbox()
+
+    assert summary == {"due": 1, "sent": 1, "retrying": 0, "gave_up": 0}
+    assert outbox == {}
+    scored = mark_seen.call_args.args[0]
+    assert scored.post.external_id == "123"
+    assert scored.post.created_at == slack.received[0].scored.post.created_at
+    assert mark_seen.call_args.kwargs == {"notified": True}
+
+
+@pytest.mark.asyncio
+async def test_drain_outbox_backs_off_then_gives_up(outbox, monkeypatch):
+    import src.notifier as notifier
+
+    slack = _SlowChannel("slack", 0.0, result=notifier.Delivery(ok=False, status=503, retryable=True))
+    monkeypatch.setattr(notifier, "_channels", [slack])
+    await notifier.send_notification(_make_scored())
+    key = ("stackoverflow", "123", "slack")
+
+    outbox[key]["next_attempt_at"] = 0
+    assert (await notifier.drain_outbox())["retrying"] == 1
+    assert outbox[key]["attempts"] == 2
+    assert outbox[key]["last_error"] == ""
+
+    outbox[key]["next_attempt_at"] = 0
+    assert (await notifier.drain_outbox())["gave_up"] == 1  # third attempt of 3
+    assert outbox == {}
@@ -32,10 +32,21 @@ class _FakeCollector:
     def __init__(self, posts: list[Post]):
         self._posts = posts
         self.lookback_seconds = 86400
+        self.committed = False
 
     async def collect(self) -> list[Post]:
         return self._posts
 
+    async def stream_pages(self):
+        yield await self.collect()
+
+    def commit_cursors(self) -> None:
+        self.committed = True
+
+
+async def _all_new(posts: list[Post]) -> list[Post]:
+    return list(posts)
+
 
 @pytest.fixture(autouse=True)
 def clear_dedup_cache():
@@ -53,7 +64,7 @@ async def test_relevant_new_post_triggers_notification():
 
     with patch("src.pipeline.send_notification", new_callable=AsyncMock) as mock_notify, \
          patch("src.pipeline.mark_seen", new_callable=AsyncMock) as mock_mark, \
-         patch("src.pipeline.is_new", new_callable=AsyncMock, return_value=True):
+         patch("src.pipeline.filter_new", side_effect=_all_new):
         mock_notify.return_value = True
 
         from src.pipeline import run_collector
@@ -72,7 +83,7 @@ async def test_seen_post_not_notified():
     collector = _FakeCollector([post])
 
     with patch("src.pipeline.send_notification", new_callable=AsyncMock) as mock_notify, \
-         patch("src.pipeline.is_new", new_callable=AsyncMock, return_value=False):
+         patch("src.pipeline.filter_new", new_callable=AsyncMock, return_value=[]):
 
         from src.pipeline import run_collector
         summary = await run_collector(collector)
@@ -119,8 +130,12 @@ async def test_collector_exception_does_not_crash_pipeline():
     class _BrokenCollector:
         lookback_seconds = 86400
 
-        async def collect(self):
+        async def stream_pages(self):
             raise RuntimeError("network down")
+            yield []
+
+        def commit_cursors(self) -> None:
+            pass
 
     with patch("src.pipeline.send_notification", new_callable=AsyncMock) as mock_notify:
         from src.pipeline import run_collector
@@ -139,10 +154,10 @@ async def test_pipeline_summary_counts_correctly():
 
     collector = _FakeCollector([relevant_new, relevant_seen, irrelevant])
 
-    async def fake_is_new(post):
-        return post.external_id == "new-1"
+    async def fake_filter_new(posts):
+        return [p for p in posts if p.external_id == "new-1"]
 
-    with patch("src.pipeline.is_new", side_effect=fake_is_new), \
+    with patch("src.pipeline.filter_new", side_effect=fake_filter_new), \
          patch("src.pipeline.send_notification", new_callable=AsyncMock, return_value=True), \
          patch("src.pipeline.mark_seen", new_callable=AsyncMock):
 
@@ -153,3 +168,193 @@ async def test_pipeline_summary_counts_correctly():
     assert summary["above_threshold"] == 2  # relevant_new + relevant_seen
     assert summary["new"] == 1              # only relevant_new
     assert summary["notified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_all_collectors_runs_concurrently_in_stable_order():
+    """Collectors overlap in time, and summaries keep the input order."""
+    import asyncio
+
+    running = 0
+    peak = 0
+
+    class _SlowCollector(_FakeCollector):
+        async def collect(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return self._posts
+
+    class _SOCollector(_SlowCollector):
+        pass
+
+    class _HNCollector(_SlowCollector):
+        pass
+
+    from src.pipeline import run_all_collectors
+    results = await run_all_collectors([_SOCollector([]), _HNCollector([])])
+
+    assert peak == 2
+    assert [r["collector"] for r in results] == ["_SOCollector", "_HNCollector"]
+    assert all(r["duration_ms"] >= r["collect_ms"] > 0 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_run_all_collectors_respects_concurrency_limit(monkeypatch):
+    import asyncio
+
+    from src.config import settings
+    monkeypatch.setattr(settings, "collector_concurrency", 1)
+    running = 0
+    peak = 0
+
+    class _SlowCollector(_FakeCollector):
+        async def collect(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+    from src.pipeline import run_all_collectors
+    await run_all_collectors([_SlowCollector([]) for _ in range(3)])
+
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_run_all_collectors_isolates_unexpected_failures():
+    """An error after collect() in one collector doesn't lose the others' summaries."""
+    post = _make_post(tags=["companies-house"])
+
+    async def exploding_filter_new(posts):
+        if posts:
+            raise RuntimeError("dedup exploded")
+        return []
+
+    from src.pipeline import run_all_collectors
+    with patch("src.pipeline.filter_new", side_effect=exploding_filter_new):
+        results = await run_all_collectors([_FakeCollector([post]), _FakeCollector([])])
+
+    assert results[0]["error"] == "dedup exploded"
+    assert "error" not in results[1]
+
+
+@pytest.mark.asyncio
+async def test_pages_processed_as_they_stream():
+    """Each page is deduped on arrival; a mid-stream failure keeps earlier pages' counts."""
+    first = _make_post("page-1", tags=["companies-house"])
+    filtered: list[list[str]] = []
+
+    class _FailingStream(_FakeCollector):
+        async def stream_pages(self):
+            yield [first]
+            raise RuntimeError("connection reset")
+
+    async def recording_filter_new(posts):
+        filtered.append([p.external_id for p in posts])
+        return list(posts)
+
+    with patch("src.pipeline.filter_new", side_effect=recording_filter_new), \
+         patch("src.pipeline.send_notification", new_callable=AsyncMock, return_value=True), \
+         patch("src.pipeline.mark_seen", new_callable=AsyncMock):
+        from src.pipeline import run_collector
+        summary = await run_collector(_FailingStream([]))
+
+    assert filtered == [["page-1"]]
+    assert summary["collected"] == 1
+    assert summary["notified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_notifications_overlap_and_stage_stats_reported(monkeypatch):
+    """A page's posts are notified together, even by one worker; stages report their stats."""
+    import asyncio
+
+    from src.config import settings
+    monkeypatch.setattr(settings, "pipeline_notify_workers", 1)
+
+    posts = [_make_post(f"slow-{i}", tags=["companies-house"]) for i in range(3)]
+    in_flight = 0
+    peak = 0
+
+    async def slow_notify(scored):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return True
+
+    with patch("src.pipeline.filter_new", side_effect=_all_new), \
+         patch("src.pipeline.send_notification", side_effect=slow_notify), \
+         patch("src.pipeline.mark_seen", new_callable=AsyncMock) as mock_mark:
+        from src.pipeline import run_collector
+        summary = await run_collector(_FakeCollector(posts))
+
+    assert peak == 3
+    assert summary["notified"] == 3
+    assert mock_mark.await_count == 3
+    stages = summary["stages"]
+    assert list(stages) == ["score", "dedup", "notify", "persist"]
+    assert stages["notify"]["items"] == 1  # one page
+    assert stages["notify"]["max_ms"] >= 20
+    assert stages["score"]["max_queue_depth"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cursors_committed_only_after_a_clean_run():
+    """A stage failing mid-run leaves the cursors, so the posts are fetched again."""
+    from src.pipeline import run_collector
+
+    collector = _FakeCollector([_make_post(tags=["companies-house"])])
+    with patch("src.pipeline.send_notification", new_callable=AsyncMock, return_value=True), \
+         patch("src.pipeline.mark_seen", new_callable=AsyncMock, side_effect=RuntimeError("db down")), \
+         patch("src.pipeline.filter_new", side_effect=_all_new):
+        with pytest.raises(RuntimeError):
+            await run_collector(collector)
+    assert collector.committed is False
+
+    with patch("src.pipeline.send_notification", new_callable=AsyncMock, return_value=True), \
+         patch("src.pipeline.mark_seen", new_callable=AsyncMock), \
+         patch("src.pipeline.filter_new", side_effect=_all_new):
+        await run_collector(collector)
+    assert collector.committed is True
+
+
+@pytest.mark.asyncio
+async def test_page_fills_discord_batches_with_one_notify_worker(monkeypatch):
+    """Discord batch size isn't capped by the number of notify workers."""
+    import httpx
+
+    from src.config import settings
+    from src.notifier import DiscordChannel
+
+    monkeypatch.setattr(settings, "pipeline_notify_workers", 1)
+    monkeypatch.setattr(settings, "scout_webhook_url", "https://discord.com/api/webhooks/fake")
+    monkeypatch.setattr(settings, "discord_batch_window_seconds", 0.01)
+    posts = [_make_post(f"batched-{i}", tags=["companies-house"]) for i in range(12)]
+    calls = []
+
+    async def fake_post(url, json=None, **kwargs):
+        calls.append(len(json["embeds"]))
+        return httpx.Response(204)
+
+    with patch("src.notifier._channels", [DiscordChannel()]), \
+         patch("httpx.AsyncClient") as mock_client_class, \
+         patch("src.pipeline.filter_new", side_effect=_all_new), \
+         patch("src.pipeline.mark_seen", new_callable=AsyncMock):
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.post = fake_post
+        mock_client_class.return_value = mock_client
+
+        from src.pipeline import run_collector
+        summary = await run_collector(_FakeCollector(posts))
+
+    assert calls == [10, 2]
+    assert summary["notified"] == 12
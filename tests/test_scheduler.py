@@ -0,0 +1,104 @@
+"""
+Adaptive polling: interval policy and job wiring.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def bounds(monkeypatch):
+    from src.config import settings
+    monkeypatch.setattr(settings, "poll_interval_min", 15)
+    monkeypatch.setattr(settings, "poll_interval_max", 1440)
+    monkeypatch.setattr(settings, "adaptive_target_leads", 1.0)
+
+
+def _quota(remaining=None, reset_in=None, blocked=0.0, throttled=0) -> dict:
+    return {
+        "remaining": remaining,
+        "reset_in_seconds": reset_in,
+        "tokens": 5.0,
+        "blocked_for_seconds": blocked,
+        "throttled": throttled,
+    }
+
+
+def test_busy_source_polled_more_often(bounds):
+    from src.scheduler import PollState, next_poll_interval
+
+    state = PollState(interval_minutes=360)
+    # 12 leads in 6 hours → 2/hour → aim for one lead per 30 minutes, halving per step
+    assert next_poll_interval(state, {"new": 12}, None) == 180
+    assert next_poll_interval(state, {"new": 6}, None) == 90
+
+
+def test_quiet_source_backs_off_to_max(bounds):
+    from src.scheduler import PollState, next_poll_interval
+
+    state = PollState(interval_minutes=360)
+    assert next_poll_interval(state, {"new": 0}, None) == 720
+    assert next_poll_interval(state, {"new": 0}, None) == 1440
+    assert next_poll_interval(state, {"new": 0}, None) == 1440
+
+
+def test_interval_clamped_to_min(bounds):
+    from src.scheduler import PollState, next_poll_interval
+
+    state = PollState(interval_minutes=20)
+    assert next_poll_interval(state, {"new": 50}, None) == 15
+
+
+def test_throttling_stretches_interval(bounds):
+    from src.scheduler import PollState, next_poll_interval
+
+    state = PollState(interval_minutes=60)
+    assert next_poll_interval(state, {"new": 5}, _quota(throttled=1)) == 120
+    # No new throttling since the last run: back to yield-driven
+    assert next_poll_interval(state, {"new": 10}, _quota(throttled=1)) < 120
+
+
+def test_exhausted_quota_waits_for_reset(bounds):
+    from src.scheduler import PollState, next_poll_interval
+
+    state = PollState(interval_minutes=30)
+    assert next_poll_interval(state, {"new": 5}, _quota(remaining=0, reset_in=3 * 3600)) == 180
+
+
+def test_adaptive_mode_registers_adaptive_jobs(monkeypatch):
+    from src.config import settings
+    monkeypatch.setattr(settings, "adaptive_polling", True)
+
+    from src.scheduler import _run_adaptive, create_scheduler
+    scheduler = create_scheduler()
+
+    job = scheduler.get_job("GitHubIssuesCollector")
+    assert job.func is _run_adaptive
+    assert job.args[2].interval_minutes == settings.poll_interval_github
+
+
+@pytest.mark.asyncio
+async def test_run_adaptive_reschedules_job(monkeypatch, bounds):
+    from unittest.mock import AsyncMock, MagicMock
+
+    import src.scheduler as scheduler_module
+    from src.scheduler import PollState
+
+    monkeypatch.setattr(scheduler_module, "run_collector", AsyncMock(return_value={"new": 0}))
+    scheduler = MagicMock()
+    collector = scheduler_module.GitHubIssuesCollector()
+
+    await scheduler_module._run_adaptive(scheduler, collector, PollState(60))
+
+    scheduler.reschedule_job.assert_called_once_with(
+        "GitHubIssuesCollector", trigger="interval", minutes=120
+    )
+
+
+def test_relevant_repeats_count_towards_yield(bounds):
+    from src.scheduler import PollState, next_poll_interval
+
+    # Relevant posts that dedup had already seen (e.g. just after a restart)
+    # keep a busy source from backing off as if it were quiet
+    state = PollState(interval_minutes=360)
+    assert next_poll_interval(state, {"new": 0, "above_threshold": 24}, None) == 180
+    assert next_poll_interval(PollState(360), {"new": 0, "above_threshold": 0}, None) == 720
@@ -8,12 +8,13 @@ Score formula:
   dev_context: if no programming/API language found, total *= 0.5
 """
 
+import dataclasses
 from datetime import datetime
 
 import pytest
 
-from src.collectors.base import Post
-from src.scoring import score
+from src.collectors.base import BODY_MAX_CHARS, Post
+from src.scoring import PainPoint, score
 
 
 def _post(title: str, body: str = "", tags: list[str] | None = None) -> Post:
@@ -175,7 +176,7 @@ def test_empty_post_scores_zero():
     post = _post("", body="", tags=[])
     result = score(post)
     assert result.score == 0.0
-    assert result.matched_pain_points == []
+    assert result.matched_pain_points == ()
 
 
 # ---------------------------------------------------------------------------
@@ -224,3 +225,195 @@ def test_no_dev_context_halves_score():
         body="I want to find all the directors of this company.",
     )
     assert score(with_dev).score > score(without_dev).score
+
+
+# ---------------------------------------------------------------------------
+# Compiled keyword matcher
+# ---------------------------------------------------------------------------
+
+
+def test_overlapping_keywords_all_counted():
+    """Keywords nested inside other keywords must each count, as with `kw in text`."""
+    from src.scoring import _DEV_GROUP, _match_groups
+
+    # "directors" also contains "director"; "ch api" also contains "api"
+    counts = _match_groups("shared directors via the ch api")
+    assert counts["director_network"] == 3  # shared directors, director, directors
+    assert counts[_DEV_GROUP] == 1  # api
+
+
+def test_score_batch_matches_score():
+    """score_batch must return exactly what per-post score() returns, in order."""
+    from src.scoring import score_batch
+
+    posts = [
+        _post(""),
+        _post("Companies House API 429 rate limit exceeded"),
+        _post("Companies House directors lookup", body="I want to find all the directors."),
+        _post("Python list comprehension tips and tricks"),
+        _post("How to parse iXBRL", tags=["companies-house"]),
+    ]
+    batch = score_batch(posts)
+
+    assert [s.post for s in batch] == posts
+    for post, result in zip(posts, batch):
+        expected = score(post)
+        assert result.score == expected.score
+        assert result.matched_pain_points == expected.matched_pain_points
+
+
+def test_score_batch_empty():
+    from src.scoring import score_batch
+
+    assert score_batch([]) == []
+
+
+@pytest.mark.asyncio
+async def test_score_batch_async_thread_and_process_paths_match(monkeypatch):
+    """Both off-loop paths return score_batch's results, in order, for the original Posts."""
+    from src.config import settings
+    from src.scoring import score_batch, score_batch_async, shutdown_scoring_pool
+
+    posts = [
+        _post(f"Companies House API 429 rate limit #{i}") if i % 2 else _post(f"Python tips #{i}")
+        for i in range(25)
+    ]
+    expected = [(s.score, s.matched_pain_points) for s in score_batch(posts)]
+
+    threaded = await score_batch_async(posts)
+    assert [(s.score, s.matched_pain_points) for s in threaded] == expected
+
+    monkeypatch.setattr(settings, "scoring_process_min_posts", 10)
+    monkeypatch.setattr(settings, "scoring_chunk_size", 7)
+    monkeypatch.setattr(settings, "scoring_workers", 2)
+    try:
+        pooled = await score_batch_async(posts)
+    finally:
+        shutdown_scoring_pool()
+
+    assert all(a.post is b for a, b in zip(pooled, posts))
+    assert [(s.score, s.matched_pain_points) for s in pooled] == expected
+
+
+def test_score_batch_parallel_truncates_bodies_in_parent(monkeypatch):
+    """Pool-scored posts keep no more body than in-process scoring would."""
+    from src.config import settings
+    from src.scoring import score_batch_parallel, shutdown_scoring_pool
+
+    body = "filler " * 400 + "api 429 rate limit"
+    posts = [_post(f"Companies House question #{i}", body=body) for i in range(12)]
+
+    monkeypatch.setattr(settings, "scoring_process_min_posts", 10)
+    monkeypatch.setattr(settings, "scoring_chunk_size", 5)
+    monkeypatch.setattr(settings, "scoring_workers", 2)
+    try:
+        scored = score_batch_parallel(posts)
+    finally:
+        shutdown_scoring_pool()
+
+    assert all(len(post.body) <= BODY_MAX_CHARS for post in posts)
+    # Matched on the full body in the workers
+    assert all(s.matched_pain_points == (PainPoint.RATE_LIMIT,) for s in scored)
+
+
+# ---------------------------------------------------------------------------
+# Normalised text and whole-word matching
+# ---------------------------------------------------------------------------
+
+
+def test_rest_inside_interest_is_not_dev_context():
+    from src.scoring import _DEV_GROUP, _match_groups
+
+    assert _DEV_GROUP not in _match_groups("companies house interest and restore")
+
+
+def test_version_suffixes_and_prefixed_spellings_match():
+    from src.scoring import _DEV_GROUP, _match_groups
+
+    assert _match_groups("python3 script")[_DEV_GROUP] == 2
+    assert _match_groups("oauth2 flow")[_DEV_GROUP] == 1
+    assert _match_groups("ixbrl")["ixbrl_parsing"] == 2  # ixbrl, xbrl
+    assert "rate_limit" not in _match_groups("error 4291")
+
+
+def test_inflections_still_match():
+    from src.scoring import _DEV_GROUP, _match_groups
+
+    counts = _match_groups("rate limiting on the apis throttled again")
+    assert counts["rate_limit"] == 2  # rate limit, throttle
+    assert counts[_DEV_GROUP] == 2  # rate limit, api
+
+
+def test_symbol_names_survive_normalisation():
+    from src.scoring import _DEV_GROUP, _match_groups
+    from src.utils.text import normalize
+
+    assert normalize("An ASP.NET app, written in C#.") == "an asp dotnet app written in csharp"
+    assert _match_groups(normalize("an asp.net app"))[_DEV_GROUP] == 1
+    assert _match_groups(normalize("written in c#"))[_DEV_GROUP] == 1
+    assert _DEV_GROUP not in _match_groups(normalize("the .network tab"))
+
+
+def test_stackoverflow_html_markup_and_urls_not_matched():
+    post = Post(
+        source="stackoverflow",
+        external_id="1",
+        url="https://example.com",
+        title="Companies House &amp; director lookups",
+        body='<p class="api">See <a href="https://example.com/rest/psc">this page</a></p>',
+    )
+    assert post.normalise() == "companies house director lookups see this page"
+    result = score(post)
+    assert result.matched_pain_points == ("director_network",)
+
+
+def test_github_markdown_and_link_targets_stripped_but_code_kept():
+    post = Post(
+        source="github",
+        external_id="1",
+        url="https://example.com",
+        title="Fetching PSC data",
+        body="## Steps\n\n```python\nimport requests\n```\n\nSee [the docs](https://example.com/429) **now**",
+    )
+    assert post.normalise() == "fetching psc data steps python import requests see the docs now"
+
+
+def test_search_text_is_casefolded_and_built_when_scored():
+    post = _post("STRASSE Straße")
+    assert post.search_text is None
+    score(post)
+    assert post.search_text == "strasse strasse"
+
+
+def test_long_body_truncated_only_after_scoring():
+    body = "filler " * 400 + "api 429 rate limit"
+    post = _post("Companies House question", body=body)
+    assert post.body == body
+    result = score(post)
+    assert len(post.body) == BODY_MAX_CHARS
+    assert post.search_text.endswith("filler api 429 rate limit")
+    assert result.score >= 0.5
+    assert result.matched_pain_points == (PainPoint.RATE_LIMIT,)
+
+
+def test_replace_rebuilds_search_text():
+    post = _post("Companies House question", body="api 429")
+    score(post)
+    edited = dataclasses.replace(post, body="officer appointments")
+    assert edited.search_text is None
+    assert score(edited).matched_pain_points == ("director_network",)
+
+
+def test_post_and_scored_post_are_slotted():
+    result = score(_post("Companies House API 429"))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.score = 1.0
+    assert not hasattr(result.post, "__dict__")
+    assert not hasattr(result, "__dict__")
+
+
+def test_posts_with_different_bodies_are_not_equal():
+    post = _post("Companies House question", body="api 429")
+    assert post == dataclasses.replace(post)
+    assert post != dataclasses.replace(post, body="officer appointments")
+